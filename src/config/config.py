@@ -25,10 +25,93 @@ class Config:
     PICOVOICE_ACCESS_KEY = os.getenv("PICOVOICE_ACCESS_KEY", None)
     WHISPER_MODEL_SIZE = "base"  # tiny, base, small, medium, large
     TTS_VOICE = "Samantha"  # macOS voice name
+    AUDIO_BUFFER_SECONDS = 30  # Seconds of microphone audio kept in the capture ring buffer
+    WAKE_PREROLL_SECONDS = 0.5  # Audio before voice activation handed to the recorder
+    WAKE_MODE = os.getenv("JARVIS_WAKE_MODE", "keyboard")  # keyboard (SPACE/ENTER) or voice (speak to activate)
+    WAKE_ENERGY_THRESHOLD = 1000  # Mean amplitude that counts as speech in voice wake mode
     
     # Mac control settings
     ALLOWED_APPS = None  # None = allow all apps, or provide list of allowed app names
     REQUIRE_CONFIRMATION = True  # Require confirmation for system changesthod
+    SCRIPT_BACKEND = os.getenv("JARVIS_SCRIPT_BACKEND", "auto")  # auto, osascript, or stub (persistent script worker)
+    APP_CATALOG_FILE = DATA_DIR / "app_catalog.json"  # Cached scan of installed applications
+    APP_MATCH_THRESHOLD = 0.75  # Minimum similarity for fuzzy app-name matches (open only)
+    PROCESS_SNAPSHOT_TTL = 2  # Seconds a running-process snapshot is reused
+    DESKTOP_BACKEND = os.getenv("JARVIS_DESKTOP_BACKEND", "auto")  # auto, macos, linux, or fake
+    
+    # Workflow settings
+    WORKFLOW_MAX_WORKERS = 8  # Workflow steps that may run at once
+    WORKFLOW_STEP_TIMEOUT = 10  # Seconds before a step is abandoned and its dependents proceed
+    WORKFLOWS_FILE = DATA_DIR / "workflows.json"  # User-defined workflows, hot-reloaded
+    WORKFLOW_RELOAD_INTERVAL = 2  # Seconds between checks of the workflows file
+    
+    # Scheduler settings
+    TIMEZONE = os.getenv("JARVIS_TIMEZONE")  # IANA name, e.g. "Asia/Kolkata"; None = system zone
+    SCHEDULER_MISFIRE_POLICY = "coalesce"  # fire_late, coalesce, or drop
+    SCHEDULER_MISFIRE_GRACE_SECONDS = 60  # Lateness tolerated before a run counts as missed
+    
+    # Research settings
+    RESEARCH_MAX_WORKERS = 6  # Downloads in flight at once
+    RESEARCH_HOST_RATE = 1.0  # Requests per second to any one host
+    RESEARCH_HOST_BURST = 2  # Back-to-back requests allowed per host
+    RESEARCH_REQUEST_TIMEOUT = 5  # Seconds per request
+    RESEARCH_DEADLINE = 20  # Seconds before unfinished sources are dropped
+    RESEARCH_MAX_BYTES = 2_000_000  # Download cap per page
+    RESEARCH_MAX_CHARS = 20000  # Text kept per page, before passage ranking
+    RESEARCH_PASSAGE_WORDS = 120  # Target passage length
+    RESEARCH_DUPLICATE_THRESHOLD = 0.6  # Shingle overlap at which passages count as repeats
+    RESEARCH_CONTEXT_TOKENS = 1500  # Source text budget for the synthesis prompt
+    RESEARCH_NUM_SOURCES = 5  # Search results to read per topic
+    RESEARCH_SYNTHESIS = "map_reduce"  # map_reduce or single
+    RESEARCH_LLM_PARALLELISM = 2  # Per-source summaries generated at once (match OLLAMA_NUM_PARALLEL)
+    RESEARCH_MAP_TOKENS = 1500  # Source text budget per summary prompt
+    RESEARCH_REPORT_MAX_AGE = 3 * 86400  # Seconds a saved report answers repeat questions
+    RESEARCH_TOPIC_MATCH_THRESHOLD = 0.75  # Topic word overlap for a saved report to count
+    RESEARCH_SHOW_REASONING = False  # Print the model's <think> blocks while the report streams
+    
+    # Morning briefing settings
+    BRIEFING_DEADLINE = 3.0  # Seconds to wait for sources before rendering what is ready
+    BRIEFING_TTLS = {  # Source -> seconds a gathered value is reused
+        "weather": 600,
+        "news": 900,
+        "system": 30,
+    }
+    BRIEFING_LEAD_MINUTES = 15  # Prepare this long before the usual first interaction
+    BRIEFING_MIN_DAYS = 3  # Days of history needed before a preparation time is learned
+    BRIEFING_HISTORY_DAYS = 60  # Days of first interactions kept for learning the start time
+    FIRST_INTERACTIONS_FILE = DATA_DIR / "first_interactions.json"  # First interaction of each day
+    BRIEFING_PREPARE_DEADLINE = 30  # Seconds the background preparation waits for sources
+    BRIEFING_PREPARED_MAX_AGE = 3 * 3600  # Seconds a prepared briefing stays servable
+    BRIEFING_PRESYNTHESIZE = False  # Also pre-generate the spoken briefing audio in voice mode
+    
+    # Calendar settings
+    CALENDAR_CACHE_TTL = 300  # Seconds cached events are trusted before Calendar is read again
+    CALENDAR_WINDOW_DAYS = 14  # Days from today loaded by each bulk read
+    CALENDAR_READ_TIMEOUT = 20  # Seconds allowed for the bulk read script
+    
+    # GitHub settings
+    GITHUB_API_URL = "https://api.github.com"
+    GITHUB_CACHE_DIR = DATA_DIR / "github_cache"
+    GITHUB_TTLS = {  # Resource kind -> seconds a response is used without asking GitHub
+        "user": 3600,
+        "repos": 300,
+        "commits": 60,
+    }
+    GITHUB_REQUEST_TIMEOUT = 10  # Seconds per API request
+    
+    # Git settings
+    GIT_REPOS = [p for p in os.getenv("JARVIS_GIT_REPOS", "").split(os.pathsep) if p]  # Project repos to track
+    GIT_STATUS_MAX_AGE = 10  # Seconds a cached status is reused when .git shows no change (catches unstaged edits)
+    
+    # HTTP cache settings
+    HTTP_CACHE_DIR = DATA_DIR / "http_cache"
+    HTTP_CACHE_MAX_BYTES = 50 * 1024 * 1024  # Least recently used entries are evicted past this
+    HTTP_CACHE_TTLS = {  # Host -> seconds fresh, overriding response headers
+        "api.open-meteo.com": 600,
+        "news.google.com": 900,
+    }
+    OFFLINE = os.getenv("JARVIS_OFFLINE", "").lower() in ("1", "true", "yes")  # Serve only cached responses
+    
     @classmethod
     def ensure_dirs(cls):
         cls.DATA_DIR.mkdir(parents=True, exist_ok=True)
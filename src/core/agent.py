@@ -3,14 +3,17 @@ from src.core.llm import LLMClient
 from src.core.voice_io import VoiceInput, VoiceOutput
 from src.core.wake_word import WakeWordListener
 from src.core.personality_v2 import JarvisPersonalityV2 as JarvisPersonality
-from src.features.morning_briefing import MorningBriefing
+from src.features.morning_briefing import FirstInteractionLog, MorningBriefing
 from src.features.research_agent import ResearchAgent
 from src.integrations.calendar_controller import CalendarController
 from src.core.mac_control import MacController
 from src.core.focus_mode import FocusMode
 from src.core.workflows import WorkflowExecutor
 from src.core.scheduler import Scheduler
+from src.core.recurrence import parse_recurrence
+from src.core.script_runner import close_script_worker
 from src.integrations.github_control import GitHubController
+from src.integrations.http_cache import flush_http_caches
 from src.integrations.app_navigator import AppNavigator
 from src.core.logger import JarvisLogger
 from src.config.config import Config
@@ -18,7 +21,7 @@ from typing import Optional
 import sys
 import re
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 
 
 class Jarvis:
@@ -55,6 +58,8 @@ class Jarvis:
         self.command_log = []
         self.command_log_file = Config.DATA_DIR / "command_history.json"
         self._load_command_log()
+        self.first_interactions = FirstInteractionLog()
+        self.first_interactions.seed(self.command_log)
         
         # Focus mode
         self.focus_mode: Optional[FocusMode] = None
@@ -77,6 +82,9 @@ class Jarvis:
         # Calendar
         self.calendar = CalendarController()
         
+        # Morning briefing
+        self.morning_briefing = MorningBriefing(calendar=self.calendar)
+        
         # App navigation system with LLM-powered intent detection
         self.app_navigator = AppNavigator(
             mac_control=self.mac_control,
@@ -131,6 +139,7 @@ class Jarvis:
         """Log a command execution."""
         # Log to file
         self.logger.command(user_input, is_command, success, response)
+        self.first_interactions.record()
         
         # Also save to JSON for analytics
         log_entry = {
@@ -146,6 +155,30 @@ class Jarvis:
         if len(self.command_log) % 10 == 0:
             self._save_command_log()
 
+    def schedule_briefing_preparation(self):
+        """
+        Keep a daily job that prepares the briefing before the user usually starts.
+        
+        Called at startup and again after each preparation, so the time
+        follows changes in the user's routine.
+        """
+        start = self.first_interactions.typical_start_time()
+        if start is None:
+            return
+        prepare_at = datetime.combine(datetime.now().date(), start) - timedelta(minutes=Config.BRIEFING_LEAD_MINUTES)
+        schedule_time = prepare_at.strftime("%H:%M")
+        
+        existing = [t for t in self.scheduler.list_tasks() if t.action == "prepare_briefing"]
+        if any(t.params.get("time") == schedule_time for t in existing):
+            return
+        for task in existing:
+            self.scheduler.cancel_task(task.task_id)
+        self.scheduler.add_recurring_task(
+            "Prepare morning briefing", "prepare_briefing", {"time": schedule_time},
+            schedule_time=schedule_time, frequency="daily"
+        )
+        self.logger.info(f"Morning briefing will be prepared daily at {schedule_time}")
+
     def get_contextual_personality(self) -> str:
         """
         Determine personality context based on current state.
@@ -490,10 +523,16 @@ class Jarvis:
                 
                 # Default allowed apps for coding
                 allowed_apps = ["vscode", "terminal", "chrome", "iterm", "pycharm", "xcode"]
+                # Also allow the real app names, which is how running apps are reported
+                allowed_apps += [self.mac_control.resolve_app_name(app) for app in allowed_apps]
                 
                 self.focus_mode = FocusMode(duration_minutes, allowed_apps, self.current_mode)
                 
-                return (True, f"Focus mode activated for {duration_minutes} minutes, sir. I'll block distractions.")
+                response = f"Focus mode activated for {duration_minutes} minutes, sir. I'll block distractions."
+                distractions = self.focus_mode.running_distractions(self.mac_control.running_apps())
+                if distractions:
+                    response += f" {', '.join(distractions)} {'is' if len(distractions) == 1 else 'are'} still open."
+                return (True, response)
             else:
                 return (True, "Please specify duration, sir. For example: 'focus mode for 2 hours'")
         
@@ -545,6 +584,13 @@ class Jarvis:
             workflow_list = "\n".join([f"- {w}: {self.workflows.get_workflow_description(w)}" for w in workflows])
             return (True, f"Available workflows, sir:\n{workflow_list}")
         
+        # Run any workflow by name, including user-defined ones
+        workflow_match = re.search(r'\b(?:run|start) (?:the )?(?:workflow )?([\w -]+?)(?: workflow)?$', lower_input)
+        if workflow_match and "workflow" in lower_input:
+            workflow_name = workflow_match.group(1).strip().replace(" ", "_")
+            success, msg = self.workflows.execute(workflow_name)
+            return (True, msg)
+        
         # ============================================================================
         # SCHEDULING COMMANDS
         # ============================================================================
@@ -577,41 +623,30 @@ class Jarvis:
             else:
                 return (True, "Please specify time, sir. For example: 'remind me in 30 minutes'")
         
-        # Every day at X, do Y
-        if ("every day" in lower_input or "daily" in lower_input) and " at " in lower_input:
-            # Extract time
+        # Recurring: "every day at X", "every weekday at 8:30", "every 2 hours" ... do Y
+        recurrence = None
+        if re.search(r'\b(?:every|each|daily|hourly|weekly)\b', lower_input):
+            try:
+                recurrence = parse_recurrence(lower_input)
+            except ValueError:
+                recurrence = None
+        
+        if recurrence is not None and recurrence.explicit:
+            # Determine action
+            if "open" in lower_input or "launch" in lower_input:
+                # Drop the schedule phrase so only the app name is extracted
+                action_text = re.sub(r'\b(?:every|each|daily|hourly|weekly)\b.*?(?=\b(?:open|launch)\b|$)', '', lower_input)
+                success, app_name = self._extract_app_name(action_text.strip())
+                if success:
+                    task_id = self.scheduler.add_recurring_task(
+                        description=f"Open {app_name}",
+                        action="open_app",
+                        params={"app": app_name},
+                        trigger=recurrence.describe()
+                    )
+                    return (True, f"Scheduled to open {app_name} {recurrence.describe()}, sir.")
             
-            # Extract time
-            time_match = re.search(r'(\d{1,2}):?(\d{2})?\s*(am|pm)?', lower_input)
-            if time_match:
-                hour = int(time_match.group(1))
-                minute = int(time_match.group(2)) if time_match.group(2) else 0
-                am_pm = time_match.group(3)
-                
-                # Convert to 24-hour format
-                if am_pm == "pm" and hour < 12:
-                    hour += 12
-                elif am_pm == "am" and hour == 12:
-                    hour = 0
-                
-                schedule_time = f"{hour:02d}:{minute:02d}"
-                
-                # Determine action
-                if "open" in lower_input or "launch" in lower_input:
-                    success, app_name = self._extract_app_name(user_input)
-                    if success:
-                        task_id = self.scheduler.add_recurring_task(
-                            description=f"Open {app_name} daily",
-                            action="open_app",
-                            params={"app": app_name},
-                            schedule_time=schedule_time,
-                            frequency="daily"
-                        )
-                        return (True, f"Scheduled to open {app_name} daily at {schedule_time}, sir.")
-                
-                return (True, "I understood the time, but not the action, sir.")
-            else:
-                return (True, "Please specify time, sir. For example: 'every day at 9:00 open mail'")
+            return (True, "I understood the time, but not the action, sir.")
         
         # List scheduled tasks
         if "list scheduled" in lower_input or "show scheduled" in lower_input or "my reminders" in lower_input:
@@ -638,6 +673,11 @@ class Jarvis:
         # GITHUB INTEGRATION COMMANDS
         # ============================================================================
         
+        # GitHub API quota
+        if "rate limit" in lower_input and "github" in lower_input:
+            success, message = self.github.rate_limit_status()
+            return (True, message)
+        
         # Show my repos
         if "show my repos" in lower_input or "list my repos" in lower_input or "my repositories" in lower_input:
             success, message = self.github.list_repos()
@@ -928,6 +968,17 @@ class Jarvis:
         return (False, "")
 
 
+    def _wait_for_wake(self) -> bool:
+        """Block until activation; False means the user asked to quit."""
+        if Config.WAKE_MODE == "voice":
+            return self.wake_listener.listen(timeout=None)
+        return self.wake_listener.listen()
+    
+    def _wake_preroll_position(self):
+        """Capture-buffer position to start recording from, if the wake listener detected speech."""
+        preroll_position = getattr(self.wake_listener, "preroll_position", None)
+        return preroll_position() if preroll_position else None
+    
     def run(self, voice_mode: bool = False):
         """Main interaction loop."""
         print(f"\nJarvis initialized. Voice Mode: {'ON' if voice_mode else 'OFF'}")
@@ -937,11 +988,20 @@ class Jarvis:
             try:
                 from src.core.voice_io import VoiceInput, VoiceOutput
                 from src.core.keyboard_wake import KeyboardWakeListener
+                from src.core.audio_capture import ContinuousCapture
                 
                 print("🎙️  Initializing voice components...")
-                self.voice_input = VoiceInput(model_size=Config.WHISPER_MODEL_SIZE)
+                # One long-lived microphone stream shared by every recording
+                self.audio_capture = ContinuousCapture(buffer_seconds=Config.AUDIO_BUFFER_SECONDS)
+                self.voice_input = VoiceInput(model_size=Config.WHISPER_MODEL_SIZE, capture=self.audio_capture)
                 self.voice_output = VoiceOutput(use_elevenlabs=True)
-                self.wake_listener = KeyboardWakeListener()
+                if Config.WAKE_MODE == "voice":
+                    from src.core.simple_wake import SimplePushToTalk
+                    # Detects speech in the shared buffer, so the activating words reach the recorder
+                    self.wake_listener = SimplePushToTalk(energy_threshold=Config.WAKE_ENERGY_THRESHOLD,
+                                                          capture=self.audio_capture)
+                else:
+                    self.wake_listener = KeyboardWakeListener()
                 print("✅ Voice mode ready!\n")
                     
             except Exception as e:
@@ -958,6 +1018,13 @@ class Jarvis:
         # Start session timer
         self.session_start_time = datetime.now()
         
+        # Scheduled tasks fire from their own thread, independent of input
+        self.scheduler.start()
+        self.schedule_briefing_preparation()
+        
+        # Pick up edits to the user workflow file without a restart
+        self.workflows.start_watching()
+        
         # Main loop
         while True:
             try:
@@ -974,8 +1041,8 @@ class Jarvis:
                 
                 # Get user input
                 if voice_mode:
-                    # Wait for keyboard activation
-                    if not self.wake_listener.listen():
+                    # Wait for keyboard or voice activation
+                    if not self._wait_for_wake():
                         # User pressed 'q' to quit
                         farewell = "Very good, sir. Until next time."
                         print(f"\nJarvis: {farewell}\n")
@@ -985,7 +1052,7 @@ class Jarvis:
                     
                     # Listen for voice command
                     try:
-                        user_input = self.voice_input.listen()
+                        user_input = self.voice_input.listen(start_position=self._wake_preroll_position())
                         print(f"\n💬 You said: {user_input}")
                     except Exception as e:
                         print(f"❌ Voice input error: {e}")
@@ -1005,9 +1072,6 @@ class Jarvis:
                 if not user_input:
                     continue
 
-                # Run pending scheduled tasks
-                self.scheduler.run_pending()
-
                 # Increment interaction count
                 self.interaction_count += 1
 
@@ -1065,6 +1129,12 @@ class Jarvis:
     def cleanup(self):
         if hasattr(self, 'wake_word'):
             self.wake_word.close()
+        if hasattr(self, 'audio_capture'):
+            self.audio_capture.close()
+        self.scheduler.shutdown()
+        self.workflows.shutdown()
+        close_script_worker()
+        flush_http_caches()
 
 
 if __name__ == "__main__":
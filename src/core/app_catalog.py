@@ -0,0 +1,275 @@
+"""
+Application Catalog
+Index of installed applications for resolving spoken or misspelled app
+names locally, before any process is launched.
+
+Install locations are scanned once and cached on disk. Each later refresh
+only rescans directories whose mtime changed. Names and MacController
+aliases go into a trigram index, and the best trigram candidates are
+re-ranked by edit distance. So "spotfy" -> "Spotify" and
+"vs cod" -> "Visual Studio Code".
+"""
+
+import json
+import re
+import sys
+import threading
+from collections import Counter, defaultdict
+from itertools import chain
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.config.config import Config
+
+
+def default_app_dirs() -> List[Path]:
+    """Install locations for this platform."""
+    home = Path.home()
+    if sys.platform == "darwin":
+        return [Path("/Applications"), Path("/Applications/Utilities"), Path("/System/Applications"),
+                Path("/System/Applications/Utilities"), home / "Applications"]
+    return [Path("/usr/share/applications"), Path("/usr/local/share/applications"),
+            Path("/var/lib/flatpak/exports/share/applications"), home / ".local/share/applications"]
+
+
+def normalize(name: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace."""
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", name.lower()).split())
+
+
+def trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance (Myers' bit-parallel algorithm, one pass over `b`)."""
+    if not a or not b:
+        return len(a) or len(b)
+    peq: Dict[str, int] = {}
+    for i, ch in enumerate(a):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    mask = (1 << len(a)) - 1
+    last = 1 << (len(a) - 1)
+    pv, mv, score = mask, 0, len(a)
+    for ch in b:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return score
+
+
+def scan_directory(directory: Path) -> List[str]:
+    """App names in one install location (.app bundles or .desktop entries)."""
+    names = []
+    try:
+        entries = list(directory.iterdir())
+    except OSError:
+        return names
+    for entry in entries:
+        if entry.suffix == ".app":
+            names.append(entry.stem)
+        elif entry.suffix == ".desktop":
+            name = _desktop_entry_name(entry)
+            if name:
+                names.append(name)
+    return sorted(set(names))
+
+
+def _desktop_entry_name(path: Path) -> Optional[str]:
+    try:
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            in_entry = False
+            for line in f:
+                line = line.strip()
+                if line.startswith("["):
+                    in_entry = line == "[Desktop Entry]"
+                elif in_entry and line.startswith("NoDisplay=true"):
+                    return None
+                elif in_entry and line.startswith("Name="):
+                    return line[5:].strip()
+    except OSError:
+        pass
+    return None
+
+
+class AppCatalog:
+    """Installed applications with a fuzzy name index."""
+
+    TOP_CANDIDATES = 8  # Trigram candidates re-ranked by edit distance
+
+    def __init__(self, cache_path: Path = Config.APP_CATALOG_FILE, app_dirs: Optional[List[Path]] = None,
+                 aliases: Optional[Dict[str, str]] = None, threshold: float = Config.APP_MATCH_THRESHOLD):
+        """
+        Args:
+            cache_path: JSON file holding the last scan
+            app_dirs: Install locations to scan. None = platform defaults.
+            aliases: Extra spoken names -> app name (e.g. MacController.APP_MAPPINGS)
+            threshold: Minimum similarity (0-1) for a fuzzy match
+        """
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.app_dirs = [Path(d) for d in (app_dirs if app_dirs is not None else default_app_dirs())]
+        self.aliases = aliases or {}
+        self.threshold = threshold
+        self._dirs: Dict[str, dict] = {}  # dir -> {"mtime": float, "apps": [names]}
+        self._keys: List[str] = []  # Normalized names, index-aligned with _targets
+        self._targets: List[str] = []
+        self._gram_counts: List[int] = []
+        self._exact: Dict[str, str] = {}
+        self._index: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    @property
+    def apps(self) -> List[str]:
+        """Installed app names."""
+        self._ensure_loaded()
+        return sorted({name for entry in self._dirs.values() for name in entry["apps"]})
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._load_cache()
+            self._refresh_locked()
+            self._loaded = True
+
+    def _load_cache(self):
+        if not self.cache_path or not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path) as f:
+                cached = json.load(f).get("dirs", {})
+        except (OSError, ValueError):
+            return
+        wanted = {str(d) for d in self.app_dirs}
+        self._dirs = {d: entry for d, entry in cached.items() if d in wanted}
+
+    def refresh(self) -> bool:
+        """
+        Rescan install locations whose mtime changed.
+
+        Returns:
+            True if the catalog changed
+        """
+        with self._lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self) -> bool:
+        changed = False
+        for directory in self.app_dirs:
+            key = str(directory)
+            try:
+                mtime = directory.stat().st_mtime
+            except OSError:
+                if self._dirs.pop(key, None) is not None:
+                    changed = True
+                continue
+            cached = self._dirs.get(key)
+            if cached and cached["mtime"] == mtime:
+                continue
+            self._dirs[key] = {"mtime": mtime, "apps": scan_directory(directory)}
+            changed = True
+
+        if changed or not self._keys:
+            self._build_index()
+        if changed:
+            self._save_cache()
+        return changed
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix(".tmp")
+            with open(tmp, "w") as f:
+                json.dump({"dirs": self._dirs}, f)
+            tmp.replace(self.cache_path)
+        except OSError:
+            pass  # A missing cache only costs a rescan
+
+    def _build_index(self):
+        entries = {}
+        for entry in self._dirs.values():
+            for name in entry["apps"]:
+                entries.setdefault(normalize(name), name)
+        for alias, target in self.aliases.items():
+            entries.setdefault(normalize(alias), target)
+        entries.pop("", None)
+
+        keys = list(entries)
+        index = defaultdict(list)
+        gram_counts = []
+        for i, key in enumerate(keys):
+            grams = trigrams(key)
+            gram_counts.append(len(grams))
+            for gram in grams:
+                index[gram].append(i)
+        self._keys, self._targets = keys, [entries[k] for k in keys]
+        self._gram_counts = gram_counts
+        self._exact = entries
+        self._index = dict(index)
+
+    def _best_match(self, query: str) -> Optional[Tuple[str, float]]:
+        exact = self._exact.get(query)
+        if exact:
+            return exact, 1.0
+
+        query_grams = trigrams(query)
+        counts = Counter(chain.from_iterable(self._index.get(gram, ()) for gram in query_grams))
+        if not counts:
+            return None
+
+        # Shared trigrams shortlist, Dice coefficient picks candidates, edit distance decides
+        shortlist = counts.most_common(self.TOP_CANDIDATES * 4)
+        dice = {i: 2 * c / (len(query_grams) + self._gram_counts[i]) for i, c in shortlist}
+        candidates = sorted(dice, key=dice.get, reverse=True)[:self.TOP_CANDIDATES]
+        best, best_score = None, 0.0
+        for i in candidates:
+            key = self._keys[i]
+            # A prefix only scores as well as the share of the name it covers, so "obs" != "obsidian"
+            score = 1 - edit_distance(query, key) / max(len(query), len(key))
+            if score > best_score or (score == best_score and best is not None and len(key) < len(self._keys[best])):
+                best, best_score = i, score
+        return self._targets[best], best_score
+
+    def exact(self, name: str) -> Optional[str]:
+        """Installed app or alias target whose normalized name is exactly `name`, else None."""
+        self._ensure_loaded()
+        query = normalize(name)
+        target = self._exact.get(query)
+        if target is None and query and self.refresh():
+            target = self._exact.get(query)
+        return target
+
+    def resolve(self, name: str) -> Optional[str]:
+        """
+        Best matching installed app (or alias target) for a name.
+
+        Returns:
+            The app name, or None if nothing is similar enough
+        """
+        self._ensure_loaded()
+        query = normalize(name)
+        if not query:
+            return None
+        match = self._best_match(query)
+        if (not match or match[1] < self.threshold) and self.refresh():
+            # Something was installed since the last scan
+            match = self._best_match(query)
+        if match and match[1] >= self.threshold:
+            return match[0]
+        return None
@@ -0,0 +1,187 @@
+"""
+Continuous Audio Capture
+One long-lived microphone stream feeding a shared ring buffer.
+Wake detection and recording both read from the same buffer, so the
+audio spoken at activation time is never lost between streams.
+"""
+
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+import pyaudio
+
+
+class AudioRingBuffer:
+    """
+    Fixed-size ring of int16 samples addressed by absolute sample position.
+
+    Positions grow monotonically from 0; only the most recent `capacity`
+    samples are retained.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=np.int16)
+        self._total = 0
+        self._cond = threading.Condition()
+
+    @property
+    def position(self) -> int:
+        """Absolute position one past the newest sample."""
+        with self._cond:
+            return self._total
+
+    @property
+    def oldest(self) -> int:
+        """Absolute position of the oldest retained sample."""
+        with self._cond:
+            return max(0, self._total - self.capacity)
+
+    def write(self, samples: np.ndarray):
+        """Append samples, overwriting the oldest data when full."""
+        written = len(samples)
+        if written == 0:
+            return
+        # Only the tail fits, but positions still advance by everything written
+        samples = samples[-self.capacity:]
+        n = len(samples)
+
+        with self._cond:
+            start = (self._total + written - n) % self.capacity
+            first = min(n, self.capacity - start)
+            self._data[start:start + first] = samples[:first]
+            if first < n:
+                self._data[:n - first] = samples[first:]
+            self._total += written
+            self._cond.notify_all()
+
+    def read(self, start: int, end: Optional[int] = None) -> Tuple[np.ndarray, int]:
+        """
+        Read samples in the absolute range [start, end).
+
+        The range is clamped to what is still retained.
+
+        Returns:
+            (samples, actual_start)
+        """
+        with self._cond:
+            end = self._total if end is None else min(end, self._total)
+            start = max(start, self._total - self.capacity, 0)
+            if start >= end:
+                return (np.zeros(0, dtype=np.int16), end)
+
+            i, j = start % self.capacity, end % self.capacity
+            if i < j:
+                out = self._data[i:j].copy()
+            else:
+                out = np.concatenate((self._data[i:], self._data[:j]))
+            return (out, start)
+
+    def wait_for(self, position: int, timeout: Optional[float] = None) -> bool:
+        """Block until data past `position` is available. Returns False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._total > position, timeout=timeout)
+
+
+def chunk_energies(samples: np.ndarray, chunk: int) -> np.ndarray:
+    """Mean absolute amplitude of each full `chunk`-sized block, vectorized."""
+    usable = len(samples) - len(samples) % chunk
+    if usable == 0:
+        return np.zeros(0)
+    blocks = samples[:usable].reshape(-1, chunk).astype(np.int32)
+    return np.abs(blocks).mean(axis=1)
+
+
+class ContinuousCapture:
+    """
+    Background microphone capture into an AudioRingBuffer.
+
+    The PyAudio stream is opened once in start() and stays open until
+    stop(), so consumers never pay per-utterance stream setup.
+    """
+
+    def __init__(self, sample_rate: int = 16000, chunk: int = 1024,
+                 buffer_seconds: float = 30.0, pa: Optional[pyaudio.PyAudio] = None):
+        """
+        Initialize capture.
+
+        Args:
+            sample_rate: Sample rate in Hz
+            chunk: Frames per stream read
+            buffer_seconds: Seconds of audio retained in the ring
+            pa: Shared PyAudio instance (one is created if omitted)
+        """
+        self.sample_rate = sample_rate
+        self.chunk = chunk
+        self.buffer = AudioRingBuffer(int(sample_rate * buffer_seconds))
+        self._owns_pa = pa is None
+        self.pa = pa or pyaudio.PyAudio()
+        self.stream = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = threading.Event()
+
+    @property
+    def sample_width(self) -> int:
+        return self.pa.get_sample_size(pyaudio.paInt16)
+
+    def is_running(self) -> bool:
+        return self._running.is_set()
+
+    def start(self):
+        """Open the stream and start the capture thread (idempotent)."""
+        if self.is_running():
+            return
+
+        self.stream = self.pa.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=self.sample_rate,
+            input=True,
+            frames_per_buffer=self.chunk
+        )
+        self._running.set()
+        self._thread = threading.Thread(target=self._capture_loop, name="jarvis-audio-capture", daemon=True)
+        self._thread.start()
+
+    def _capture_loop(self):
+        while self._running.is_set():
+            try:
+                data = self.stream.read(self.chunk, exception_on_overflow=False)
+            except Exception as e:
+                print(f"Audio capture error: {e}")
+                self._running.clear()
+                break
+            self.buffer.write(np.frombuffer(data, dtype=np.int16))
+
+    def read_since(self, position: int, timeout: float = 0.5) -> Tuple[np.ndarray, int]:
+        """
+        Wait for and return all samples captured after `position`.
+
+        If `position` has already been overwritten, the samples start at the
+        oldest retained one.
+
+        Returns:
+            (samples, new_position) - new_position is one past the last returned
+            sample, so anything captured during the read is returned next time
+        """
+        self.buffer.wait_for(position, timeout=timeout)
+        samples, start = self.buffer.read(position)
+        return (samples, start + len(samples))
+
+    def stop(self):
+        """Stop capturing and release the stream."""
+        self._running.clear()
+        if self._thread:
+            self._thread.join(timeout=1)
+            self._thread = None
+        if self.stream:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.stream = None
+
+    def close(self):
+        self.stop()
+        if self._owns_pa and self.pa:
+            self.pa.terminate()
+            self.pa = None
@@ -0,0 +1,207 @@
+"""
+Date Parser
+Turns the short date/time phrases the LLM extracts for calendar events
+into datetimes without paying for dateparser on the common cases.
+
+A compiled grammar handles:
+- Days: "today", "tonight", "tomorrow", "day after tomorrow", "monday",
+  "next friday", "this sat", "march 5", "5th of march 2027", "2026-03-05"
+- Times: "2pm", "at 2:30 pm", "14:30", "noon", "midnight", "at 9",
+  "in the morning/afternoon/evening"
+- Offsets: "in 20 minutes", "in an hour", "in half an hour", "in 3 days"
+in either order ("tomorrow at 2pm", "2pm tomorrow"). Anything else goes
+to dateparser, which is imported only when first needed.
+
+Results prefer the future: a bare time that has passed today means
+tomorrow, and a month/day that has passed this year means next year.
+Parsed phrase structures and fallback results are LRU-cached.
+"""
+
+import re
+from datetime import date, datetime, time as dtime, timedelta
+from functools import lru_cache
+from typing import Optional, Tuple
+
+WEEKDAYS = {
+    "monday": 0, "mon": 0, "tuesday": 1, "tues": 1, "tue": 1, "wednesday": 2, "wed": 2,
+    "thursday": 3, "thurs": 3, "thur": 3, "thu": 3, "friday": 4, "fri": 4,
+    "saturday": 5, "sat": 5, "sunday": 6, "sun": 6,
+}
+MONTHS = {
+    "january": 1, "jan": 1, "february": 2, "feb": 2, "march": 3, "mar": 3, "april": 4, "apr": 4,
+    "may": 5, "june": 6, "jun": 6, "july": 7, "jul": 7, "august": 8, "aug": 8,
+    "september": 9, "sept": 9, "sep": 9, "october": 10, "oct": 10, "november": 11, "nov": 11,
+    "december": 12, "dec": 12,
+}
+DAY_OFFSETS = {"today": 0, "tonight": 0, "tomorrow": 1, "tmrw": 1, "tomorow": 1, "day after tomorrow": 2}
+PERIODS = {"morning": (9, 0), "afternoon": (15, 0), "evening": (18, 0), "night": (20, 0), "tonight": (20, 0)}
+UNITS = {"minute": 1, "min": 1, "hour": 60, "hr": 60, "day": 1440, "week": 10080}
+
+
+def _alternation(words) -> str:
+    return "|".join(sorted(map(re.escape, words), key=len, reverse=True))
+
+
+_WEEKDAY = _alternation(WEEKDAYS)
+_MONTH = _alternation(MONTHS)
+_ORDINAL = r"(?:st|nd|rd|th)?"
+
+_DATE = (
+    rf"(?P<offset>{_alternation(DAY_OFFSETS)})"
+    rf"|(?:(?P<qualifier>next|this|coming)\s+)?(?P<weekday>{_WEEKDAY})"
+    rf"|(?P<month1>{_MONTH})\.?\s+(?P<day1>\d{{1,2}}){_ORDINAL}(?:,?\s+(?P<year1>\d{{4}}))?"
+    rf"|(?P<day2>\d{{1,2}}){_ORDINAL}\s+(?:of\s+)?(?P<month2>{_MONTH})\.?(?:,?\s+(?P<year2>\d{{4}}))?"
+    rf"|(?P<iso>\d{{4}}-\d{{2}}-\d{{2}})"
+)
+_TIME = (
+    r"(?:(?:at|@)\s+)?(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<meridiem>a\.?m\.?|p\.?m\.?)"
+    r"|(?:(?:at|@)\s+)?(?P<hour24>\d{1,2}):(?P<minute24>\d{2})"
+    r"|(?:at|@)\s+(?P<hour_bare>\d{1,2})"
+    r"|(?:at\s+)?(?P<named>noon|midnight)"
+    r"|(?:in\s+)?(?P<period>morning|afternoon|evening|night)"
+)
+
+_DATE_FIRST = re.compile(rf"^(?:{_DATE})?(?:\s*,?\s*(?:{_TIME}))?$")
+_TIME_FIRST = re.compile(rf"^(?:{_TIME})\s*,?\s*(?:{_DATE})$")
+_RELATIVE = re.compile(
+    r"^in\s+(?P<amount>\d+|an?|half\s+an)\s+(?P<unit>minute|min|hour|hr|day|week)s?$"
+)
+_NOISE = re.compile(r"\b(?:on|the)\b|[!?.]+$")  # "on the 5th of march", "at noon."
+
+# (kind, payload): ("relative", minutes) or ("absolute", (date_spec, time_spec))
+Spec = Tuple[str, object]
+
+
+def _normalize(text: str) -> str:
+    text = _NOISE.sub(" ", text.lower().strip())
+    return " ".join(text.split())
+
+
+@lru_cache(maxsize=512)
+def _compile(normalized: str) -> Optional[Spec]:
+    """Phrase structure, independent of the current time; None if outside the grammar."""
+    if not normalized:
+        return None
+    relative = _RELATIVE.match(normalized)
+    if relative:
+        amount = relative["amount"]
+        count = 0.5 if amount.startswith("half") else 1 if amount in ("a", "an") else int(amount)
+        if count == 0.5 and relative["unit"] not in ("hour", "hr"):
+            return None
+        return "relative", int(count * UNITS[relative["unit"]])
+
+    match = _DATE_FIRST.match(normalized) or _TIME_FIRST.match(normalized)
+    if not match:
+        return None
+    groups = match.groupdict()
+
+    date_spec = None
+    if groups["offset"]:
+        date_spec = ("offset", DAY_OFFSETS[groups["offset"]])
+    elif groups["weekday"]:
+        date_spec = ("weekday", WEEKDAYS[groups["weekday"]], groups["qualifier"] == "next")
+    elif groups["month1"] or groups["month2"]:
+        month = MONTHS[groups["month1"] or groups["month2"]]
+        day = int(groups["day1"] or groups["day2"])
+        year = groups["year1"] or groups["year2"]
+        date_spec = ("calendar", int(year) if year else None, month, day)
+    elif groups["iso"]:
+        year, month, day = map(int, groups["iso"].split("-"))
+        date_spec = ("calendar", year, month, day)
+
+    time_spec = None
+    if groups["meridiem"]:
+        hour, minute = int(groups["hour"]), int(groups["minute"] or 0)
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if groups["meridiem"].startswith("p") else 0)
+        time_spec = (hour, minute)
+    elif groups["hour24"]:
+        time_spec = (int(groups["hour24"]), int(groups["minute24"]))
+    elif groups["hour_bare"]:
+        hour = int(groups["hour_bare"])
+        if groups["offset"] == "tonight" and 1 <= hour < 12:
+            hour += 12  # "tonight at 8"
+        time_spec = (hour, 0)
+    elif groups["named"]:
+        time_spec = (12, 0) if groups["named"] == "noon" else (0, 0)
+    elif groups["period"]:
+        time_spec = PERIODS[groups["period"]]
+    elif groups["offset"] == "tonight":
+        time_spec = PERIODS["tonight"]
+
+    if time_spec and not (0 <= time_spec[0] <= 23 and 0 <= time_spec[1] <= 59):
+        return None
+    if date_spec is None and time_spec is None:
+        return None
+    return "absolute", (date_spec, time_spec)
+
+
+def _resolve(spec: Spec, now: datetime) -> Optional[datetime]:
+    kind, payload = spec
+    if kind == "relative":
+        return now + timedelta(minutes=payload)
+
+    date_spec, time_spec = payload
+    at = dtime(*time_spec) if time_spec else now.time().replace(second=0, microsecond=0)
+    today = now.date()
+
+    if date_spec is None:
+        # Bare time: the next time the clock shows it
+        result = datetime.combine(today, at)
+        return result if result > now else result + timedelta(days=1)
+
+    if date_spec[0] == "offset":
+        day = today + timedelta(days=date_spec[1])
+    elif date_spec[0] == "weekday":
+        _, weekday, next_week = date_spec
+        ahead = (weekday - today.weekday()) % 7
+        if ahead == 0 and (next_week or time_spec is None or datetime.combine(today, at) <= now):
+            ahead = 7
+        day = today + timedelta(days=ahead)
+    else:
+        _, year, month, day_of_month = date_spec
+        try:
+            day = date(year or today.year, month, day_of_month)
+            if year is None and day < today:
+                day = date(today.year + 1, month, day_of_month)
+        except ValueError:
+            return None
+    return datetime.combine(day, at)
+
+
+@lru_cache(maxsize=256)
+def _fallback(text: str, base_minute: str) -> Optional[datetime]:
+    import dateparser  # Slow to import; only loaded for phrases the grammar doesn't cover
+
+    return dateparser.parse(text, settings={
+        "PREFER_DATES_FROM": "future",
+        "RELATIVE_BASE": datetime.fromisoformat(base_minute),
+    })
+
+
+def parse_fast(text: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """Grammar-only parse; None if the phrase is outside the grammar."""
+    spec = _compile(_normalize(text))
+    if spec is None:
+        return None
+    return _resolve(spec, now or datetime.now())
+
+
+def parse_datetime(text: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Parse a natural-language date/time.
+
+    Args:
+        text: Phrase such as "tomorrow at 2pm"
+        now: Reference time (default: now)
+
+    Returns:
+        Naive local datetime, or None if neither the grammar nor dateparser understands it
+    """
+    now = now or datetime.now()
+    result = parse_fast(text, now)
+    if result is not None:
+        return result
+    # Fallback results are cached per minute of reference time
+    return _fallback(text.strip(), now.replace(second=0, microsecond=0).isoformat())
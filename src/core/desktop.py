@@ -0,0 +1,275 @@
+"""
+Desktop Control Backends
+Platform-specific primitives behind MacController: launching, focusing
+and quitting apps, running-app checks, volume and brightness.
+
+- MacOSBackend: `open -a`, the shared process table and AppleScript via
+  the script worker
+- LinuxBackend: executables on PATH / xdg-open, /proc process lookup,
+  pactl or amixer, brightnessctl
+- FakeBackend: in-memory, records calls with injectable latency, for
+  tests and throughput benchmarks
+
+Backends raise on failure; MacController turns that into its
+(success, message) replies.
+"""
+
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.config.config import Config
+from src.core.process_table import ProcessTable, get_process_table
+from src.core.script_runner import run_applescript
+
+
+class DesktopBackend:
+    """Interface for desktop control primitives."""
+
+    name = "base"
+
+    def open_app(self, app_name: str) -> bool:
+        """Launch an app. Returns False if it can't be found."""
+        raise NotImplementedError
+
+    def close_app(self, app_name: str) -> bool:
+        """Quit an app. Returns False if it wasn't running."""
+        raise NotImplementedError
+
+    def is_running(self, app_name: str) -> bool:
+        """Whether any process answers to the app name."""
+        raise NotImplementedError
+
+    def activate_app(self, app_name: str) -> bool:
+        """Bring a running app to the front. Returns False if that isn't possible."""
+        return False
+
+    def set_volume(self, level: int):
+        """Set output volume (0-100)."""
+        raise NotImplementedError
+
+    def change_volume(self, delta: int):
+        """Raise or lower output volume by `delta` percent."""
+        raise NotImplementedError
+
+    def set_brightness(self, level: int):
+        """Set display brightness (0-100)."""
+        raise NotImplementedError
+
+
+class MacOSBackend(DesktopBackend):
+    """macOS implementation using open, the process table and AppleScript."""
+
+    name = "macos"
+
+    def __init__(self, processes: Optional[ProcessTable] = None):
+        self.processes = processes or get_process_table()
+
+    def open_app(self, app_name: str) -> bool:
+        result = subprocess.run(["open", "-a", app_name], capture_output=True, text=True, timeout=5)
+        self.processes.invalidate()
+        return result.returncode == 0
+
+    def close_app(self, app_name: str) -> bool:
+        return bool(self.processes.terminate(app_name))
+
+    def is_running(self, app_name: str) -> bool:
+        return self.processes.is_running(app_name)
+
+    def activate_app(self, app_name: str) -> bool:
+        return run_applescript(f'tell application "{app_name}" to activate').ok
+
+    def _script(self, script: str):
+        result = run_applescript(script)
+        if not result:
+            raise RuntimeError(result.error)
+
+    def set_volume(self, level: int):
+        self._script(f"set volume output volume {level}")
+
+    def change_volume(self, delta: int):
+        self._script(f"set volume output volume (output volume of (get volume settings) + {delta})")
+
+    def set_brightness(self, level: int):
+        self._script(f"tell application \"System Events\" to set brightness of display 1 to {level / 100}")
+
+
+class LinuxBackend(DesktopBackend):
+    """Linux implementation using PATH/xdg-open, /proc, PulseAudio/ALSA and brightnessctl."""
+
+    name = "linux"
+
+    def __init__(self, proc_root: str = "/proc"):
+        self.proc_root = Path(proc_root)
+
+    @staticmethod
+    def _candidates(app_name: str) -> List[str]:
+        lowered = app_name.lower()
+        return list(dict.fromkeys([app_name, lowered, lowered.replace(" ", "-"), lowered.replace(" ", "")]))
+
+    def open_app(self, app_name: str) -> bool:
+        for candidate in self._candidates(app_name):
+            executable = shutil.which(candidate)
+            if executable:
+                subprocess.Popen([executable], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                 start_new_session=True)
+                return True
+
+        # Files, URLs and desktop handlers
+        if shutil.which("xdg-open"):
+            result = subprocess.run(["xdg-open", app_name], capture_output=True, text=True, timeout=5)
+            return result.returncode == 0
+        return False
+
+    def find_processes(self, app_name: str) -> List[int]:
+        """PIDs whose command name or executable matches `app_name` (case-insensitive)."""
+        targets = {c.lower() for c in self._candidates(app_name)}
+        pids = []
+        for entry in self.proc_root.iterdir():
+            if not entry.name.isdigit() or int(entry.name) == os.getpid():
+                continue
+            try:
+                comm = (entry / "comm").read_text().strip().lower()
+                argv0 = (entry / "cmdline").read_bytes().split(b"\0", 1)[0].decode(errors="ignore")
+            except OSError:
+                continue  # Exited or not ours to read
+            if comm in targets or os.path.basename(argv0).lower() in targets:
+                pids.append(int(entry.name))
+        return pids
+
+    def is_running(self, app_name: str) -> bool:
+        return bool(self.find_processes(app_name))
+
+    def activate_app(self, app_name: str) -> bool:
+        if not shutil.which("wmctrl"):
+            return False
+        return subprocess.run(["wmctrl", "-a", app_name], capture_output=True, timeout=5).returncode == 0
+
+    def close_app(self, app_name: str) -> bool:
+        closed = False
+        for pid in self.find_processes(app_name):
+            try:
+                os.kill(pid, signal.SIGTERM)
+                closed = True
+            except (ProcessLookupError, PermissionError):
+                continue
+        return closed
+
+    def _run_first(self, commands: List[List[str]], what: str):
+        for command in commands:
+            if shutil.which(command[0]):
+                subprocess.run(command, check=True, capture_output=True, timeout=5)
+                return
+        raise RuntimeError(f"no {what} control available ({', '.join(c[0] for c in commands)} not found)")
+
+    def set_volume(self, level: int):
+        self._run_first([
+            ["pactl", "set-sink-volume", "@DEFAULT_SINK@", f"{level}%"],
+            ["amixer", "-q", "sset", "Master", f"{level}%"],
+        ], "volume")
+
+    def change_volume(self, delta: int):
+        sign = "+" if delta >= 0 else "-"
+        self._run_first([
+            ["pactl", "set-sink-volume", "@DEFAULT_SINK@", f"{sign}{abs(delta)}%"],
+            ["amixer", "-q", "sset", "Master", f"{abs(delta)}%{sign}"],
+        ], "volume")
+
+    def set_brightness(self, level: int):
+        self._run_first([["brightnessctl", "-q", "set", f"{level}%"]], "brightness")
+
+
+class FakeBackend(DesktopBackend):
+    """
+    In-memory backend for tests and benchmarks.
+
+    Every call is recorded in `calls` as (method, argument) and sleeps
+    for `latency` seconds (or the per-method value in `latencies`).
+    """
+
+    name = "fake"
+
+    def __init__(self, latency: float = 0.0, latencies: Optional[Dict[str, float]] = None,
+                 installed: Optional[List[str]] = None):
+        """
+        Args:
+            latency: Default seconds each call takes
+            latencies: Per-method overrides, e.g. {"open_app": 0.3}
+            installed: App names open_app accepts. None = any app.
+        """
+        self.latency = latency
+        self.latencies = latencies or {}
+        self.installed = {a.lower() for a in installed} if installed is not None else None
+        self.calls: List[Tuple[str, object]] = []
+        self.running: set = set()
+        self.volume = 50
+        self.brightness = 50
+        self._lock = threading.Lock()
+
+    def _call(self, method: str, argument):
+        delay = self.latencies.get(method, self.latency)
+        if delay:
+            time.sleep(delay)
+        with self._lock:
+            self.calls.append((method, argument))
+
+    def open_app(self, app_name: str) -> bool:
+        self._call("open_app", app_name)
+        if self.installed is not None and app_name.lower() not in self.installed:
+            return False
+        with self._lock:
+            self.running.add(app_name.lower())
+        return True
+
+    def close_app(self, app_name: str) -> bool:
+        self._call("close_app", app_name)
+        with self._lock:
+            if app_name.lower() not in self.running:
+                return False
+            self.running.discard(app_name.lower())
+        return True
+
+    def is_running(self, app_name: str) -> bool:
+        return app_name.lower() in self.running
+
+    def activate_app(self, app_name: str) -> bool:
+        self._call("activate_app", app_name)
+        return app_name.lower() in self.running
+
+    def set_volume(self, level: int):
+        self._call("set_volume", level)
+        self.volume = level
+
+    def change_volume(self, delta: int):
+        self._call("change_volume", delta)
+        self.volume = max(0, min(100, self.volume + delta))
+
+    def set_brightness(self, level: int):
+        self._call("set_brightness", level)
+        self.brightness = level
+
+
+BACKENDS = {
+    "macos": MacOSBackend,
+    "linux": LinuxBackend,
+    "fake": FakeBackend,
+}
+
+
+def get_backend(name: str = Config.DESKTOP_BACKEND) -> DesktopBackend:
+    """
+    Create a desktop backend by name ("auto", "macos", "linux" or "fake").
+
+    "auto" picks macOS on Darwin and Linux everywhere else.
+    """
+    if name == "auto":
+        name = "macos" if sys.platform == "darwin" else "linux"
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown desktop backend '{name}'. Choose from: {', '.join(BACKENDS)}")
+    return BACKENDS[name]()
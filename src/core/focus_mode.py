@@ -55,6 +55,10 @@ class FocusMode:
         
         return False
     
+    def running_distractions(self, running_apps: List[str]) -> List[str]:
+        """Running apps that focus mode would block."""
+        return [app for app in running_apps if not self.is_app_allowed(app)]
+    
     def handle_blocked_request(self, app_name: str) -> str:
         """Generate response for blocked app request."""
         self.interruption_count += 1
@@ -4,6 +4,9 @@ from typing import Generator, List, Dict
 from src.config.config import Config
 from src.core.personality import JarvisPersonality
 
+# Start of the reply chat() yields when the request fails
+FAILURE_PREFIX = "I'm afraid I've encountered a technical difficulty, sir"
+
 class LLMClient:
     def __init__(self, model: str = Config.DEFAULT_MODEL):
         self.base_url = Config.OLLAMA_BASE_URL
@@ -106,4 +109,4 @@ DO NOT deviate from this response. DO NOT add other modes. DO NOT make up capabi
                         if body.get("done", False):
                             break
         except requests.exceptions.RequestException as e:
-            yield f"I'm afraid I've encountered a technical difficulty, sir: {e}"
+            yield f"{FAILURE_PREFIX}: {e}"
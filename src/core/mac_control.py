@@ -1,15 +1,19 @@
 """
 Mac Control Module
-Handles macOS system interactions including app launching and system controls
+Handles desktop interactions including app launching and system controls.
+Platform specifics live in src.core.desktop backends.
 """
 
 import subprocess
 import os
 from typing import Optional, Tuple
 
+from src.core.app_catalog import AppCatalog
+from src.core.desktop import DesktopBackend, get_backend
+
 
 class MacController:
-    """Controls macOS system functions via shell commands and AppleScript."""
+    """Controls system functions through a platform desktop backend."""
     
     # App name mappings (common names -> actual app names)
     APP_MAPPINGS = {
@@ -53,14 +57,43 @@ class MacController:
         "system preferences": "System Settings",
     }
     
-    def __init__(self, allowed_apps: Optional[list] = None):
+    def __init__(self, allowed_apps: Optional[list] = None, backend: Optional[DesktopBackend] = None,
+                 catalog: Optional[AppCatalog] = None):
         """
         Initialize Mac controller.
         
         Args:
             allowed_apps: Whitelist of allowed apps. None = allow all.
+            backend: Desktop backend. None = Config.DESKTOP_BACKEND.
+            catalog: Installed-app catalog for fuzzy names. None = scan default locations.
         """
         self.allowed_apps = allowed_apps
+        self.backend = backend or get_backend()
+        self.catalog = catalog or AppCatalog(aliases=self.APP_MAPPINGS)
+    
+    def resolve_app_name(self, app_name: str) -> str:
+        """
+        Map a spoken or misspelled name to an installed app name.
+        
+        Exact aliases win, then the fuzzy catalog match; unknown names are
+        passed through unchanged.
+        """
+        app_name_lower = app_name.lower().strip()
+        if app_name_lower in self.APP_MAPPINGS:
+            return self.APP_MAPPINGS[app_name_lower]
+        return self.catalog.resolve(app_name) or app_name
+    
+    def resolve_exact_app_name(self, app_name: str) -> str:
+        """
+        Like resolve_app_name, but only exact aliases or installed app names.
+        
+        Used for anything destructive, where a near miss ("teams" -> Terminal)
+        must not act on the wrong app; unknown names pass through unchanged.
+        """
+        app_name_lower = app_name.lower().strip()
+        if app_name_lower in self.APP_MAPPINGS:
+            return self.APP_MAPPINGS[app_name_lower]
+        return self.catalog.exact(app_name) or app_name.strip()
     
     def open_app(self, app_name: str) -> Tuple[bool, str]:
         """
@@ -72,26 +105,19 @@ class MacController:
         Returns:
             (success: bool, message: str)
         """
-        # Normalize app name
-        app_name_lower = app_name.lower().strip()
-        
-        # Check mapping
-        actual_app_name = self.APP_MAPPINGS.get(app_name_lower, app_name)
+        # Resolve aliases and typos locally
+        actual_app_name = self.resolve_app_name(app_name)
         
         # Check whitelist
         if self.allowed_apps and actual_app_name not in self.allowed_apps:
             return (False, f"Application '{actual_app_name}' is not in the allowed list, sir.")
         
         try:
-            # Use macOS 'open' command
-            result = subprocess.run(
-                ["open", "-a", actual_app_name],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+            # Already running: bring it forward instead of relaunching
+            if self.backend.is_running(actual_app_name) and self.backend.activate_app(actual_app_name):
+                return (True, f"Switched to {actual_app_name}, sir.")
             
-            if result.returncode == 0:
+            if self.backend.open_app(actual_app_name):
                 return (True, f"Opened {actual_app_name}, sir.")
             else:
                 # App not found
@@ -112,23 +138,11 @@ class MacController:
         Returns:
             (success: bool, message: str)
         """
-        # Normalize app name
-        app_name_lower = app_name.lower().strip()
-        
-        # Check mapping
-        actual_app_name = self.APP_MAPPINGS.get(app_name_lower, app_name)
+        # Exact names only: a fuzzy guess could quit the wrong app
+        actual_app_name = self.resolve_exact_app_name(app_name)
         
         try:
-            # Use pkill to close the app
-            result = subprocess.run(
-                ["pkill", "-i", actual_app_name],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            # pkill returns 0 if it found and killed processes
-            if result.returncode == 0:
+            if self.backend.close_app(actual_app_name):
                 return (True, f"Closed {actual_app_name}, sir.")
             else:
                 return (False, f"I'm afraid {actual_app_name} doesn't appear to be running, sir.")
@@ -138,6 +152,24 @@ class MacController:
         except Exception as e:
             return (False, f"I encountered an error closing {actual_app_name}: {e}")
     
+    def is_app_running(self, app_name: str) -> bool:
+        """Check whether an app (spoken name, alias or typo) is running."""
+        try:
+            return self.backend.is_running(self.resolve_app_name(app_name))
+        except Exception:
+            return False
+    
+    def running_apps(self) -> list:
+        """Known apps (from the mapping) that are currently running."""
+        running = []
+        for app in sorted(self.get_available_apps()):
+            try:
+                if self.backend.is_running(app):
+                    running.append(app)
+            except Exception:
+                continue
+        return running
+    
     def set_volume(self, level: int) -> Tuple[bool, str]:
         """
         Set system volume.
@@ -152,15 +184,7 @@ class MacController:
             return (False, "Volume must be between 0 and 100, sir.")
         
         try:
-            # Convert to macOS scale (0-7)
-            mac_volume = int((level / 100) * 7)
-            
-            subprocess.run(
-                ["osascript", "-e", f"set volume output volume {mac_volume}"],
-                check=True,
-                capture_output=True
-            )
-            
+            self.backend.set_volume(level)
             return (True, f"Volume set to {level}%, sir.")
         except Exception as e:
             return (False, f"I'm afraid I couldn't adjust the volume: {e}")
@@ -176,17 +200,7 @@ class MacController:
             (success: bool, message: str)
         """
         try:
-            if direction == "up":
-                script = "set volume output volume (output volume of (get volume settings) + 1)"
-            else:
-                script = "set volume output volume (output volume of (get volume settings) - 1)"
-            
-            subprocess.run(
-                ["osascript", "-e", script],
-                check=True,
-                capture_output=True
-            )
-            
+            self.backend.change_volume(1 if direction == "up" else -1)
             return (True, f"Volume adjusted {direction}, sir.")
         except Exception as e:
             return (False, f"I'm afraid I couldn't adjust the volume: {e}")
@@ -205,15 +219,7 @@ class MacController:
             return (False, "Brightness must be between 0 and 100, sir.")
         
         try:
-            # Convert to macOS scale (0.0-1.0)
-            mac_brightness = level / 100
-            
-            subprocess.run(
-                ["osascript", "-e", f"tell application \"System Events\" to set brightness of display 1 to {mac_brightness}"],
-                check=True,
-                capture_output=True
-            )
-            
+            self.backend.set_brightness(level)
             return (True, f"Brightness set to {level}%, sir.")
         except Exception as e:
             return (False, f"I'm afraid I couldn't adjust the brightness: {e}")
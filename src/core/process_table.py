@@ -0,0 +1,124 @@
+"""
+Process Table
+Short-lived snapshot of running processes, indexed by normalized app name,
+so open/close/focus checks know what is running without spawning
+`pgrep`/`pkill` each time.
+
+A process is indexed under its process name, its executable name and,
+for macOS bundles, the outermost .app name. So "Google Chrome Helper"
+is found under "google chrome" too.
+
+The snapshot keeps psutil.Process handles, which remember each process's
+start time, so a PID reused since the snapshot is never signalled.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import psutil
+
+from src.config.config import Config
+from src.core.app_catalog import normalize
+
+
+def index_keys(name: Optional[str], exe: Optional[str]) -> set:
+    """Normalized names a process answers to."""
+    keys = set()
+    if name:
+        keys.add(normalize(name))
+    if exe:
+        keys.add(normalize(os.path.basename(exe)))
+        bundle = exe.find(".app/")
+        if bundle != -1:
+            keys.add(normalize(os.path.basename(exe[:bundle])))
+    keys.discard("")
+    return keys
+
+
+class ProcessTable:
+    """Process snapshot with a TTL and a name index."""
+
+    def __init__(self, ttl: float = Config.PROCESS_SNAPSHOT_TTL):
+        """
+        Args:
+            ttl: Seconds a snapshot is reused before the table is re-read
+        """
+        self.ttl = ttl
+        self._index: Dict[str, List[psutil.Process]] = {}
+        self._taken_at = 0.0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Force the next query to take a fresh snapshot (after a launch or kill)."""
+        with self._lock:
+            self._taken_at = 0.0
+
+    def _take_snapshot(self) -> Dict[str, List[psutil.Process]]:
+        index: Dict[str, List[psutil.Process]] = {}
+        for proc in psutil.process_iter(["name", "exe"], ad_value=None):
+            info = proc.info
+            for key in index_keys(info.get("name"), info.get("exe")):
+                index.setdefault(key, []).append(proc)
+        return index
+
+    def snapshot(self) -> Dict[str, List[psutil.Process]]:
+        """Normalized app name -> processes, at most `ttl` seconds old."""
+        with self._lock:
+            if time.monotonic() - self._taken_at > self.ttl:
+                self._index = self._take_snapshot()
+                self._taken_at = time.monotonic()
+            return self._index
+
+    def pids(self, app_name: str) -> List[int]:
+        """PIDs running under an app name (case and punctuation insensitive)."""
+        return [proc.pid for proc in self.snapshot().get(normalize(app_name), [])]
+
+    def is_running(self, app_name: str) -> bool:
+        return bool(self.pids(app_name))
+
+    def terminate(self, app_name: str, force: bool = False, timeout: float = 3.0) -> List[int]:
+        """
+        Send SIGTERM to exactly the processes indexed under `app_name`.
+
+        Apps may stay open to ask about unsaved work, so nothing is killed
+        unless `force` is set.
+
+        Args:
+            force: Kill processes still running `timeout` seconds after SIGTERM
+
+        Returns:
+            PIDs that were signalled
+        """
+        procs = []
+        for proc in self.snapshot().get(normalize(app_name), []):
+            try:
+                if not proc.is_running():  # Exited, or its PID now belongs to another process
+                    continue
+                proc.terminate()
+                procs.append(proc)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        if procs and force:
+            _, alive = psutil.wait_procs(procs, timeout=timeout)
+            for proc in alive:
+                try:
+                    proc.kill()
+                except psutil.NoSuchProcess:
+                    pass
+        self.invalidate()
+        return [proc.pid for proc in procs]
+
+
+_table: Optional[ProcessTable] = None
+_table_lock = threading.Lock()
+
+
+def get_process_table() -> ProcessTable:
+    """Process-wide shared table."""
+    global _table
+    with _table_lock:
+        if _table is None:
+            _table = ProcessTable()
+        return _table
@@ -0,0 +1,492 @@
+"""
+Recurrence Engine
+Parses recurring schedules once into rule objects that compute their next
+fire time directly. Supported forms:
+- Natural language: "daily at 9:00", "every weekday at 8:30am",
+  "every monday and friday at 5pm", "every 2 hours", "every 3 days at 10:00
+  until 2027-01-01"
+- Cron expressions: "cron: 0 9 * * 1-5" (or a bare five-field expression)
+- RRULE subset: "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,WE;BYHOUR=9;BYMINUTE=0;UNTIL=20270101T000000Z",
+  plus monthly and yearly rules by day of month or nth weekday
+  ("FREQ=MONTHLY;BYDAY=2TU", "FREQ=YEARLY;BYMONTH=11;BYDAY=4TH")
+
+Wall-clock rules are evaluated in the configured timezone, so "9:00" stays
+9:00 across DST changes. Times skipped by a spring-forward jump fire just
+after the gap; repeated fall-back times fire once.
+"""
+
+import calendar
+import os
+import re
+from datetime import datetime, date, time as dtime, timedelta, timezone, tzinfo
+from typing import List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from src.config.config import Config
+
+
+WEEKDAY_NAMES = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+RRULE_DAYS = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+UNIT_FREQS = {"minute": "minutely", "hour": "hourly", "day": "daily", "week": "weekly"}
+FREQ_UNITS = {**{v: k for k, v in UNIT_FREQS.items()}, "monthly": "month", "yearly": "year"}
+
+# Furthest a rule will search ahead before giving up (covers Feb 29 cron rules)
+MAX_SEARCH_DAYS = 366 * 8
+
+
+def local_timezone() -> tzinfo:
+    """Resolve the timezone schedules are evaluated in."""
+    name = Config.TIMEZONE or os.getenv("TZ")
+    if not name:
+        # /etc/localtime -> /usr/share/zoneinfo/Europe/London
+        try:
+            target = os.path.realpath("/etc/localtime")
+            if "zoneinfo/" in target:
+                name = target.split("zoneinfo/", 1)[1]
+        except OSError:
+            name = None
+    if name:
+        try:
+            return ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError):
+            pass
+    return datetime.now().astimezone().tzinfo
+
+
+def localize(naive: datetime, tz: tzinfo) -> datetime:
+    """Attach `tz` to a wall-clock time, rolling times inside a DST gap forward."""
+    aware = naive.replace(tzinfo=tz, fold=0)
+    return aware.astimezone(timezone.utc).astimezone(tz)
+
+
+class Recurrence:
+    """Base class for parsed recurrence rules."""
+    
+    # True when the schedule names a time of day or an explicit interval
+    explicit = True
+    
+    def next_after(self, after: datetime) -> Optional[datetime]:
+        """First fire time strictly after `after` (aware), or None once finished."""
+        raise NotImplementedError
+    
+    def describe(self) -> str:
+        """Canonical trigger text that parses back into an equivalent rule."""
+        raise NotImplementedError
+
+
+class RRule(Recurrence):
+    """Frequency/interval rule with optional weekdays, times of day and end date."""
+    
+    def __init__(self, freq: str, interval: int = 1, weekdays: Optional[Set[int]] = None,
+                 times: Optional[List[Tuple[int, int]]] = None, until: Optional[datetime] = None,
+                 dtstart: Optional[datetime] = None, tz: Optional[tzinfo] = None,
+                 explicit: bool = True, monthdays: Optional[Set[int]] = None,
+                 months: Optional[Set[int]] = None, nth_weekdays: Optional[Set[Tuple[int, int]]] = None):
+        """
+        Args:
+            freq: "minutely", "hourly", "daily", "weekly", "monthly" or "yearly"
+            interval: Repeat every N periods
+            weekdays: Allowed weekdays (Monday=0); None = any
+            times: (hour, minute) wall times; hourly rules use only the minute
+            until: Last allowed fire time (aware)
+            dtstart: Anchor for interval alignment (aware)
+            tz: Timezone wall times are evaluated in
+            monthdays: Monthly/yearly: days of the month, negative from the end (-1 = last)
+            months: Yearly: months (January=1)
+            nth_weekdays: Monthly/yearly: (n, weekday) for the nth weekday of the
+                          month, negative from the end ((-1, 4) = last Friday)
+        """
+        if freq not in FREQ_UNITS:
+            raise ValueError(f"Unsupported frequency '{freq}'")
+        if interval < 1:
+            raise ValueError("Interval must be at least 1")
+        
+        self.freq = freq
+        self.interval = interval
+        self.tz = tz or local_timezone()
+        self.dtstart = (dtstart or datetime.now(timezone.utc)).astimezone(self.tz)
+        self.weekdays = set(weekdays) if weekdays else None
+        self.times = sorted(set(times)) if times else []
+        self.until = until
+        self.explicit = explicit
+        self.monthdays = set(monthdays) if monthdays else None
+        self.months = set(months) if months else None
+        self.nth_weekdays = set(nth_weekdays) if nth_weekdays else None
+        
+        if freq == "weekly" and not self.weekdays:
+            self.weekdays = {self.dtstart.weekday()}
+        if freq in ("monthly", "yearly"):
+            if not (self.weekdays or self.monthdays or self.nth_weekdays):
+                self.monthdays = {self.dtstart.day}
+            if freq == "yearly" and not self.months:
+                self.months = {self.dtstart.month}
+        if freq in ("daily", "weekly", "monthly", "yearly") and not self.times:
+            self.times = [(self.dtstart.hour, self.dtstart.minute)]
+        
+        # Precomputed for the hot path
+        self._step = timedelta(**{FREQ_UNITS[freq] + "s": interval}) if freq in ("minutely", "hourly") else None
+        self._anchor_week = self.dtstart.date() - timedelta(days=self.dtstart.weekday())
+    
+    def next_after(self, after: datetime) -> Optional[datetime]:
+        if self._step is not None:
+            nxt = self._next_elapsed(after)
+        else:
+            nxt = self._next_calendar(after)
+        if nxt is None or (self.until and nxt > self.until):
+            return None
+        return nxt
+    
+    def _next_elapsed(self, after: datetime) -> Optional[datetime]:
+        """Minutely/hourly rules step in real elapsed time from the anchor."""
+        anchor = self.dtstart
+        if self.freq == "hourly" and self.times:
+            anchor = anchor.replace(minute=self.times[0][1], second=0, microsecond=0)
+        anchor_utc = anchor.astimezone(timezone.utc)
+        
+        k = max(0, (after.astimezone(timezone.utc) - anchor_utc) // self._step + 1)
+        candidate = anchor_utc + k * self._step
+        for _ in range(MAX_SEARCH_DAYS):
+            local = candidate.astimezone(self.tz)
+            if not self.weekdays or local.weekday() in self.weekdays:
+                return local
+            candidate += self._step
+        return None
+    
+    def _next_calendar(self, after: datetime) -> Optional[datetime]:
+        """Daily/weekly/monthly/yearly rules walk calendar days and match wall-clock times."""
+        after_local = after.astimezone(self.tz)
+        day = max(after_local.date(), self.dtstart.date())
+        for _ in range(MAX_SEARCH_DAYS):
+            if self._day_matches(day):
+                for hour, minute in self.times:
+                    candidate = localize(datetime.combine(day, dtime(hour, minute)), self.tz)
+                    if candidate > after:
+                        return candidate
+            day += timedelta(days=1)
+        return None
+    
+    def _day_matches(self, day: date) -> bool:
+        if self.freq in ("monthly", "yearly"):
+            return self._month_day_matches(day)
+        if self.weekdays and day.weekday() not in self.weekdays:
+            return False
+        if self.interval == 1:
+            return True
+        if self.freq == "daily":
+            return (day - self.dtstart.date()).days % self.interval == 0
+        weeks = (day - self._anchor_week).days // 7
+        return weeks % self.interval == 0
+    
+    def _month_day_matches(self, day: date) -> bool:
+        """Every BY* part given must match, like RFC 5545 (BYDAY counts within the month)."""
+        if self.months and day.month not in self.months:
+            return False
+        if self.freq == "monthly":
+            periods = (day.year - self.dtstart.year) * 12 + day.month - self.dtstart.month
+        else:
+            periods = day.year - self.dtstart.year
+        if periods % self.interval:
+            return False
+        last = calendar.monthrange(day.year, day.month)[1]
+        if self.monthdays and not any(day.day == (d if d > 0 else last + 1 + d) for d in self.monthdays):
+            return False
+        if self.weekdays or self.nth_weekdays:
+            weekday = day.weekday()
+            nth_from_start = (day.day - 1) // 7 + 1
+            nth_from_end = -((last - day.day) // 7 + 1)
+            if not ((self.weekdays and weekday in self.weekdays)
+                    or (self.nth_weekdays and ((nth_from_start, weekday) in self.nth_weekdays
+                                               or (nth_from_end, weekday) in self.nth_weekdays))):
+                return False
+        return True
+    
+    def _rrule_text(self) -> str:
+        parts = [f"FREQ={self.freq.upper()}", f"INTERVAL={self.interval}"]
+        if self.months:
+            parts.append("BYMONTH=" + ",".join(str(m) for m in sorted(self.months)))
+        if self.monthdays:
+            parts.append("BYMONTHDAY=" + ",".join(str(d) for d in sorted(self.monthdays)))
+        days = [RRULE_DAYS[d] for d in sorted(self.weekdays or ())]
+        days += [f"{n}{RRULE_DAYS[d]}" for n, d in sorted(self.nth_weekdays or ())]
+        if days:
+            parts.append("BYDAY=" + ",".join(days))
+        parts.append("BYHOUR=" + ",".join(str(h) for h in sorted({h for h, _ in self.times})))
+        parts.append("BYMINUTE=" + ",".join(str(m) for m in sorted({m for _, m in self.times})))
+        if self.until:
+            parts.append("UNTIL=" + self.until.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ"))
+        return ";".join(parts)
+    
+    def describe(self) -> str:
+        if self.freq in ("monthly", "yearly"):
+            return self._rrule_text()  # No spoken form parses back to these
+        unit = FREQ_UNITS[self.freq]
+        if self.interval > 1:
+            text = f"every {self.interval} {unit}s"
+            if self.weekdays:
+                text += " on " + _describe_days(self.weekdays)
+        elif self.weekdays and (self.freq == "weekly" or self.weekdays != set(range(7))):
+            text = "every " + _describe_days(self.weekdays)
+            if self.freq in ("minutely", "hourly"):
+                text = f"every {unit} on " + _describe_days(self.weekdays)
+        else:
+            text = {"minutely": "every minute", "hourly": "hourly", "daily": "daily"}[self.freq]
+        
+        if self.times and self.freq != "minutely":
+            if self.freq == "hourly":
+                text += f" at :{self.times[0][1]:02d}"
+            else:
+                text += " at " + " and ".join(f"{h:02d}:{m:02d}" for h, m in self.times)
+        if self.until:
+            text += f" until {self.until.astimezone(self.tz).date().isoformat()}"
+        return text
+
+
+class CronRule(Recurrence):
+    """Standard five-field cron expression (minute hour day-of-month month day-of-week)."""
+    
+    MONTH_NAMES = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+    DOW_NAMES = ["sun", "mon", "tue", "wed", "thu", "fri", "sat"]
+    
+    def __init__(self, expression: str, tz: Optional[tzinfo] = None):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields, got {len(fields)}: '{expression}'")
+        
+        self.expression = " ".join(fields)
+        self.tz = tz or local_timezone()
+        self.minutes = sorted(self._parse_field(fields[0], 0, 59))
+        self.hours = sorted(self._parse_field(fields[1], 0, 23))
+        self.days = self._parse_field(fields[2], 1, 31)
+        self.months = self._parse_field(fields[3], 1, 12, self.MONTH_NAMES, offset=1)
+        # Cron counts Sunday as 0 (and 7); store as Python weekdays (Monday=0)
+        cron_dows = self._parse_field(fields[4], 0, 7, self.DOW_NAMES)
+        self.weekdays = {(d - 1) % 7 for d in cron_dows}
+        self._dom_any = fields[2] == "*"
+        self._dow_any = fields[4] == "*"
+    
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int, names: Optional[List[str]] = None,
+                     offset: int = 0) -> Set[int]:
+        values: Set[int] = set()
+        
+        def number(token: str) -> int:
+            if names and token.lower()[:3] in names:
+                return names.index(token.lower()[:3]) + offset
+            return int(token)
+        
+        for part in field.split(","):
+            step = 1
+            if "/" in part:
+                part, step_text = part.split("/", 1)
+                step = int(step_text)
+                if step < 1:
+                    raise ValueError(f"Invalid cron step in '{field}'")
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start_text, end_text = part.split("-", 1)
+                start, end = number(start_text), number(end_text)
+            else:
+                start = number(part)
+                end = high if step > 1 else start
+            if not (low <= start <= high and low <= end <= high) or start > end:
+                raise ValueError(f"Cron field '{field}' out of range {low}-{high}")
+            values.update(range(start, end + 1, step))
+        return values
+    
+    def _day_matches(self, day: date) -> bool:
+        if day.month not in self.months:
+            return False
+        dom = day.day in self.days
+        dow = day.weekday() in self.weekdays
+        # Like cron: when both fields are restricted, either may match
+        if not self._dom_any and not self._dow_any:
+            return dom or dow
+        return dom and dow
+    
+    def next_after(self, after: datetime) -> Optional[datetime]:
+        after_local = after.astimezone(self.tz)
+        day = after_local.date()
+        for _ in range(MAX_SEARCH_DAYS):
+            if self._day_matches(day):
+                for hour in self.hours:
+                    # An hour of slack so DST shifts can't skip a candidate
+                    if day == after_local.date() and hour < after_local.hour - 1:
+                        continue
+                    for minute in self.minutes:
+                        candidate = localize(datetime.combine(day, dtime(hour, minute)), self.tz)
+                        if candidate > after:
+                            return candidate
+            day += timedelta(days=1)
+        return None
+    
+    def describe(self) -> str:
+        return f"cron: {self.expression}"
+
+
+def _describe_days(weekdays: Set[int]) -> str:
+    if weekdays == set(range(5)):
+        return "weekday"
+    if weekdays == {5, 6}:
+        return "weekend"
+    return " and ".join(WEEKDAY_NAMES[d] for d in sorted(weekdays))
+
+
+# ============================================================================
+# Parsing
+# ============================================================================
+
+_TIME_RE = re.compile(r'\b(\d{1,2})(?::(\d{2}))?\s*(am|pm)?\b|\b(noon|midnight)\b|:(\d{2})\b')
+_AT_RE = re.compile(r'\bat\s+((?:(?:\d{1,2}(?::\d{2})?\s*(?:am|pm)?|noon|midnight|:\d{2})(?:\s*(?:,|and)\s*)?)+)')
+_INTERVAL_RE = re.compile(r'\b(?:every|each)\s+(\d+|other)\s+(minute|hour|day|week)s?\b')
+_UNIT_RE = re.compile(r'\b(?:every|each)\s+(minute|hour|day|week)\b')
+_UNTIL_RE = re.compile(r'\buntil\s+(\d{4}-\d{2}-\d{2})\b')
+_ANCHOR_RE = re.compile(r'\b(?:every|each|daily|hourly|weekly|weekdays|weekends)\b')
+_DAY_RE = re.compile(r'\b(' + "|".join(WEEKDAY_NAMES) + r')s?\b|\b(weekday|weekend)s?\b')
+_CRON_RE = re.compile(r'^[\d*/,\-a-z]+(\s+[\d*/,\-a-z]+){4}$')
+
+
+def _parse_times(text: str) -> List[Tuple[int, int]]:
+    """(hour, minute) pairs from every "at ..." clause."""
+    times = []
+    for clause in _AT_RE.finditer(text):
+        for match in _TIME_RE.finditer(clause.group(1)):
+            hour_text, minute_text, meridiem, word, bare_minute = match.groups()
+            if word:
+                times.append((12 if word == "noon" else 0, 0))
+                continue
+            if bare_minute:
+                times.append((0, int(bare_minute)))
+                continue
+            hour, minute = int(hour_text), int(minute_text or 0)
+            if meridiem == "pm" and hour < 12:
+                hour += 12
+            elif meridiem == "am" and hour == 12:
+                hour = 0
+            if hour > 23 or minute > 59:
+                raise ValueError(f"Invalid time '{match.group(0)}'")
+            times.append((hour, minute))
+    return times
+
+
+def _parse_natural(text: str, dtstart: Optional[datetime], tz: tzinfo) -> RRule:
+    if not _ANCHOR_RE.search(text):
+        raise ValueError(f"No recurrence found in '{text}'")
+    
+    interval = 1
+    freq = None
+    explicit = False
+    
+    interval_match = _INTERVAL_RE.search(text)
+    unit_match = _UNIT_RE.search(text)
+    if interval_match:
+        count, unit = interval_match.groups()
+        interval = 2 if count == "other" else int(count)
+        freq = UNIT_FREQS[unit]
+        explicit = True
+    elif unit_match:
+        freq = UNIT_FREQS[unit_match.group(1)]
+    elif re.search(r'\bhourly\b', text):
+        freq = "hourly"
+    elif re.search(r'\bweekly\b', text):
+        freq = "weekly"
+    
+    weekdays: Set[int] = set()
+    for day_match in _DAY_RE.finditer(text):
+        name, group = day_match.groups()
+        if name:
+            weekdays.add(WEEKDAY_NAMES.index(name))
+        else:
+            weekdays.update(range(5) if group == "weekday" else (5, 6))
+    
+    if freq is None:
+        # "every day", "every weekday", "every monday": daily, filtered by weekday
+        freq = "daily"
+    
+    times = _parse_times(text)
+    if freq in ("minutely", "hourly"):
+        explicit = True
+    elif times:
+        explicit = True
+    
+    until = None
+    until_match = _UNTIL_RE.search(text)
+    if until_match:
+        end_day = date.fromisoformat(until_match.group(1))
+        until = localize(datetime.combine(end_day, dtime(23, 59, 59)), tz)
+    
+    return RRule(freq, interval=interval, weekdays=weekdays or None, times=times,
+                 until=until, dtstart=dtstart, tz=tz, explicit=explicit)
+
+
+def _parse_rrule(text: str, dtstart: Optional[datetime], tz: tzinfo) -> RRule:
+    parts = {}
+    for item in text.split(":", 1)[-1].split(";") if text.lower().startswith("rrule:") else text.split(";"):
+        if "=" in item:
+            key, value = item.split("=", 1)
+            parts[key.strip().upper()] = value.strip().upper()
+    
+    freq = parts.get("FREQ", "").lower()
+    if "BYSETPOS" in parts:
+        raise ValueError("BYSETPOS is not supported")
+    weekdays, nth_weekdays = set(), set()
+    for day in parts["BYDAY"].split(",") if "BYDAY" in parts else ():
+        ordinal = day[:-2]
+        if ordinal and freq in ("monthly", "yearly"):
+            nth_weekdays.add((int(ordinal), RRULE_DAYS.index(day[-2:])))
+        else:
+            weekdays.add(RRULE_DAYS.index(day[-2:]))
+    monthdays = {int(d) for d in parts["BYMONTHDAY"].split(",")} if "BYMONTHDAY" in parts else None
+    months = {int(m) for m in parts["BYMONTH"].split(",")} if "BYMONTH" in parts else None
+    if freq == "yearly" and (weekdays or nth_weekdays) and not months:
+        raise ValueError("Yearly BYDAY rules need BYMONTH")
+    hours = [int(h) for h in parts["BYHOUR"].split(",")] if "BYHOUR" in parts else []
+    minutes = [int(m) for m in parts["BYMINUTE"].split(",")] if "BYMINUTE" in parts else [0]
+    times = [(h, m) for h in hours for m in minutes]
+    if freq == "hourly" and not hours and "BYMINUTE" in parts:
+        times = [(0, minutes[0])]
+    
+    until = None
+    if "UNTIL" in parts:
+        value = parts["UNTIL"]
+        if value.endswith("Z"):
+            until = datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+        elif "T" in value:
+            until = localize(datetime.strptime(value, "%Y%m%dT%H%M%S"), tz)
+        else:
+            until = localize(datetime.strptime(value, "%Y%m%d").replace(hour=23, minute=59, second=59), tz)
+    
+    return RRule(freq, interval=int(parts.get("INTERVAL", 1)), weekdays=weekdays or None,
+                 times=times, until=until, dtstart=dtstart, tz=tz, monthdays=monthdays,
+                 months=months, nth_weekdays=nth_weekdays or None)
+
+
+def parse_recurrence(text: str, dtstart: Optional[datetime] = None,
+                     tz: Optional[tzinfo] = None) -> Recurrence:
+    """
+    Parse a recurrence description into a rule object.
+    
+    Args:
+        text: Natural language, "cron: ..." or RRULE text
+        dtstart: Anchor for interval alignment (defaults to now)
+        tz: Evaluation timezone (defaults to local_timezone())
+    
+    Returns:
+        Recurrence rule
+    
+    Raises:
+        ValueError: If no recurrence can be parsed
+    """
+    tz = tz or local_timezone()
+    if dtstart is not None and dtstart.tzinfo is None:
+        dtstart = dtstart.astimezone()
+    stripped = text.strip()
+    lowered = stripped.lower()
+    
+    if lowered.startswith("cron:"):
+        return CronRule(stripped.split(":", 1)[1], tz=tz)
+    if lowered.startswith("rrule:") or lowered.startswith("freq="):
+        return _parse_rrule(stripped, dtstart, tz)
+    if _CRON_RE.match(lowered) and not _ANCHOR_RE.search(lowered):
+        return CronRule(stripped, tz=tz)
+    return _parse_natural(lowered, dtstart, tz)
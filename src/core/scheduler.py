@@ -3,27 +3,38 @@ Scheduling System
 Handles reminders and time-based automated tasks
 """
 
-import schedule
+import heapq
+import itertools
+import re
+import threading
 import time
-from datetime import datetime, timedelta
-from typing import List, Dict, Callable, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import List, Dict, Callable, Optional, Tuple
 import json
 from pathlib import Path
+from src.config.config import Config
+from src.core.recurrence import Recurrence, parse_recurrence
+
+
+MISFIRE_POLICIES = ("fire_late", "coalesce", "drop")
 
 
 class ScheduledTask:
     """Represents a scheduled task."""
     
-    def __init__(self, task_id: str, task_type: str, description: str, 
+    def __init__(self, task_id: str, task_type: str, description: str,
                  action: str, params: Dict, trigger: str):
         self.task_id = task_id
         self.task_type = task_type  # "reminder", "recurring", "one_time"
         self.description = description
-        self.action = action  # "notify", "open_app", "workflow", etc.
+        self.action = action  # "notify", "open_app", "workflow", "prepare_briefing", etc.
         self.params = params
         self.trigger = trigger  # "in 30 minutes", "daily at 9:00", etc.
         self.created_at = datetime.now()
         self.executed_count = 0
+        self.next_run: Optional[float] = None  # Epoch seconds of the next fire
+        self.recurrence: Optional[Recurrence] = None  # Parsed once from trigger
     
     def to_dict(self) -> Dict:
         """Convert to dictionary for storage."""
@@ -35,43 +46,192 @@ class ScheduledTask:
             "params": self.params,
             "trigger": self.trigger,
             "created_at": self.created_at.isoformat(),
-            "executed_count": self.executed_count
+            "executed_count": self.executed_count,
+            # Absolute UTC deadline so the task survives restarts
+            "next_run": (datetime.fromtimestamp(self.next_run, timezone.utc).isoformat()
+                         if self.next_run is not None else None)
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ScheduledTask":
+        """Recreate a task from its stored dictionary."""
+        task = cls(
+            task_id=data["task_id"],
+            task_type=data["task_type"],
+            description=data["description"],
+            action=data["action"],
+            params=data.get("params", {}),
+            trigger=data["trigger"]
+        )
+        if data.get("created_at"):
+            task.created_at = datetime.fromisoformat(data["created_at"])
+        task.executed_count = data.get("executed_count", 0)
+        if data.get("next_run"):
+            task.next_run = datetime.fromisoformat(data["next_run"]).timestamp()
+        return task
 
 
 class Scheduler:
-    """Manages scheduled tasks and reminders."""
+    """
+    Manages scheduled tasks and reminders.
+    
+    A dedicated thread sleeps until the earliest deadline in a min-heap of
+    (next_run, seq, task_id) entries and hands due tasks to a worker pool,
+    so tasks fire on time regardless of what the main loop is blocked on.
+    Adding or cancelling a task wakes the thread to re-evaluate its deadline.
     
-    def __init__(self, agent, storage_path: Path):
+    Tasks are persisted as an append-only JSON-lines journal of put/delete
+    records carrying absolute UTC deadlines; it is replayed on startup and
+    compacted once dead records outnumber live tasks. A deadline missed by
+    more than the grace period (Jarvis not running, machine asleep) is
+    handled by the misfire policy:
+        fire_late - run every missed occurrence
+        coalesce  - run once, then continue from now
+        drop      - skip missed runs, then continue from now
+    """
+    
+    def __init__(self, agent, storage_path: Path, max_workers: int = 4,
+                 misfire_policy: str = Config.SCHEDULER_MISFIRE_POLICY,
+                 misfire_grace_seconds: float = Config.SCHEDULER_MISFIRE_GRACE_SECONDS):
+        if misfire_policy not in MISFIRE_POLICIES:
+            raise ValueError(f"Unknown misfire policy '{misfire_policy}'. Available: {MISFIRE_POLICIES}")
+        
         self.agent = agent
         self.storage_path = storage_path
+        self.misfire_policy = misfire_policy
+        self.misfire_grace_seconds = misfire_grace_seconds
         self.tasks: List[ScheduledTask] = []
+        self._index: Dict[str, ScheduledTask] = {}
         self.task_counter = 0
+        
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition(threading.RLock())
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._max_workers = max_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._io_lock = threading.Lock()
+        self._journal_records = 0
+        
         self._load_tasks()
     
+    # ============================================================================
+    # Persistence
+    # ============================================================================
+    
     def _load_tasks(self):
-        """Load scheduled tasks from disk."""
-        if self.storage_path.exists():
+        """Replay the task journal from disk and rebuild the deadline heap."""
+        if not self.storage_path.exists():
+            return
+        
+        try:
+            records = self._read_journal()
+        except Exception as e:
+            print(f"Could not load scheduled tasks: {e}")
+            return
+        
+        for task_data in records.values():
+            task = ScheduledTask.from_dict(task_data)
+            self._bump_counter(task.task_id)
+            if task.task_type == "recurring":
+                try:
+                    task.recurrence = parse_recurrence(task.trigger, dtstart=task.created_at)
+                except ValueError as e:
+                    print(f"Skipping scheduled task '{task.description}': {e}")
+                    continue
+            if task.next_run is None:
+                # Written before deadlines were stored
+                if task.recurrence is None:
+                    continue
+                nxt = task.recurrence.next_after(datetime.now(timezone.utc))
+                if nxt is None:
+                    continue
+                task.next_run = nxt.timestamp()
+            self._add(task)
+            # Overdue tasks fire as soon as the thread starts, under the misfire policy
+            self._heap.append((task.next_run, next(self._seq), task.task_id))
+        heapq.heapify(self._heap)
+        
+        if self._journal_records > 2 * len(self.tasks) + 16:
+            self._compact()
+    
+    def _read_journal(self) -> Dict[str, Dict]:
+        """Read live task records, keyed by task ID in insertion order."""
+        with open(self.storage_path, 'r') as f:
+            content = f.read()
+        
+        # Older versions stored a single JSON array
+        if content.lstrip().startswith('['):
+            records = {t["task_id"]: t for t in json.loads(content)}
+            self._journal_records = len(records) + 1
+            return records
+        
+        records: Dict[str, Dict] = {}
+        count = 0
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            count += 1
             try:
-                with open(self.storage_path, 'r') as f:
-                    data = json.load(f)
-                    # Recreate tasks (but don't reschedule old one-time tasks)
-                    for task_data in data:
-                        if task_data["task_type"] == "recurring":
-                            # Reschedule recurring tasks
-                            task = ScheduledTask(**task_data)
-                            self.tasks.append(task)
-                            self._schedule_task(task)
-            except Exception as e:
-                print(f"Could not load scheduled tasks: {e}")
-    
-    def _save_tasks(self):
-        """Save scheduled tasks to disk."""
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # Torn final write; earlier records are still valid
+                continue
+            if entry.get("op") == "put":
+                records[entry["task"]["task_id"]] = entry["task"]
+            elif entry.get("op") == "del":
+                records.pop(entry["task_id"], None)
+        self._journal_records = count
+        return records
+    
+    def _bump_counter(self, task_id: str):
+        """Keep new task IDs from colliding with loaded ones."""
+        match = re.search(r'_(\d+)$', task_id)
+        if match:
+            self.task_counter = max(self.task_counter, int(match.group(1)) + 1)
+    
+    def _append(self, entry: Dict):
+        """Append one record to the journal."""
         try:
-            with open(self.storage_path, 'w') as f:
-                json.dump([t.to_dict() for t in self.tasks], f, indent=2)
+            with self._io_lock:
+                with open(self.storage_path, 'a') as f:
+                    f.write(json.dumps(entry) + "\n")
+                self._journal_records += 1
         except Exception as e:
             print(f"Could not save scheduled tasks: {e}")
+            return
+        
+        if self._journal_records > 2 * len(self.tasks) + 16:
+            self._compact()
+    
+    def _persist(self, task: ScheduledTask):
+        """Record a task's current state."""
+        self._append({"op": "put", "task": task.to_dict()})
+    
+    def _forget(self, task_id: str):
+        """Record a task's removal."""
+        self._append({"op": "del", "task_id": task_id})
+    
+    def _compact(self):
+        """Rewrite the journal with one record per live task."""
+        try:
+            # Held from the copy to the replace: a record appended in between
+            # would go to the old file and be lost. Never taken inside _cond.
+            with self._io_lock:
+                with self._cond:
+                    lines = [json.dumps({"op": "put", "task": t.to_dict()}) for t in self.tasks]
+                tmp_path = self.storage_path.with_suffix(self.storage_path.suffix + ".tmp")
+                with open(tmp_path, 'w') as f:
+                    f.write("".join(line + "\n" for line in lines))
+                tmp_path.replace(self.storage_path)
+                self._journal_records = len(lines)
+        except Exception as e:
+            print(f"Could not save scheduled tasks: {e}")
+    
+    # ============================================================================
+    # Public API
+    # ============================================================================
     
     def add_reminder(self, message: str, delay_minutes: int) -> str:
         """
@@ -84,34 +244,30 @@ class Scheduler:
         Returns:
             Task ID
         """
-        task_id = f"reminder_{self.task_counter}"
-        self.task_counter += 1
+        with self._cond:
+            task_id = f"reminder_{self.task_counter}"
+            self.task_counter += 1
         
+        fire_at = time.time() + delay_minutes * 60
         task = ScheduledTask(
             task_id=task_id,
             task_type="one_time",
             description=f"Remind: {message}",
             action="notify",
             params={"message": message},
-            trigger=f"in {delay_minutes} minutes"
+            trigger=f"once at {datetime.fromtimestamp(fire_at).strftime('%Y-%m-%d %H:%M')}"
         )
         
-        self.tasks.append(task)
-        
-        # Schedule the reminder
-        def reminder_job():
-            print(f"\n🔔 Reminder: {message}")
-            task.executed_count += 1
-            self.tasks.remove(task)
-            self._save_tasks()
-        
-        schedule.every(delay_minutes).minutes.do(reminder_job).tag(task_id)
-        self._save_tasks()
+        with self._cond:
+            self._add(task)
+            self._push(task, fire_at)
+        self._persist(task)
         
         return task_id
     
-    def add_recurring_task(self, description: str, action: str, 
-                          params: Dict, schedule_time: str, frequency: str) -> str:
+    def add_recurring_task(self, description: str, action: str,
+                          params: Dict, schedule_time: Optional[str] = None,
+                          frequency: str = "daily", trigger: Optional[str] = None) -> str:
         """
         Add a recurring task.
         
@@ -121,12 +277,22 @@ class Scheduler:
             params: Action parameters
             schedule_time: Time string (e.g., "09:00")
             frequency: "daily", "hourly", etc.
+            trigger: Full recurrence instead of frequency/time, e.g.
+                     "every weekday at 8:30", "cron: 0 9 * * 1-5"
         
         Returns:
             Task ID
+        
+        Raises:
+            ValueError: If the recurrence can't be parsed
         """
-        task_id = f"recurring_{self.task_counter}"
-        self.task_counter += 1
+        if trigger is None:
+            trigger = f"{frequency} at {schedule_time}" if schedule_time else frequency
+        recurrence = parse_recurrence(trigger)
+        
+        with self._cond:
+            task_id = f"recurring_{self.task_counter}"
+            self.task_counter += 1
         
         task = ScheduledTask(
             task_id=task_id,
@@ -134,38 +300,167 @@ class Scheduler:
             description=description,
             action=action,
             params=params,
-            trigger=f"{frequency} at {schedule_time}"
+            trigger=recurrence.describe()
         )
+        task.recurrence = recurrence
         
-        self.tasks.append(task)
-        self._schedule_task(task)
-        self._save_tasks()
+        with self._cond:
+            self._add(task)
+            if not self._schedule_task(task):
+                self._remove(task)
+                raise ValueError(f"'{trigger}' has no future occurrences")
+        self._persist(task)
         
         return task_id
     
-    def _schedule_task(self, task: ScheduledTask):
-        """Schedule a task with the schedule library."""
-        def task_job():
+    def cancel_task(self, task_id: str) -> bool:
+        """Cancel a scheduled task."""
+        with self._cond:
+            task = self._index.get(task_id)
+            if not task:
+                return False
+            # Heap entry is discarded lazily when it surfaces
+            self._remove(task)
+            self._cond.notify()
+        self._forget(task_id)
+        return True
+    
+    def list_tasks(self) -> List[ScheduledTask]:
+        """Get all scheduled tasks."""
+        with self._cond:
+            return list(self.tasks)
+    
+    def next_deadline(self) -> Optional[float]:
+        """Epoch seconds of the earliest pending fire, or None."""
+        with self._cond:
+            self._discard_stale()
+            return self._heap[0][0] if self._heap else None
+    
+    # ============================================================================
+    # Scheduler thread
+    # ============================================================================
+    
+    def start(self):
+        """Start the scheduler thread and worker pool (idempotent)."""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self._pool = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="jarvis-task")
+            self._thread = threading.Thread(target=self._run_loop, name="jarvis-scheduler", daemon=True)
+            self._thread.start()
+    
+    def shutdown(self, wait: bool = False):
+        """Stop the scheduler thread and worker pool."""
+        with self._cond:
+            if not self._running:
+                return
+            self._running = False
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+        if self._pool:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+    
+    def _run_loop(self):
+        """Sleep until the next deadline, then dispatch every due task."""
+        with self._cond:
+            while self._running:
+                self._discard_stale()
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                
+                delay = self._heap[0][0] - time.time()
+                if delay > 0:
+                    # Woken early by add/cancel/shutdown; loop re-reads the heap
+                    self._cond.wait(timeout=delay)
+                    continue
+                
+                fire_at, _, task_id = heapq.heappop(self._heap)
+                task = self._find(task_id)
+                if task:
+                    self._pool.submit(self._run_task, task, fire_at)
+    
+    def _push(self, task: ScheduledTask, fire_at: float):
+        """Index a task's next fire time and wake the scheduler thread."""
+        with self._cond:
+            task.next_run = fire_at
+            heapq.heappush(self._heap, (fire_at, next(self._seq), task.task_id))
+            self._cond.notify()
+    
+    def _discard_stale(self):
+        """Drop heap entries for cancelled or rescheduled tasks."""
+        while self._heap:
+            fire_at, _, task_id = self._heap[0]
+            task = self._find(task_id)
+            if task and task.next_run == fire_at:
+                return
+            heapq.heappop(self._heap)
+    
+    def _find(self, task_id: str) -> Optional[ScheduledTask]:
+        return self._index.get(task_id)
+    
+    def _add(self, task: ScheduledTask):
+        self.tasks.append(task)
+        self._index[task.task_id] = task
+    
+    def _remove(self, task: ScheduledTask):
+        self.tasks.remove(task)
+        self._index.pop(task.task_id, None)
+        task.next_run = None
+    
+    def _run_task(self, task: ScheduledTask, fire_at: float):
+        """Worker-pool entry point for a due task."""
+        now = time.time()
+        missed = now - fire_at > self.misfire_grace_seconds
+        
+        if missed and self.misfire_policy == "drop":
+            print(f"\n⏭️  Skipped missed task: {task.description}")
+        else:
             self._execute_task(task)
-            task.executed_count += 1
-            self._save_tasks()
-        
-        # Parse trigger and schedule
-        if "daily" in task.trigger.lower():
-            # Extract time
-            import re
-            time_match = re.search(r'(\d{1,2}):(\d{2})', task.trigger)
-            if time_match:
-                hour, minute = time_match.groups()
-                schedule.every().day.at(f"{hour}:{minute}").do(task_job).tag(task.task_id)
-        elif "hourly" in task.trigger.lower():
-            schedule.every().hour.do(task_job).tag(task.task_id)
+            with self._cond:
+                task.executed_count += 1
+        
+        with self._cond:
+            if task.task_id not in self._index:
+                return  # Cancelled while running
+            finished = True
+            if task.task_type == "recurring":
+                # fire_late walks through every missed occurrence; the others resume from now
+                after = fire_at if self.misfire_policy == "fire_late" else max(now, fire_at)
+                finished = not self._schedule_task(task, after=datetime.fromtimestamp(after, timezone.utc))
+            if finished:
+                self._remove(task)
+        
+        if finished:
+            self._forget(task.task_id)
+        else:
+            self._persist(task)
+    
+    def _schedule_task(self, task: ScheduledTask, after: Optional[datetime] = None) -> bool:
+        """
+        Index a recurring task's next fire time.
+        
+        Returns:
+            False once the recurrence has no further occurrences
+        """
+        nxt = task.recurrence.next_after(after or datetime.now(timezone.utc))
+        if nxt is None:
+            return False
+        self._push(task, nxt.timestamp())
+        return True
     
     def _execute_task(self, task: ScheduledTask):
         """Execute a scheduled task."""
         try:
             if task.action == "notify":
-                print(f"\n🔔 {task.params.get('message', 'Scheduled notification')}")
+                if task.task_type == "one_time":
+                    print(f"\n🔔 Reminder: {task.params.get('message', '')}")
+                else:
+                    print(f"\n🔔 {task.params.get('message', 'Scheduled notification')}")
             
             elif task.action == "open_app":
                 app = task.params.get("app")
@@ -178,24 +473,15 @@ class Scheduler:
                 if workflow:
                     self.agent.workflows.execute(workflow)
                     print(f"\n🔔 Scheduled: Executed {workflow} workflow")
+            
+            elif task.action == "prepare_briefing":
+                # Quiet background work; the user asks for the briefing later
+                voice_output = getattr(self.agent, "voice_output", None) if Config.BRIEFING_PRESYNTHESIZE else None
+                self.agent.morning_briefing.prepare(voice_output=voice_output)
+                # Re-learn the time from the days since; this may replace the running task
+                reschedule = getattr(self.agent, "schedule_briefing_preparation", None)
+                if reschedule:
+                    reschedule()
         
         except Exception as e:
             print(f"Error executing scheduled task: {e}")
-    
-    def cancel_task(self, task_id: str) -> bool:
-        """Cancel a scheduled task."""
-        task = next((t for t in self.tasks if t.task_id == task_id), None)
-        if task:
-            schedule.clear(task_id)
-            self.tasks.remove(task)
-            self._save_tasks()
-            return True
-        return False
-    
-    def list_tasks(self) -> List[ScheduledTask]:
-        """Get all scheduled tasks."""
-        return self.tasks
-    
-    def run_pending(self):
-        """Run pending scheduled tasks. Call this in the main loop."""
-        schedule.run_pending()
@@ -0,0 +1,226 @@
+"""
+Persistent AppleScript Worker
+Runs AppleScript through one long-lived process instead of spawning
+`osascript` per action.
+
+Protocol (JSON lines over stdin/stdout):
+    request:  {"id": 1, "scripts": ["tell application \"Spotify\" to pause", ...]}
+    response: {"id": 1, "results": [{"ok": true, "output": "", "error": ""}, ...]}
+
+Several statements can be sent in one request (run_applescript_batch) so
+they share a single round trip. On macOS the worker is `osascript -l
+JavaScript` executing each script with NSAppleScript; elsewhere (or with
+JARVIS_SCRIPT_BACKEND=stub) a local stub process speaks the same protocol
+for tests and benchmarks.
+"""
+
+import json
+import queue
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+from src.config.config import Config
+
+
+# JXA host loop: reads requests from stdin and runs each script via NSAppleScript
+JXA_WORKER = r'''
+ObjC.import('Foundation');
+function isNil(o) { return o === undefined || o === null || (typeof o.isNil === 'function' && o.isNil()); }
+function send(obj) {
+    var s = $(JSON.stringify(obj) + "\n");
+    $.NSFileHandle.fileHandleWithStandardOutput.writeData(s.dataUsingEncoding($.NSUTF8StringEncoding));
+}
+function runOne(source) {
+    var err = Ref();
+    var desc = $.NSAppleScript.alloc.initWithSource(source).executeAndReturnError(err);
+    if (!isNil(err[0])) {
+        var msg = err[0].objectForKey('NSAppleScriptErrorMessage');
+        return {ok: false, output: '', error: isNil(msg) ? 'AppleScript error' : ObjC.unwrap(msg)};
+    }
+    var out = isNil(desc) ? null : desc.stringValue;
+    return {ok: true, output: isNil(out) ? '' : ObjC.unwrap(out), error: ''};
+}
+var stdin = $.NSFileHandle.fileHandleWithStandardInput;
+var buffer = '';
+while (true) {
+    var data = stdin.availableData;
+    if (data.length == 0) break;
+    buffer += ObjC.unwrap($.NSString.alloc.initWithDataEncoding(data, $.NSUTF8StringEncoding));
+    var nl;
+    while ((nl = buffer.indexOf("\n")) >= 0) {
+        var line = buffer.slice(0, nl);
+        buffer = buffer.slice(nl + 1);
+        if (!line) continue;
+        var req = JSON.parse(line);
+        send({id: req.id, results: req.scripts.map(runOne)});
+    }
+}
+'''
+
+
+class ScriptResult:
+    """Outcome of one AppleScript execution."""
+
+    def __init__(self, ok: bool, output: str = "", error: str = ""):
+        self.ok = ok
+        self.output = output
+        self.error = error
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+    def __repr__(self) -> str:
+        return f"ScriptResult(ok={self.ok}, output={self.output!r}, error={self.error!r})"
+
+
+class ScriptWorker:
+    """
+    Long-lived script execution process with a request/response protocol.
+
+    Requests are serialized (the host runs scripts one at a time anyway).
+    A request that exceeds its timeout kills the worker; the next request
+    starts a fresh one.
+    """
+
+    def __init__(self, command: List[str]):
+        """
+        Args:
+            command: Worker process command line
+        """
+        self.command = command
+        self.process: Optional[subprocess.Popen] = None
+        self._responses: "queue.Queue[Optional[dict]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    def _ensure_started(self):
+        if self.process and self.process.poll() is None:
+            return
+        self._responses = queue.Queue()
+        self.process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1
+        )
+        threading.Thread(target=self._read_loop, args=(self.process, self._responses),
+                         name="jarvis-script-reader", daemon=True).start()
+
+    @staticmethod
+    def _read_loop(process: subprocess.Popen, responses: "queue.Queue"):
+        for line in process.stdout:
+            try:
+                responses.put(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        responses.put(None)  # Worker exited
+
+    def run_batch(self, scripts: List[str], timeout: float = 5.0) -> List[ScriptResult]:
+        """
+        Run several scripts in one round trip.
+
+        Returns:
+            One ScriptResult per script, in order
+        """
+        with self._lock:
+            try:
+                self._ensure_started()
+            except OSError as e:
+                return [ScriptResult(False, error=f"Script worker unavailable: {e}") for _ in scripts]
+
+            self._next_id += 1
+            request_id = self._next_id
+            try:
+                self.process.stdin.write(json.dumps({"id": request_id, "scripts": scripts}) + "\n")
+                self.process.stdin.flush()
+            except (BrokenPipeError, OSError) as e:
+                self._kill()
+                return [ScriptResult(False, error=f"Script worker died: {e}") for _ in scripts]
+
+            while True:
+                try:
+                    response = self._responses.get(timeout=timeout)
+                except queue.Empty:
+                    # A hung script blocks the worker; start over next time
+                    self._kill()
+                    return [ScriptResult(False, error=f"Script timed out after {timeout}s") for _ in scripts]
+                if response is None:
+                    self._kill()
+                    return [ScriptResult(False, error="Script worker exited") for _ in scripts]
+                if response.get("id") == request_id:
+                    break
+
+            results = response.get("results", [])
+            return [ScriptResult(r.get("ok", False), r.get("output", ""), r.get("error", "")) for r in results]
+
+    def run(self, script: str, timeout: float = 5.0) -> ScriptResult:
+        """Run a single script."""
+        return self.run_batch([script], timeout=timeout)[0]
+
+    def _kill(self):
+        if self.process:
+            try:
+                self.process.kill()
+                self.process.wait(timeout=1)
+            except Exception:
+                pass
+            self.process = None
+
+    def close(self):
+        """Stop the worker process."""
+        with self._lock:
+            if self.process and self.process.poll() is None:
+                try:
+                    self.process.stdin.close()
+                    self.process.wait(timeout=1)
+                except Exception:
+                    pass
+            self._kill()
+
+
+def worker_command(backend: str = Config.SCRIPT_BACKEND) -> List[str]:
+    """Command line for the configured worker backend ("auto", "osascript" or "stub")."""
+    if backend == "auto":
+        backend = "osascript" if sys.platform == "darwin" else "stub"
+    if backend == "osascript":
+        return ["osascript", "-l", "JavaScript", "-e", JXA_WORKER]
+    if backend == "stub":
+        return [sys.executable, str(Path(__file__).with_name("script_stub.py"))]
+    raise ValueError(f"Unknown script backend '{backend}'")
+
+
+_worker: Optional[ScriptWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_script_worker() -> ScriptWorker:
+    """Shared worker for the process, started on first use."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = ScriptWorker(worker_command())
+        return _worker
+
+
+def run_applescript(script: str, timeout: float = 5.0) -> ScriptResult:
+    """Run one AppleScript on the shared worker."""
+    return get_script_worker().run(script, timeout=timeout)
+
+
+def run_applescript_batch(scripts: List[str], timeout: float = 5.0) -> List[ScriptResult]:
+    """Run several AppleScripts in a single round trip on the shared worker."""
+    return get_script_worker().run_batch(scripts, timeout=timeout)
+
+
+def close_script_worker():
+    """Shut down the shared worker, if started."""
+    global _worker
+    with _worker_lock:
+        if _worker is not None:
+            _worker.close()
+            _worker = None
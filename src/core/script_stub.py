@@ -0,0 +1,47 @@
+"""
+Stub AppleScript worker
+Speaks the script_runner protocol without executing anything, so the
+worker path can be tested and benchmarked on Linux.
+
+Every script succeeds with empty output, except `return "text"` which
+echoes the text and `error "message"` which fails with the message.
+Set JARVIS_STUB_LATENCY_MS to simulate per-script execution time.
+"""
+
+import json
+import os
+import re
+import sys
+import time
+
+RETURN_RE = re.compile(r'^\s*return\s+"(.*)"\s*$', re.DOTALL)
+ERROR_RE = re.compile(r'^\s*error\s+"(.*)"\s*$', re.DOTALL)
+
+
+def run_script(script: str) -> dict:
+    match = RETURN_RE.match(script)
+    if match:
+        return {"ok": True, "output": match.group(1), "error": ""}
+    match = ERROR_RE.match(script)
+    if match:
+        return {"ok": False, "output": "", "error": match.group(1)}
+    return {"ok": True, "output": "", "error": ""}
+
+
+def main():
+    latency = float(os.getenv("JARVIS_STUB_LATENCY_MS", "0")) / 1000
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        results = []
+        for script in request["scripts"]:
+            if latency:
+                time.sleep(latency)
+            results.append(run_script(script))
+        sys.stdout.write(json.dumps({"id": request["id"], "results": results}) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
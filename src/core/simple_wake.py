@@ -1,66 +1,77 @@
-import pyaudio
 import numpy as np
 import time
+from typing import Optional
+from src.config.config import Config
+from src.core.audio_capture import ContinuousCapture, chunk_energies
 
 class SimplePushToTalk:
     """
     Simple energy-based voice activation.
     No API keys required - completely free!
+
+    Detection runs over a shared, always-on capture ring buffer, so the
+    audio that triggered activation can be handed to the recorder as pre-roll.
     """
-    def __init__(self, energy_threshold: int = 1000):
+    def __init__(self, energy_threshold: int = 1000, capture: Optional[ContinuousCapture] = None,
+                 preroll_seconds: float = Config.WAKE_PREROLL_SECONDS):
         self.energy_threshold = energy_threshold
-        self.pa = pyaudio.PyAudio()
-        self.stream = None
+        self.capture = capture or ContinuousCapture()
+        self.preroll_seconds = preroll_seconds
+        self.activation_position: Optional[int] = None
 
-    def listen(self, timeout: int = 30):
+    def listen(self, timeout: Optional[float] = 30):
         """
         Listens for audio above energy threshold.
-        Returns True when voice detected, False on timeout.
+        Returns True when voice detected, False on timeout (None = wait forever) or Ctrl+C.
         """
         print("Listening... (speak to activate, or press Ctrl+C to skip)")
-        
-        chunk = 1024
-        format = pyaudio.paInt16
-        channels = 1
-        rate = 16000
-        
-        self.stream = self.pa.open(
-            format=format,
-            channels=channels,
-            rate=rate,
-            input=True,
-            frames_per_buffer=chunk
-        )
-        
+
+        self.activation_position = None
+        self.capture.start()
+        chunk = self.capture.chunk
+        # Start from the newest whole chunk so stale audio can't trigger activation
+        position = self.capture.buffer.position
         start_time = time.time()
-        
+
         try:
             while True:
                 # Check timeout
-                if time.time() - start_time > timeout:
+                if timeout is not None and time.time() - start_time > timeout:
                     print("Timeout - no voice detected")
                     return False
-                
-                # Read audio
-                data = self.stream.read(chunk, exception_on_overflow=False)
-                audio_data = np.frombuffer(data, dtype=np.int16)
-                
-                # Calculate energy
-                energy = np.abs(audio_data).mean()
-                
+
+                samples, end = self.capture.read_since(position, timeout=0.25)
+                if len(samples) < chunk:
+                    continue
+                # Samples start later than `position` if the ring overwrote it
+                position = end - len(samples)
+
+                # Energy of every pending chunk in one pass
+                energies = chunk_energies(samples, chunk)
+                hits = np.flatnonzero(energies > self.energy_threshold)
+
                 # Detect voice
-                if energy > self.energy_threshold:
+                if hits.size:
+                    self.activation_position = position + int(hits[0]) * chunk
                     print("Voice detected!")
                     return True
-                    
+
+                position += len(energies) * chunk
+
         except KeyboardInterrupt:
             print("\nSkipped")
             return False
-        finally:
-            if self.stream:
-                self.stream.stop_stream()
-                self.stream.close()
+
+    def preroll_position(self) -> Optional[int]:
+        """
+        Absolute buffer position shortly before activation.
+        Pass this to VoiceInput.listen so the first syllables are kept.
+        """
+        if self.activation_position is None:
+            return None
+        preroll = int(self.preroll_seconds * self.capture.sample_rate)
+        return max(self.capture.buffer.oldest, self.activation_position - preroll)
 
     def close(self):
-        if self.pa:
-            self.pa.terminate()
+        if self.capture:
+            self.capture.close()
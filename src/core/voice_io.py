@@ -12,6 +12,7 @@ import wave
 import tempfile
 import subprocess
 import warnings
+from typing import Optional
 from elevenlabs import ElevenLabs, VoiceSettings
 from dotenv import load_dotenv
 
@@ -25,18 +26,28 @@ load_dotenv()
 class VoiceInput:
     """Handle voice input using Whisper."""
     
-    def __init__(self, model_size: str = "base"):
-        """Initialize Whisper model for speech recognition."""
+    def __init__(self, model_size: str = "base", capture=None):
+        """
+        Initialize Whisper model for speech recognition.
+        
+        Args:
+            model_size: Whisper model size
+            capture: Optional shared ContinuousCapture; when given, recordings
+                     are read from its ring buffer instead of a new stream
+        """
         print(f"Loading Whisper {model_size} model...")
         self.model = whisper.load_model(model_size)
         self.audio = pyaudio.PyAudio()
+        self.capture = capture
     
-    def record_audio(self, sample_rate: int = 16000) -> str:
+    def record_audio(self, sample_rate: int = 16000, start_position: Optional[int] = None) -> str:
         """
         Record audio from microphone until stopped by user.
         
         Args:
             sample_rate: Audio sample rate
+            start_position: Ring buffer position to record from (shared capture
+                            only), e.g. SimplePushToTalk.preroll_position()
             
         Returns:
             Path to recorded audio file
@@ -48,6 +59,13 @@ class VoiceInput:
         old_settings = termios.tcgetattr(sys.stdin)
         tty.setcbreak(sys.stdin.fileno())
         
+        if self.capture is not None:
+            try:
+                frames = self._record_from_capture(start_position)
+            finally:
+                termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
+            return self._write_wav(frames, self.capture.sample_rate)
+        
         stream = self.audio.open(
             format=pyaudio.paInt16,
             channels=1,
@@ -75,7 +93,30 @@ class VoiceInput:
             stream.close()
             termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
         
-        # Save to temporary file
+        return self._write_wav(frames, sample_rate)
+    
+    def _record_from_capture(self, start_position: Optional[int]) -> list:
+        """Collect audio from the shared capture buffer until a stop key is pressed."""
+        import sys, select
+        
+        self.capture.start()
+        position = self.capture.buffer.position if start_position is None else start_position
+        frames = []
+        while True:
+            samples, position = self.capture.read_since(position, timeout=0.1)
+            if len(samples):
+                frames.append(samples.tobytes())
+            
+            # Check for keypress to stop
+            if select.select([sys.stdin], [], [], 0)[0]:
+                key = sys.stdin.read(1)
+                if key in [' ', '\n', '\r', 'q']:
+                    print("\n✅ Stopped listening.")
+                    break
+        return frames
+    
+    def _write_wav(self, frames: list, sample_rate: int) -> str:
+        """Save raw int16 frames to a temporary WAV file."""
         temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
         wf = wave.open(temp_file.name, 'wb')
         wf.setnchannels(1)
@@ -99,14 +140,17 @@ class VoiceInput:
         result = self.model.transcribe(audio_file)
         return result["text"].strip()
     
-    def listen(self) -> str:
+    def listen(self, start_position: Optional[int] = None) -> str:
         """
         Record and transcribe audio.
         
+        Args:
+            start_position: Optional pre-roll position in the shared capture buffer
+        
         Returns:
             Transcribed text
         """
-        audio_file = self.record_audio()
+        audio_file = self.record_audio(start_position=start_position)
         print("🧠 Processing...")
         text = self.transcribe(audio_file)
         
@@ -133,6 +177,7 @@ class VoiceOutput:
         """
         self.use_elevenlabs = use_elevenlabs
         self.elevenlabs_client = None
+        self.prepared_audio = {}  # Text -> pre-generated audio file
         
         if use_elevenlabs:
             try:
@@ -163,35 +208,51 @@ class VoiceOutput:
         Returns:
             True if successful
         """
+        # Play pre-generated audio for the tail of the text if it was prepared
+        for prepared_text, path in list(self.prepared_audio.items()):
+            if text.endswith(prepared_text) and os.path.exists(path):
+                head = text[:-len(prepared_text)].strip()
+                if head and not self._speak_now(head, voice_id):
+                    return False
+                self.play_audio_file(path)
+                return True
+        
+        return self._speak_now(text, voice_id)
+    
+    def _synthesize_elevenlabs(self, text: str, voice_id: str) -> str:
+        """Generate speech with ElevenLabs into a temporary mp3 and return its path."""
+        audio_generator = self.elevenlabs_client.text_to_speech.convert(
+            voice_id=voice_id,
+            optimize_streaming_latency="0",
+            output_format="mp3_22050_32",
+            text=text,
+            model_id="eleven_turbo_v2_5",
+            voice_settings=VoiceSettings(
+                stability=0.5,
+                similarity_boost=0.75,
+                style=0.0,
+                use_speaker_boost=True,
+            ),
+        )
+        
+        # Save to temporary file
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
+        for chunk in audio_generator:
+            if chunk:
+                temp_file.write(chunk)
+        temp_file.close()
+        return temp_file.name
+    
+    def _speak_now(self, text: str, voice_id: str) -> bool:
         if self.use_elevenlabs and self.elevenlabs_client:
             try:
-                # Generate audio using ElevenLabs
-                audio_generator = self.elevenlabs_client.text_to_speech.convert(
-                    voice_id=voice_id,
-                    optimize_streaming_latency="0",
-                    output_format="mp3_22050_32",
-                    text=text,
-                    model_id="eleven_turbo_v2_5",
-                    voice_settings=VoiceSettings(
-                        stability=0.5,
-                        similarity_boost=0.75,
-                        style=0.0,
-                        use_speaker_boost=True,
-                    ),
-                )
-                
-                # Save to temporary file
-                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
-                for chunk in audio_generator:
-                    if chunk:
-                        temp_file.write(chunk)
-                temp_file.close()
+                path = self._synthesize_elevenlabs(text, voice_id)
                 
                 # Play audio using afplay (macOS) with interrupt capability
-                self.play_audio_file(temp_file.name)
+                self.play_audio_file(path)
                 
                 # Clean up
-                os.unlink(temp_file.name)
+                os.unlink(path)
                 
                 return True
                 
@@ -202,6 +263,30 @@ class VoiceOutput:
         else:
             # Use macOS say command
             return self._speak_macos(text)
+    
+    def prepare_speech(self, text: str, voice_id: str = "VHlcT3SbwGWyUw1IEjnd") -> bool:
+        """
+        Generate audio for text ahead of time; a later speak() of text
+        ending with it plays the file instead of synthesizing.
+        
+        Returns:
+            True if audio was prepared
+        """
+        try:
+            if self.use_elevenlabs and self.elevenlabs_client:
+                path = self._synthesize_elevenlabs(text, voice_id)
+            else:
+                path = tempfile.NamedTemporaryFile(delete=False, suffix='.aiff').name
+                subprocess.run(['say', '-v', 'Samantha', '-o', path, text], check=True)
+        except Exception as e:
+            print(f"Could not prepare speech: {e}")
+            return False
+        # Only the latest prepared text is kept
+        for old_path in self.prepared_audio.values():
+            if os.path.exists(old_path):
+                os.unlink(old_path)
+        self.prepared_audio = {text: path}
+        return True
             
     def play_audio_file(self, file_path: str):
         """Play audio file with interrupt capability."""
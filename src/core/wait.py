@@ -0,0 +1,48 @@
+"""
+Condition Waits
+Poll a readiness condition with exponential backoff instead of sleeping
+for a worst-case constant. Returns as soon as the condition holds.
+"""
+
+import time
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def wait_until(condition: Callable[[], T], timeout: float = 5.0, interval: float = 0.02,
+               max_interval: float = 0.25, backoff: float = 2.0,
+               sleep: Callable[[float], None] = time.sleep) -> Optional[T]:
+    """
+    Poll `condition` until it returns something truthy or `timeout` passes.
+
+    The first check is immediate. After that the gap between checks starts
+    at `interval` and grows by `backoff` up to `max_interval`. Exceptions
+    from the condition count as "not yet".
+
+    Args:
+        condition: Zero-argument readiness check
+        timeout: Seconds to keep trying
+        interval: First gap between checks
+        max_interval: Largest gap between checks
+        backoff: Growth factor for the gap
+        sleep: Sleep function (injectable for tests)
+
+    Returns:
+        The condition's truthy result, or its last (falsy) result on timeout
+    """
+    deadline = time.monotonic() + timeout
+    result = None
+    while True:
+        try:
+            result = condition()
+        except Exception:
+            result = None
+        if result:
+            return result
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return result
+        sleep(min(interval, remaining))
+        interval = min(interval * backoff, max_interval)
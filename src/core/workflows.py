@@ -1,9 +1,70 @@
 """
 Workflow Chains
 Pre-defined multi-step workflows for common tasks
+
+Each workflow is a DAG of steps. Steps with no dependency between them run
+concurrently on a thread pool; "after" lists the step IDs that must finish
+first (e.g. switch mode only once the apps are open).
+
+User workflows live in Config.WORKFLOWS_FILE (JSON, same shape as WORKFLOWS)
+and override built-ins by name. The file is watched and only workflows whose
+definition changed are re-validated; a broken edit keeps the last good plan.
 """
 
-from typing import Dict, List, Tuple, Any
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from pathlib import Path
+from typing import Dict, List, Tuple, Any, Optional
+
+from src.config.config import Config
+
+
+class WorkflowStep:
+    """A single validated workflow step."""
+    
+    def __init__(self, step_id: str, action: str, params: Dict[str, Any],
+                 after: Tuple[str, ...] = (), timeout: Optional[float] = None):
+        self.step_id = step_id
+        self.action = action
+        self.params = params
+        self.after = after
+        self.timeout = timeout or Config.WORKFLOW_STEP_TIMEOUT
+
+
+class StepResult:
+    """Outcome and timing of one executed step."""
+    
+    def __init__(self, step: WorkflowStep):
+        self.step = step
+        self.success = False
+        self.summary = ""  # e.g. "opened VS Code"
+        self.error: Optional[str] = None
+        self.started = 0.0  # Seconds since workflow start
+        self.duration = 0.0
+        self.timed_out = False
+
+
+class WorkflowResult:
+    """Per-step results and timing breakdown of a workflow run."""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.steps: List[StepResult] = []
+        self.duration = 0.0
+    
+    @property
+    def success(self) -> bool:
+        return any(r.success for r in self.steps)
+    
+    def timing_breakdown(self) -> str:
+        """Human-readable per-step timings."""
+        lines = [f"{self.name}: {self.duration:.2f}s total"]
+        for r in sorted(self.steps, key=lambda r: r.started):
+            status = "timeout" if r.timed_out else ("ok" if r.success else "failed")
+            lines.append(f"  {r.step.step_id:<12} +{r.started:.2f}s  {r.duration:.2f}s  {status}")
+        return "\n".join(lines)
 
 
 class WorkflowExecutor:
@@ -14,56 +75,250 @@ class WorkflowExecutor:
         "coding_session": {
             "description": "Prepare for coding",
             "steps": [
-                ("open_app", {"app": "VS Code"}),
-                ("open_app", {"app": "Terminal"}),
-                ("open_app", {"app": "Chrome"}),
-                ("switch_mode", {"mode": "coding"}),
-                ("set_volume", {"level": 40}),
+                {"id": "vscode", "action": "open_app", "params": {"app": "VS Code"}},
+                {"id": "terminal", "action": "open_app", "params": {"app": "Terminal"}},
+                {"id": "chrome", "action": "open_app", "params": {"app": "Chrome"}},
+                {"id": "mode", "action": "switch_mode", "params": {"mode": "coding"},
+                 "after": ["vscode", "terminal", "chrome"]},
+                {"id": "volume", "action": "set_volume", "params": {"level": 40}},
             ]
         },
         "research_session": {
             "description": "Prepare for research",
             "steps": [
-                ("open_app", {"app": "Chrome"}),
-                ("open_app", {"app": "Notes"}),
-                ("switch_mode", {"mode": "research"}),
-                ("set_volume", {"level": 60}),
+                {"id": "chrome", "action": "open_app", "params": {"app": "Chrome"}},
+                {"id": "notes", "action": "open_app", "params": {"app": "Notes"}},
+                {"id": "mode", "action": "switch_mode", "params": {"mode": "research"},
+                 "after": ["chrome", "notes"]},
+                {"id": "volume", "action": "set_volume", "params": {"level": 60}},
             ]
         },
         "end_session": {
             "description": "End work session",
             "steps": [
-                ("close_app", {"app": "VS Code"}),
-                ("close_app", {"app": "Terminal"}),
-                ("open_app", {"app": "Mail"}),
-                ("switch_mode", {"mode": "general"}),
-                ("set_volume", {"level": 70}),
+                {"id": "close_vscode", "action": "close_app", "params": {"app": "VS Code"}},
+                {"id": "close_terminal", "action": "close_app", "params": {"app": "Terminal"}},
+                {"id": "mail", "action": "open_app", "params": {"app": "Mail"}},
+                {"id": "mode", "action": "switch_mode", "params": {"mode": "general"},
+                 "after": ["close_vscode", "close_terminal"]},
+                {"id": "volume", "action": "set_volume", "params": {"level": 70}},
             ]
         },
         "study_session": {
             "description": "Prepare for studying",
             "steps": [
-                ("open_app", {"app": "Notes"}),
-                ("open_app", {"app": "Chrome"}),
-                ("set_volume", {"level": 50}),
-                ("switch_mode", {"mode": "research"}),
+                {"id": "notes", "action": "open_app", "params": {"app": "Notes"}},
+                {"id": "chrome", "action": "open_app", "params": {"app": "Chrome"}},
+                {"id": "volume", "action": "set_volume", "params": {"level": 50}},
+                {"id": "mode", "action": "switch_mode", "params": {"mode": "research"},
+                 "after": ["notes", "chrome"]},
             ]
         }
     }
     
-    def __init__(self, agent):
-        """Initialize with reference to main agent."""
+    # Action -> required params
+    ACTIONS = {
+        "open_app": ("app",),
+        "close_app": ("app",),
+        "switch_mode": ("mode",),
+        "set_volume": ("level",),
+    }
+    
+    def __init__(self, agent, max_workers: int = Config.WORKFLOW_MAX_WORKERS,
+                 workflows_file: Optional[Path] = None):
+        """
+        Initialize with reference to main agent.
+        
+        Args:
+            agent: Main Jarvis agent
+            max_workers: Steps that may run at once
+            workflows_file: User workflow file (defaults to Config.WORKFLOWS_FILE)
+        """
         self.agent = agent
+        self.max_workers = max_workers
+        self.workflows_file = workflows_file or Config.WORKFLOWS_FILE
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()  # run() is called from the scheduler and main threads
+        self._lock = threading.Lock()
+        self._plans: Dict[str, List[WorkflowStep]] = {}
+        self._descriptions: Dict[str, str] = {}
+        self._signatures: Dict[str, str] = {}
+        self._file_state: Optional[Tuple[int, int]] = None
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+        self.last_result: Optional[WorkflowResult] = None
+        
+        self.reload()
     
     def list_workflows(self) -> List[str]:
         """Get list of available workflows."""
-        return list(self.WORKFLOWS.keys())
+        with self._lock:
+            return list(self._plans.keys())
     
     def get_workflow_description(self, workflow_name: str) -> str:
         """Get description of a workflow."""
-        if workflow_name in self.WORKFLOWS:
-            return self.WORKFLOWS[workflow_name]["description"]
-        return "Unknown workflow"
+        with self._lock:
+            return self._descriptions.get(workflow_name, "Unknown workflow")
+    
+    # ============================================================================
+    # Loading
+    # ============================================================================
+    
+    def _read_file_state(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.workflows_file.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _load_definitions(self) -> Dict[str, Dict]:
+        """Built-in workflows overlaid with the user's workflow file."""
+        definitions = dict(self.WORKFLOWS)
+        if self.workflows_file.exists():
+            with open(self.workflows_file, 'r') as f:
+                user_workflows = json.load(f)
+            if not isinstance(user_workflows, dict):
+                raise ValueError("expected an object mapping workflow names to definitions")
+            definitions.update(user_workflows)
+        return definitions
+    
+    def reload(self) -> List[str]:
+        """
+        Re-read workflow definitions, recompiling only those that changed.
+        
+        Returns:
+            Names of workflows that were added, updated or removed
+        """
+        self._file_state = self._read_file_state()
+        try:
+            definitions = self._load_definitions()
+        except (OSError, ValueError) as e:
+            print(f"Could not load workflows from {self.workflows_file}: {e}")
+            return []
+        
+        changed = []
+        with self._lock:
+            for name, definition in definitions.items():
+                signature = json.dumps(definition, sort_keys=True, default=str)
+                if self._signatures.get(name) == signature:
+                    continue
+                try:
+                    if not isinstance(definition, dict) or not definition.get("steps"):
+                        raise ValueError("needs a non-empty 'steps' list")
+                    plan = self.compile_steps(definition["steps"])
+                except (ValueError, TypeError) as e:
+                    # Keep the last good version, if any
+                    print(f"Workflow '{name}' is invalid: {e}")
+                    continue
+                self._plans[name] = plan
+                self._descriptions[name] = str(definition.get("description", name))
+                self._signatures[name] = signature
+                changed.append(name)
+            
+            for name in [n for n in self._plans if n not in definitions]:
+                del self._plans[name]
+                del self._descriptions[name]
+                del self._signatures[name]
+                changed.append(name)
+        return changed
+    
+    def reload_if_changed(self) -> List[str]:
+        """Reload only if the workflow file's mtime or size changed."""
+        if self._read_file_state() == self._file_state:
+            return []
+        changed = self.reload()
+        if changed:
+            print(f"\n🔄 Workflows reloaded: {', '.join(changed)}")
+        return changed
+    
+    def start_watching(self, interval: float = Config.WORKFLOW_RELOAD_INTERVAL):
+        """Poll the workflow file in the background and hot-reload edits."""
+        if self._watcher:
+            return
+        self._stop_watching.clear()
+        
+        def watch():
+            while not self._stop_watching.wait(interval):
+                self.reload_if_changed()
+        
+        self._watcher = threading.Thread(target=watch, name="jarvis-workflow-watch", daemon=True)
+        self._watcher.start()
+    
+    # ============================================================================
+    # Compilation
+    # ============================================================================
+    
+    @classmethod
+    def compile_steps(cls, raw_steps: List[Any]) -> List[WorkflowStep]:
+        """
+        Validate step definitions into WorkflowSteps in dependency order.
+        
+        Accepts {"id", "action", "params", "after", "timeout"} dicts or legacy
+        (action, params) tuples, which have no dependencies.
+        
+        Raises:
+            ValueError: On unknown actions, bad params/timeouts, unknown or cyclic dependencies
+        """
+        steps: Dict[str, WorkflowStep] = {}
+        for i, raw in enumerate(raw_steps):
+            if isinstance(raw, (tuple, list)):
+                action, params = raw
+                raw = {"action": action, "params": params}
+            if not isinstance(raw, dict):
+                raise ValueError(f"Step {i + 1} must be an object")
+            step_id = str(raw.get("id") or f"step{i + 1}")
+            action = raw.get("action")
+            if action not in cls.ACTIONS:
+                raise ValueError(f"Step '{step_id}': unknown action '{action}'")
+            params = raw.get("params", {})
+            if not isinstance(params, dict):
+                raise ValueError(f"Step '{step_id}': params must be an object")
+            missing = [p for p in cls.ACTIONS[action] if p not in params]
+            if missing:
+                raise ValueError(f"Step '{step_id}': missing {', '.join(missing)}")
+            level = params.get("level")
+            if action == "set_volume" and not (isinstance(level, int) and not isinstance(level, bool)
+                                               and 0 <= level <= 100):
+                raise ValueError(f"Step '{step_id}': volume level must be 0-100")
+            if step_id in steps:
+                raise ValueError(f"Duplicate step id '{step_id}'")
+            after = raw.get("after", [])
+            if isinstance(after, str):
+                after = [after]
+            if not isinstance(after, (list, tuple)) or not all(isinstance(dep, str) for dep in after):
+                raise ValueError(f"Step '{step_id}': 'after' must be a step id or a list of step ids")
+            timeout = raw.get("timeout")
+            if timeout is not None and (isinstance(timeout, bool) or not isinstance(timeout, (int, float))
+                                        or not 0 < timeout < float("inf")):
+                raise ValueError(f"Step '{step_id}': timeout must be a positive number of seconds")
+            steps[step_id] = WorkflowStep(step_id, action, dict(params), tuple(after), timeout)
+        
+        for step in steps.values():
+            for dep in step.after:
+                if dep not in steps:
+                    raise ValueError(f"Step '{step.step_id}' depends on unknown step '{dep}'")
+        
+        # Kahn's algorithm; keeps definition order among ready steps
+        remaining = {s.step_id: len(s.after) for s in steps.values()}
+        ordered: List[WorkflowStep] = []
+        ready = [sid for sid, n in remaining.items() if n == 0]
+        while ready:
+            sid = ready.pop(0)
+            ordered.append(steps[sid])
+            for other in steps.values():
+                if sid in other.after:
+                    remaining[other.step_id] -= 1
+                    if remaining[other.step_id] == 0:
+                        ready.append(other.step_id)
+        if len(ordered) != len(steps):
+            cyclic = sorted(sid for sid, n in remaining.items() if n > 0)
+            raise ValueError(f"Dependency cycle between steps: {', '.join(cyclic)}")
+        return ordered
+    
+    
+    # ============================================================================
+    # Execution
+    # ============================================================================
     
     def execute(self, workflow_name: str) -> Tuple[bool, str]:
         """
@@ -72,41 +327,121 @@ class WorkflowExecutor:
         Returns:
             (success: bool, message: str)
         """
-        if workflow_name not in self.WORKFLOWS:
+        if workflow_name not in self.list_workflows():
             available = ", ".join(self.list_workflows())
             return (False, f"Unknown workflow, sir. Available: {available}")
         
-        workflow = self.WORKFLOWS[workflow_name]
-        steps = workflow["steps"]
-        results = []
-        
-        for action, params in steps:
-            try:
-                if action == "open_app":
-                    success, msg = self.agent.mac_control.open_app(params["app"])
-                    if success:
-                        results.append(f"opened {params['app']}")
-                
-                elif action == "close_app":
-                    success, msg = self.agent.mac_control.close_app(params["app"])
-                    if success:
-                        results.append(f"closed {params['app']}")
-                
-                elif action == "switch_mode":
-                    self.agent.switch_model(params["mode"])
-                    results.append(f"switched to {params['mode']} mode")
-                
-                elif action == "set_volume":
-                    success, msg = self.agent.mac_control.set_volume(params["level"])
-                    if success:
-                        results.append(f"set volume to {params['level']}%")
-                
-            except Exception as e:
-                print(f"Workflow step failed: {e}")
-                continue
-        
-        if results:
-            summary = ", ".join(results)
+        result = self.run(workflow_name)
+        
+        summaries = [r.summary for r in result.steps if r.success]
+        if summaries:
+            summary = ", ".join(summaries)
             return (True, f"Workflow complete, sir. I've {summary}.")
         else:
             return (False, "Workflow execution failed, sir.")
+    
+    def run(self, workflow_name: str) -> WorkflowResult:
+        """
+        Run a workflow's step DAG and return per-step results and timings.
+        
+        Independent steps run concurrently; a step starts once every step in
+        its "after" list has finished (successfully or not) or timed out.
+        """
+        with self._lock:
+            plan = self._plans[workflow_name]
+        result = WorkflowResult(workflow_name)
+        results = {step.step_id: StepResult(step) for step in plan}
+        result.steps = [results[step.step_id] for step in plan]
+        
+        pool = self._get_pool()
+        
+        start = time.perf_counter()
+        waiting = {step.step_id: set(step.after) for step in plan}
+        running: Dict[Future, Tuple[WorkflowStep, float]] = {}
+        
+        def submit_ready():
+            for step in plan:
+                if step.step_id in waiting and not waiting[step.step_id]:
+                    del waiting[step.step_id]
+                    results[step.step_id].started = time.perf_counter() - start
+                    running[pool.submit(self._run_step, step)] = (step, time.perf_counter() + step.timeout)
+        
+        def finish(step: WorkflowStep):
+            for deps in waiting.values():
+                deps.discard(step.step_id)
+        
+        submit_ready()
+        while running:
+            next_deadline = min(deadline for _, deadline in running.values())
+            done, _ = wait(list(running), timeout=max(0.0, next_deadline - time.perf_counter()),
+                           return_when=FIRST_COMPLETED)
+            now = time.perf_counter()
+            
+            for future in list(running):
+                step, deadline = running[future]
+                step_result = results[step.step_id]
+                if future in done:
+                    success, summary, error = future.result()
+                    step_result.success, step_result.summary, step_result.error = success, summary, error
+                elif now >= deadline:
+                    # Left running in the background; dependents proceed without it
+                    step_result.timed_out = True
+                    step_result.error = f"timed out after {step.timeout:.0f}s"
+                    print(f"Workflow step '{step.step_id}' timed out")
+                else:
+                    continue
+                step_result.duration = now - start - step_result.started
+                del running[future]
+                finish(step)
+            submit_ready()
+        
+        result.duration = time.perf_counter() - start
+        self.last_result = result
+        return result
+    
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """The step pool, created on first use."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="jarvis-workflow")
+            return self._pool
+    
+    def _run_step(self, step: WorkflowStep) -> Tuple[bool, str, Optional[str]]:
+        """
+        Perform one step on a pool thread.
+        
+        Returns:
+            (success, summary, error)
+        """
+        params = step.params
+        try:
+            if step.action == "open_app":
+                success, msg = self.agent.mac_control.open_app(params["app"])
+                return (success, f"opened {params['app']}", None if success else msg)
+            
+            elif step.action == "close_app":
+                success, msg = self.agent.mac_control.close_app(params["app"])
+                return (success, f"closed {params['app']}", None if success else msg)
+            
+            elif step.action == "switch_mode":
+                self.agent.switch_model(params["mode"])
+                return (True, f"switched to {params['mode']} mode", None)
+            
+            elif step.action == "set_volume":
+                success, msg = self.agent.mac_control.set_volume(params["level"])
+                return (success, f"set volume to {params['level']}%", None if success else msg)
+        
+        except Exception as e:
+            print(f"Workflow step failed: {e}")
+            return (False, "", str(e))
+        
+        return (False, "", f"unknown action '{step.action}'")
+    
+    def shutdown(self):
+        """Stop watching the workflow file and release the step thread pool."""
+        self._stop_watching.set()
+        self._watcher = None
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool:
+            pool.shutdown(wait=False)
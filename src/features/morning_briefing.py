@@ -1,68 +1,211 @@
 """
 Morning Briefing Protocol
 Generates a daily summary of weather, news, and system status.
+
+Sources are gathered in parallel under one deadline and each keeps its
+last good value for a TTL. Anything not ready at the deadline is shown
+as still loading; it keeps running and is cached for the next briefing.
+
+A scheduled job can prepare the briefing shortly before the user usually
+starts their day (learned from a log of each day's first interaction), so
+"start my day" is answered from the prepared copy.
 """
 
 import requests
 import psutil
 import datetime
+import json
+import threading
+import time
 import xml.etree.ElementTree as ET
-from typing import Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from statistics import median
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.config.config import Config
+from src.integrations.http_cache import get_http_cache
+
+def typical_start_time(command_log: Iterable[Dict], min_days: int = Config.BRIEFING_MIN_DAYS,
+                       day_starts_at: int = 4) -> Optional[datetime.time]:
+    """
+    Median time of the first command of each day.
+    
+    Args:
+        command_log: Entries with an ISO "timestamp", as kept by Jarvis
+        min_days: Distinct days needed before trusting the estimate
+        day_starts_at: Hour before which activity counts as the previous night
+        
+    Returns:
+        Typical start time, or None without enough history
+    """
+    shift = datetime.timedelta(hours=day_starts_at)
+    first_by_day: Dict[datetime.date, datetime.datetime] = {}
+    for entry in command_log:
+        try:
+            stamp = datetime.datetime.fromisoformat(entry["timestamp"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        day = (stamp - shift).date()
+        if day not in first_by_day or stamp < first_by_day[day]:
+            first_by_day[day] = stamp
+    if len(first_by_day) < min_days:
+        return None
+    minutes = median(((s - shift).hour * 60 + (s - shift).minute) for s in first_by_day.values())
+    minutes = (int(minutes) + day_starts_at * 60) % (24 * 60)
+    return datetime.time(minutes // 60, minutes % 60)
+
+
+class FirstInteractionLog:
+    """
+    First interaction of each day, kept for BRIEFING_HISTORY_DAYS.
+    
+    Unlike the command log (last 100 commands, often only a few days on a
+    busy week) this keeps one entry per day, so the learned start time
+    reflects weeks of history. The file is only written on a new day.
+    """
+    
+    def __init__(self, path: Path = Config.FIRST_INTERACTIONS_FILE,
+                 history_days: int = Config.BRIEFING_HISTORY_DAYS, day_starts_at: int = 4):
+        """
+        Args:
+            path: JSON file, day -> ISO timestamp
+            history_days: Days kept
+            day_starts_at: Hour before which activity counts as the previous night
+        """
+        self.path = Path(path)
+        self.history_days = history_days
+        self.day_starts_at = day_starts_at
+        self._lock = threading.Lock()
+        try:
+            with open(self.path) as f:
+                self._days: Dict[str, str] = json.load(f)
+        except (OSError, ValueError):
+            self._days = {}
+        
+    def _day(self, stamp: datetime.datetime) -> str:
+        return (stamp - datetime.timedelta(hours=self.day_starts_at)).date().isoformat()
+        
+    def _save(self):
+        cutoff = (datetime.date.today() - datetime.timedelta(days=self.history_days)).isoformat()
+        self._days = {day: stamp for day, stamp in sorted(self._days.items()) if day >= cutoff}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self._days, f, indent=2)
+        tmp.replace(self.path)
+        
+    def record(self, when: Optional[datetime.datetime] = None) -> bool:
+        """Note an interaction; True if it was the first of its day."""
+        when = when or datetime.datetime.now()
+        day = self._day(when)
+        with self._lock:
+            if day in self._days:
+                return False
+            self._days[day] = when.isoformat()
+            self._save()
+            return True
+        
+    def seed(self, command_log: Iterable[Dict]):
+        """Add days from an existing command log that aren't recorded yet."""
+        with self._lock:
+            changed = False
+            for entry in command_log:
+                try:
+                    stamp = datetime.datetime.fromisoformat(entry["timestamp"])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                day = self._day(stamp)
+                if day not in self._days or stamp.isoformat() < self._days[day]:
+                    self._days[day] = stamp.isoformat()
+                    changed = True
+            if changed:
+                self._save()
+        
+    def typical_start_time(self, min_days: int = Config.BRIEFING_MIN_DAYS) -> Optional[datetime.time]:
+        with self._lock:
+            entries = [{"timestamp": stamp} for stamp in self._days.values()]
+        return typical_start_time(entries, min_days, self.day_starts_at)
+
 
 class MorningBriefing:
     """Handles generation of the morning briefing."""
     
-    def __init__(self):
+    def __init__(self, deadline: float = Config.BRIEFING_DEADLINE, ttls: Optional[Dict[str, float]] = None,
+                 calendar=None):
+        """
+        Args:
+            deadline: Seconds generate_briefing waits for sources
+            ttls: Source name -> seconds its value is reused (default Config.BRIEFING_TTLS)
+            calendar: CalendarController whose events are included, if given
+        """
         self.location = {"lat": 28.6139, "lon": 77.2090} # Default to New Delhi (can be configured)
+        self.session = requests.Session()
+        self.http_cache = get_http_cache()
+        self.deadline = deadline
+        self.ttls = Config.BRIEFING_TTLS if ttls is None else ttls
+        self.sources: Dict[str, Callable[[], object]] = {
+            "weather": self._fetch_weather,
+            "system": self.get_system_status,
+            "news": self._fetch_news,
+        }
+        if calendar is not None:
+            self.sources["calendar"] = calendar.get_todays_events
+        self.prepared: Optional[Dict] = None  # Set by prepare()
+        self._cache: Dict[str, Tuple[float, object]] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=len(self.sources), thread_name_prefix="jarvis-briefing")
+        # Start psutil's CPU sampling window so later readings don't block
+        psutil.cpu_percent(interval=None)
+        
+    def _fetch_weather(self) -> str:
+        url = f"https://api.open-meteo.com/v1/forecast?latitude={self.location['lat']}&longitude={self.location['lon']}&current=temperature_2m,weather_code"
+        response = self.http_cache.get(self.session, url, timeout=5)
+        data = response.json()
+        
+        temp = data['current']['temperature_2m']
+        code = data['current']['weather_code']
+        
+        # WMO Weather interpretation codes (simplified)
+        conditions = "clear"
+        if code > 0: conditions = "cloudy"
+        if code > 40: conditions = "foggy"
+        if code > 50: conditions = "rainy"
+        if code > 70: conditions = "snowy"
+        if code > 90: conditions = "stormy"
+        
+        return f"{temp}°C and {conditions}"
         
     def get_weather(self) -> str:
         """Get current weather from Open-Meteo."""
         try:
-            url = f"https://api.open-meteo.com/v1/forecast?latitude={self.location['lat']}&longitude={self.location['lon']}&current=temperature_2m,weather_code"
-            response = requests.get(url, timeout=5)
-            data = response.json()
-            
-            temp = data['current']['temperature_2m']
-            code = data['current']['weather_code']
-            
-            # WMO Weather interpretation codes (simplified)
-            conditions = "clear"
-            if code > 0: conditions = "cloudy" 
-            if code > 40: conditions = "foggy"
-            if code > 50: conditions = "rainy"
-            if code > 70: conditions = "snowy"
-            if code > 90: conditions = "stormy"
-            
-            return f"{temp}°C and {conditions}"
+            return self._fetch_weather()
         except Exception as e:
             return f"unavailable ({e})"
-
+            
+    def _fetch_news(self, limit: int = 3) -> List[str]:
+        # Tech news provided by default
+        url = "https://news.google.com/rss/search?q=technology&hl=en-US&gl=US&ceid=US:en"
+        response = self.http_cache.get(self.session, url, timeout=5)
+        
+        root = ET.fromstring(response.content)
+        headlines = []
+        for item in root.findall('.//item')[:limit]:
+            title = item.find('title').text
+            # Remove source name if present (e.g. "Title - Source")
+            if " - " in title:
+                title = title.rsplit(" - ", 1)[0]
+            headlines.append(title)
+        return headlines
+        
     def get_news(self, limit: int = 3) -> List[str]:
         """Get top headlines from Google News RSS."""
-        headlines = []
         try:
-            # Tech news provided by default
-            url = "https://news.google.com/rss/search?q=technology&hl=en-US&gl=US&ceid=US:en"
-            response = requests.get(url, timeout=5)
-            
-            root = ET.fromstring(response.content)
-            count = 0
-            
-            for item in root.findall('.//item'):
-                if count >= limit:
-                    break
-                title = item.find('title').text
-                # Remove source name if present (e.g. "Title - Source")
-                if " - " in title:
-                    title = title.rsplit(" - ", 1)[0]
-                headlines.append(title)
-                count += 1
-                
+            return self._fetch_news(limit)
         except Exception as e:
-            headlines.append(f"Could not fetch news: {e}")
+            return [f"Could not fetch news: {e}"]
             
-        return headlines
-
     def get_system_status(self) -> str:
         """Get battery and CPU status."""
         status = []
@@ -76,36 +219,135 @@ class MorningBriefing:
         except:
             pass
             
-        # CPU
-        cpu_usage = psutil.cpu_percent(interval=0.1)
+        # CPU - usage since the previous reading, so this never blocks
+        cpu_usage = psutil.cpu_percent(interval=None)
         status.append(f"Systems running at {cpu_usage}% capacity")
         
         return ". ".join(status)
-
-    def generate_briefing(self) -> str:
-        """Compile the full briefing."""
-        date_str = datetime.datetime.now().strftime("%A, %B %d")
-        time_str = datetime.datetime.now().strftime("%I:%M %p")
         
+    def _run_source(self, name: str):
+        value = self.sources[name]()
+        with self._lock:
+            self._cache[name] = (time.monotonic(), value)
+        return value
+        
+    def _cached(self, name: str) -> Tuple[bool, object]:
+        entry = self._cache.get(name)
+        if entry and time.monotonic() - entry[0] < self.ttls.get(name, 0):
+            return True, entry[1]
+        return False, None
+        
+    def gather(self, deadline: Optional[float] = None) -> Dict[str, object]:
+        """
+        Collect every source in parallel.
+        
+        Args:
+            deadline: Seconds to wait (default self.deadline)
+            
+        Returns:
+            Source name -> value. Sources that missed the deadline are absent;
+            they finish in the background and are cached for next time.
+        """
+        deadline = self.deadline if deadline is None else deadline
+        results: Dict[str, object] = {}
+        pending: Dict[str, Future] = {}
+        with self._lock:
+            for name in self.sources:
+                fresh, value = self._cached(name)
+                if fresh:
+                    results[name] = value
+                    continue
+                future = self._inflight.get(name)
+                if future is None or future.done():
+                    future = self._pool.submit(self._run_source, name)
+                    self._inflight[name] = future
+                pending[name] = future
+                
+        if pending:
+            wait(pending.values(), timeout=deadline)
+        for name, future in pending.items():
+            if not future.done():
+                continue
+            error = future.exception()
+            if error is None:
+                results[name] = future.result()
+            elif name == "news":
+                results[name] = [f"Could not fetch news: {error}"]
+            else:
+                results[name] = f"unavailable ({error})"
+        return results
+        
+    def render_body(self, data: Dict[str, object]) -> str:
+        """Everything after the greeting, with placeholders for missing sources."""
         parts = []
-        parts.append(f"Good morning, sir. It is {time_str} on {date_str}.")
         
         # Weather
-        weather = self.get_weather()
-        parts.append(f"Current conditions are {weather}.")
-        
+        if "weather" in data:
+            parts.append(f"Current conditions are {data['weather']}.")
+        else:
+            parts.append("Weather data is still on its way.")
+            
+        # Calendar
+        if data.get("calendar"):
+            parts.append(str(data["calendar"]))
+            
         # System
-        sys_status = self.get_system_status()
-        parts.append(f"System status: {sys_status}.")
-        
+        if "system" in data:
+            parts.append(f"System status: {data['system']}.")
+            
         # News
-        news = self.get_news()
+        news = data.get("news")
         if news:
             parts.append("Here are today's top tech headlines:")
             for i, headline in enumerate(news, 1):
                 parts.append(f"{headline}.")
-                
+        elif "news" not in data:
+            parts.append("Headlines are still loading; ask me again shortly for the news.")
+            
         # Closing
         parts.append("I am ready to assist you.")
         
         return "\n".join(parts)
+        
+    @staticmethod
+    def greeting(now: Optional[datetime.datetime] = None) -> str:
+        now = now or datetime.datetime.now()
+        date_str = now.strftime("%A, %B %d")
+        time_str = now.strftime("%I:%M %p")
+        return f"Good morning, sir. It is {time_str} on {date_str}."
+        
+    def render(self, data: Dict[str, object], now: Optional[datetime.datetime] = None) -> str:
+        """Briefing text from gathered data."""
+        return f"{self.greeting(now)}\n{self.render_body(data)}"
+        
+    def prepare(self, deadline: float = Config.BRIEFING_PREPARE_DEADLINE, voice_output=None) -> str:
+        """
+        Gather and render today's briefing ahead of time.
+        
+        Args:
+            deadline: Seconds to wait for sources; there is no user waiting
+            voice_output: VoiceOutput to pre-generate the spoken body with
+            
+        Returns:
+            The prepared body text
+        """
+        data = self.gather(deadline)
+        body = self.render_body(data)
+        self.prepared = {"date": datetime.date.today(), "at": time.time(), "body": body}
+        if voice_output is not None:
+            voice_output.prepare_speech(body)
+        return body
+        
+    def _prepared_body(self) -> Optional[str]:
+        prepared = self.prepared
+        if (prepared and prepared["date"] == datetime.date.today()
+                and time.time() - prepared["at"] < Config.BRIEFING_PREPARED_MAX_AGE):
+            return prepared["body"]
+        return None
+        
+    def generate_briefing(self) -> str:
+        """Compile the full briefing, from the prepared copy when there is one."""
+        body = self._prepared_body()
+        if body is None:
+            return self.render(self.gather())
+        return f"{self.greeting()}\n{body}"
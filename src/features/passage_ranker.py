@@ -0,0 +1,177 @@
+"""
+Passage Ranker
+Picks the parts of research sources worth sending to the LLM.
+
+Sources are split into passages of a few sentences, scored against the
+topic with BM25, near-duplicates across sources are dropped, and the best
+passages fill a token budget.
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Set
+
+from src.config.config import Config
+
+WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+STOPWORDS = frozenset("""
+a an and are as at be been but by can could did do does for from had has have how i if in into is it its
+of on or our so than that the their them then there these they this to was we were what when where which
+while who why will with would you your about also more most not no some such only other over very just
+""".split())
+
+CHARS_PER_TOKEN = 4  # Rough English average; good enough for budgeting
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase content words."""
+    return [word for word in WORD.findall(text.lower()) if word not in STOPWORDS]
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+@dataclass
+class Passage:
+    """A chunk of one source."""
+    url: str
+    position: int  # Order within its source
+    text: str
+    score: float = 0.0
+
+
+def split_passages(url: str, text: str, target_words: int = Config.RESEARCH_PASSAGE_WORDS) -> List[Passage]:
+    """
+    Split a document into passages of roughly target_words.
+
+    Extracted text has one block per line; short blocks are merged and long
+    ones are cut at sentence boundaries.
+    """
+    passages: List[Passage] = []
+    current: List[str] = []
+    words = 0
+
+    def emit():
+        nonlocal current, words
+        if current:
+            passages.append(Passage(url, len(passages), " ".join(current)))
+        current, words = [], 0
+
+    for block in text.splitlines():
+        for sentence in SENTENCE_END.split(block.strip()):
+            if not sentence:
+                continue
+            length = len(sentence.split())
+            if words and words + length > target_words:
+                emit()
+            current.append(sentence)
+            words += length
+        # Paragraph ends are natural cut points once a passage is half full
+        if words >= target_words // 2:
+            emit()
+    emit()
+    return passages
+
+
+def shingles(text: str, size: int = 3) -> Set[int]:
+    words = tokenize(text)
+    return {hash(tuple(words[i:i + size])) for i in range(max(1, len(words) - size + 1))}
+
+
+class PassageRanker:
+    """BM25 scoring with near-duplicate removal and a token budget."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75,
+                 duplicate_threshold: float = Config.RESEARCH_DUPLICATE_THRESHOLD):
+        """
+        Args:
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalisation
+            duplicate_threshold: Shingle Jaccard similarity above which a passage
+                                 counts as a repeat of one already selected
+        """
+        self.k1 = k1
+        self.b = b
+        self.duplicate_threshold = duplicate_threshold
+
+    def score(self, query: str, passages: List[Passage]) -> List[Passage]:
+        """Set each passage's BM25 score for the query; returns them best first."""
+        terms = set(tokenize(query))
+        docs = [Counter(tokenize(p.text)) for p in passages]
+        if not docs or not terms:
+            return list(passages)
+        avg_len = sum(sum(doc.values()) for doc in docs) / len(docs) or 1
+        idf = {}
+        for term in terms:
+            containing = sum(1 for doc in docs if term in doc)
+            idf[term] = math.log(1 + (len(docs) - containing + 0.5) / (containing + 0.5))
+
+        for passage, doc in zip(passages, docs):
+            length = sum(doc.values())
+            passage.score = sum(
+                idf[term] * doc[term] * (self.k1 + 1)
+                / (doc[term] + self.k1 * (1 - self.b + self.b * length / avg_len))
+                for term in terms if term in doc
+            )
+        return sorted(passages, key=lambda p: p.score, reverse=True)
+
+    def select(self, query: str, documents: Dict[str, str],
+               token_budget: int = Config.RESEARCH_CONTEXT_TOKENS) -> List[Passage]:
+        """
+        Best passages across all documents that fit the budget.
+
+        Args:
+            query: Research topic
+            documents: url -> extracted text
+            token_budget: Estimated tokens the selection may use
+
+        Returns:
+            Selected passages grouped by source, in reading order
+        """
+        passages = [p for url, text in documents.items() for p in split_passages(url, text)]
+        ranked = self.score(query, passages)
+        if ranked and ranked[0].score > 0:
+            ranked = [p for p in ranked if p.score > 0]
+        else:
+            # Nothing matches the topic words; fall back to the top of each source
+            ranked = sorted(passages, key=lambda p: p.position)
+
+        selected: List[Passage] = []
+        seen: List[Set[int]] = []
+        used = 0
+        for passage in ranked:
+            cost = estimate_tokens(passage.text)
+            if used + cost > token_budget:
+                continue
+            fingerprint = shingles(passage.text)
+            if any(self._similarity(fingerprint, other) > self.duplicate_threshold for other in seen):
+                continue
+            selected.append(passage)
+            seen.append(fingerprint)
+            used += cost
+
+        order = {url: i for i, url in enumerate(documents)}
+        return sorted(selected, key=lambda p: (order[p.url], p.position))
+
+    @staticmethod
+    def _similarity(a: Set[int], b: Set[int]) -> float:
+        if not a or not b:
+            return 0.0
+        return len(a & b) / len(a | b)
+
+
+def build_context(topic: str, passages: Iterable[Passage]) -> str:
+    """Prompt context with passages grouped under their source URL."""
+    context = f"Research Topic: {topic}\n\nSources Data:\n"
+    current_url = None
+    for passage in passages:
+        if passage.url != current_url:
+            context += f"\n--- Source: {passage.url} ---\n"
+            current_url = passage.url
+        context += passage.text + "\n\n"
+    return context
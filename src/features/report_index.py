@@ -0,0 +1,167 @@
+"""
+Research Report Index
+Remembers what has already been researched so a repeat question can be
+answered from the saved report instead of redoing search, fetch and
+synthesis.
+
+- Topics are normalised ("The Best EV Batteries?" == "best ev battery")
+  and matched fuzzily on their word sets
+- Each entry keeps the report path, source URLs and per-source summaries,
+  so a stale report can be refreshed by reading only new sources
+- Reports saved before the index existed are picked up from their headers
+"""
+
+import json
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from src.config.config import Config
+from src.features.passage_ranker import STOPWORDS
+from src.features.synthesis import INTERRUPTED_MARKER, is_failed_output
+
+URL = re.compile(r"https?://[^\s)>\]\"']+")
+HEADER = re.compile(r"^# Research Report: (.+)$", re.M)
+HEADER_BLOCK = re.compile(r"\A# Research Report: .*\n(Date: .*\n)?\n?")
+
+
+def topic_terms(topic: str) -> List[str]:
+    """Content words of a topic, lightly stemmed, sorted and unique."""
+    words = set()
+    for word in re.findall(r"[a-z0-9]+", topic.lower()):
+        if word in STOPWORDS or word in ("research", "tell", "me", "find", "out", "latest"):
+            continue
+        if len(word) > 3 and word.endswith("ies"):
+            word = word[:-3] + "y"
+        elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.add(word)
+    return sorted(words)
+
+
+def normalize_topic(topic: str) -> str:
+    """Index key for a topic."""
+    return " ".join(topic_terms(topic)) or topic.strip().lower()
+
+
+class ReportIndex:
+    """JSON index over saved research reports."""
+
+    def __init__(self, reports_dir: Path = Config.DATA_DIR / "research_reports",
+                 index_path: Optional[Path] = None,
+                 max_age: float = Config.RESEARCH_REPORT_MAX_AGE,
+                 match_threshold: float = Config.RESEARCH_TOPIC_MATCH_THRESHOLD):
+        """
+        Args:
+            reports_dir: Where ResearchAgent saves reports
+            index_path: Index file. None = index.json inside reports_dir.
+            max_age: Seconds a report stays fresh enough to answer from
+            match_threshold: Word-set overlap needed for two topics to match
+        """
+        self.reports_dir = Path(reports_dir)
+        self.index_path = Path(index_path) if index_path else self.reports_dir / "index.json"
+        self.max_age = max_age
+        self.match_threshold = match_threshold
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = self._load()
+        self.sync()
+
+    def _load(self) -> Dict[str, dict]:
+        try:
+            with open(self.index_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self._entries, f, indent=2)
+        tmp.replace(self.index_path)
+
+    def sync(self):
+        """Index reports on disk that aren't indexed yet; forget ones that were deleted."""
+        with self._lock:
+            changed = False
+            for key in [k for k, e in self._entries.items() if not Path(e["path"]).exists()]:
+                del self._entries[key]
+                changed = True
+            indexed = {e["path"] for e in self._entries.values()}
+            # Newest first, so the latest report on a topic is the one indexed
+            for path in sorted(self.reports_dir.glob("Research_*.md"), key=lambda p: p.stat().st_mtime, reverse=True):
+                if str(path) in indexed:
+                    continue
+                content = path.read_text(errors="replace")
+                if INTERRUPTED_MARKER in content:
+                    continue  # Cancelled mid-generation
+                if is_failed_output(HEADER_BLOCK.sub("", content)):
+                    continue  # The LLM call failed
+                header = HEADER.search(content)
+                topic = header.group(1).strip() if header else path.stem[len("Research_"):].rsplit("_", 1)[0].replace("_", " ")
+                key = normalize_topic(topic)
+                if key in self._entries:
+                    continue  # An older report on a topic already indexed
+                mtime = path.stat().st_mtime
+                self._entries[key] = {
+                    "topic": topic,
+                    "path": str(path),
+                    "sources": list(dict.fromkeys(url.rstrip(".,;:") for url in URL.findall(content))),
+                    "summaries": {},
+                    "created": mtime,
+                    "updated": mtime,
+                }
+                changed = True
+            if changed:
+                self._save()
+
+    def lookup(self, topic: str) -> Optional[dict]:
+        """Closest indexed report for a topic, or None."""
+        key = normalize_topic(topic)
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+            terms = set(key.split())
+            best, best_score = None, 0.0
+            for other_key, entry in self._entries.items():
+                other = set(other_key.split())
+                score = len(terms & other) / len(terms | other) if terms | other else 0.0
+                if score > best_score:
+                    best, best_score = entry, score
+            return best if best_score >= self.match_threshold else None
+
+    def is_fresh(self, entry: dict) -> bool:
+        return time.time() - entry["updated"] < self.max_age
+
+    def record(self, topic: str, path: Path, sources: Iterable[str],
+               summaries: Optional[Dict[str, str]] = None) -> dict:
+        """Add or replace the entry for a topic after a report is written."""
+        key = normalize_topic(topic)
+        now = time.time()
+        with self._lock:
+            previous = self._entries.get(key, {})
+            entry = {
+                "topic": topic,
+                "path": str(path),
+                "sources": list(dict.fromkeys(sources)),
+                "summaries": dict(summaries or {}),
+                "created": previous.get("created", now),
+                "updated": now,
+            }
+            self._entries[key] = entry
+            self._save()
+            return entry
+
+    def touch(self, entry: dict):
+        """Mark a report as checked just now (e.g. a refresh found nothing new)."""
+        with self._lock:
+            entry["updated"] = time.time()
+            self._save()
+
+    @staticmethod
+    def read(entry: dict) -> str:
+        """Report body without its title/date header."""
+        content = Path(entry["path"]).read_text(errors="replace")
+        return HEADER_BLOCK.sub("", content)
@@ -1,6 +1,9 @@
 
 from src.integrations.web_scraper import WebScraper
 from src.core.llm import LLMClient
+from src.features.passage_ranker import PassageRanker, build_context, estimate_tokens
+from src.features.report_index import ReportIndex
+from src.features.synthesis import MapReduceSynthesizer, is_failed_output, stream_report
 from src.config.config import Config
 import datetime
 import os
@@ -14,26 +17,103 @@ class ResearchAgent:
     def __init__(self, llm_client: LLMClient):
         self.scraper = WebScraper()
         self.llm = llm_client
+        self.ranker = PassageRanker()
+        self.synthesizer = MapReduceSynthesizer(llm_client, self.ranker)
         self.reports_dir = Config.DATA_DIR / "research_reports"
         self.reports_dir.mkdir(exist_ok=True)
+        self.index = ReportIndex(self.reports_dir)
         
-    def conduct_research(self, topic: str) -> str:
-        """Execute full research workflow."""
+    def conduct_research(self, topic: str, mode: str = Config.RESEARCH_SYNTHESIS, refresh: bool = False) -> str:
+        """
+        Execute full research workflow.
+        
+        Args:
+            topic: What to research
+            mode: "map_reduce" (summarize each source as it arrives, then merge)
+                  or "single" (one prompt over the best passages of all sources)
+            refresh: Look for new sources even if a recent report exists
+        """
         start_time = datetime.datetime.now()
         
-        # 1. Gather Data
-        raw_data = self.scraper.research_topic(topic)
+        # 0. Answer from a recent report on the same topic if there is one
+        entry = self.index.lookup(topic)
+        if entry and not refresh and self.index.is_fresh(entry):
+            print(f"📚 Found a recent report on: {entry['topic']}")
+            return self._cached_response(entry)
+        # Older map-reduce reports keep their source summaries, so only new sources need reading
+        previous = entry if entry and entry.get("summaries") and mode == "map_reduce" else None
+        if previous:
+            topic = previous["topic"]
         
-        if not raw_data:
-            return "I'm afraid I couldn't find any sources on that topic, sir."
+        if mode == "map_reduce":
+            # 1+2. Sources stream in and are summarized in parallel as they arrive
+            raw_data = {}
             
-        # 2. Synthesize with LLM
-        print("🧠 Synthesizing information...")
+            def sources():
+                exclude = previous["sources"] if previous else ()
+                for url, text in self.scraper.iter_sources(topic, Config.RESEARCH_NUM_SOURCES, exclude=exclude):
+                    raw_data[url] = text
+                    yield url, text
+            
+            summaries = self.synthesizer.summarize_all(topic, sources())
+            if previous and not summaries:
+                print("📚 No new sources since the last report")
+                self.index.touch(previous)
+                return self._cached_response(previous)
+            if not raw_data:
+                return "I'm afraid I couldn't find any sources on that topic, sir."
+            if not summaries:
+                return "I'm afraid none of the sources I found were relevant to that topic, sir."
+            if previous:
+                print(f"🔄 Adding {len(summaries)} new sources to the earlier report")
+                summaries = {**previous["summaries"], **summaries}
+                raw_data = {**dict.fromkeys(previous["sources"], ""), **raw_data}
+            
+            print(f"🧠 Merging {len(summaries)} source summaries...")
+            messages = self.synthesizer.reduce_messages(topic, summaries)
+        else:
+            # 1. Gather Data - sources stream in as they finish downloading
+            raw_data = dict(self.scraper.iter_sources(topic, Config.RESEARCH_NUM_SOURCES))
+            if not raw_data:
+                return "I'm afraid I couldn't find any sources on that topic, sir."
+            
+            messages = self._single_pass_messages(topic, raw_data)
+            summaries = {}
+            
+        # 3. Stream the report to the console and its file as it is generated
+        filename = f"Research_{topic.replace(' ', '_')}_{start_time.strftime('%Y%m%d')}.md"
+        filepath = self.reports_dir / filename
+        header = f"# Research Report: {topic}\nDate: {start_time.strftime('%Y-%m-%d %H:%M')}\n\n"
         
-        # Prepare context for LLM
-        context = f"Research Topic: {topic}\n\nSources Data:\n"
-        for url, text in raw_data.items():
-            context += f"--- Source: {url} ---\n{text[:2000]}\n\n"
+        try:
+            response_gen = self.llm.chat(messages, stream=True, use_jarvis_personality=False)
+            report_content, completed = stream_report(response_gen, filepath, header)
+        except Exception as e:
+            return f"Error during synthesis: {e}"
+        
+        if not completed:
+            # Partial reports are kept on disk but never answer later questions
+            return f"Research stopped, sir. The partial report is saved to {filepath}"
+        if is_failed_output(report_content):
+            # Never indexed or left on disk, so a later question can't be answered from it
+            filepath.unlink(missing_ok=True)
+            return f"Error during synthesis: {report_content.strip() or 'the model returned an empty report'}"
+        self.index.record(topic, filepath, raw_data, summaries)
+            
+        return f"Research complete, sir. I've analyzed {len(raw_data)} sources. \n\n**Summary:**\n{report_content[:500]}...\n\n(Full report saved to {filepath})"
+
+    def _cached_response(self, entry: dict) -> str:
+        report_content = self.index.read(entry)
+        checked = datetime.datetime.fromtimestamp(entry["updated"]).strftime('%b %d at %H:%M')
+        return f"I researched this on {checked}, sir, from {len(entry['sources'])} sources. \n\n**Summary:**\n{report_content[:500]}...\n\n(Full report at {entry['path']})"
+
+    def _single_pass_messages(self, topic: str, raw_data: dict) -> list:
+        """One synthesis prompt over the best passages of every source."""
+        # Keep only the passages most relevant to the topic
+        passages = self.ranker.select(topic, raw_data)
+        context = build_context(topic, passages)
+        print(f"📑 Selected {len(passages)} passages (~{estimate_tokens(context)} tokens)")
+        print("🧠 Synthesizing information...")
             
         prompt = f"""
         You are JARVIS, a sophisticated research assistant.
@@ -47,29 +127,7 @@ class ResearchAgent:
         Keep it concise but technical.
         """
         
-        # We use the research model (deepseek-r1) if available, otherwise current model
-        # For simplicity in this implementation, we use the current attached LLM text generation
-        # direct generation call
-        
-        try:
-             # Using the existing LLM client generator
-             response_gen = self.llm.chat([
-                 {"role": "system", "content": prompt},
-                 {"role": "user", "content": context}
-             ], stream=False, use_jarvis_personality=False)
-             
-             report_content = "".join(list(response_gen))
-             
-        except Exception as e:
-            return f"Error during synthesis: {e}"
-            
-        # 3. Save Report
-        filename = f"Research_{topic.replace(' ', '_')}_{start_time.strftime('%Y%m%d')}.md"
-        filepath = self.reports_dir / filename
-        
-        with open(filepath, 'w') as f:
-            f.write(f"# Research Report: {topic}\n")
-            f.write(f"Date: {start_time.strftime('%Y-%m-%d %H:%M')}\n\n")
-            f.write(report_content)
-            
-        return f"Research complete, sir. I've analyzed {len(raw_data)} sources. \n\n**Summary:**\n{report_content[:500]}...\n\n(Full report saved to {filepath})"
+        return [
+            {"role": "system", "content": prompt},
+            {"role": "user", "content": context}
+        ]
@@ -0,0 +1,271 @@
+"""
+Research Synthesis
+Map-reduce summarisation: each source is summarised on its own as soon as
+it arrives (several LLM calls in flight), then one reduce call merges the
+summaries into the report. Keeps every prompt small, so more sources fit
+and the first findings show up long before the final report.
+
+The final report streams to the console and its file as it is generated,
+with <think> reasoning kept out of the report.
+
+A failed or empty LLM reply is never treated as a summary or report, so
+it can't end up cached as one.
+"""
+
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from src.config.config import Config
+from src.core.llm import FAILURE_PREFIX, LLMClient
+from src.features.passage_ranker import PassageRanker, build_context
+
+THINK_BLOCK = re.compile(r"<think>.*?(?:</think>|$)", re.S)
+THINK_OPEN, THINK_CLOSE = "<think>", "</think>"
+INTERRUPTED_MARKER = "*[Report interrupted - partial]*"
+
+MAP_PROMPT = """
+You are a research assistant. Summarize what the source below says about: "{topic}".
+Write 3-6 short bullet points of concrete facts, figures and claims from the source only.
+If the source says nothing relevant, reply with exactly: NOTHING RELEVANT
+"""
+
+REDUCE_PROMPT = """
+You are JARVIS, a sophisticated research assistant.
+Merge the per-source summaries provided into a comprehensive research summary on: "{topic}".
+
+Format the output in clear Markdown with:
+- Main Breakdown of the topic
+- Key findings/Pros & Cons
+- Source citations (URLs)
+
+Keep it concise but technical. Note where sources disagree.
+"""
+
+
+class SynthesisFailed(RuntimeError):
+    """The LLM call failed or produced nothing."""
+
+
+def strip_reasoning(text: str) -> str:
+    """Drop <think>...</think> reasoning that models like deepseek-r1 emit."""
+    return THINK_BLOCK.sub("", text).strip()
+
+
+def is_failed_output(text: str) -> bool:
+    """True for an empty reply or LLMClient's error message."""
+    text = text.strip()
+    return not text or text.startswith(FAILURE_PREFIX)
+
+
+class MapReduceSynthesizer:
+    """Summarises sources in parallel, then merges the summaries."""
+
+    def __init__(self, llm: LLMClient, ranker: Optional[PassageRanker] = None,
+                 parallelism: int = Config.RESEARCH_LLM_PARALLELISM,
+                 map_tokens: int = Config.RESEARCH_MAP_TOKENS):
+        """
+        Args:
+            llm: Client used for both steps
+            ranker: Picks each source's relevant passages for its map prompt
+            parallelism: Map calls in flight at once
+            map_tokens: Source text budget per map prompt
+        """
+        self.llm = llm
+        self.ranker = ranker or PassageRanker()
+        self.parallelism = parallelism
+        self.map_tokens = map_tokens
+        self._print_lock = threading.Lock()
+
+    def _complete(self, system: str, user: str) -> str:
+        """
+        Raises:
+            SynthesisFailed: The LLM call failed or returned nothing
+        """
+        response = self.llm.chat([
+            {"role": "system", "content": system},
+            {"role": "user", "content": user},
+        ], stream=False, use_jarvis_personality=False)
+        text = strip_reasoning("".join(response))
+        if is_failed_output(text):
+            raise SynthesisFailed(text or "the model returned an empty response")
+        return text
+
+    def summarize_source(self, topic: str, url: str, text: str) -> str:
+        """Map step for one source."""
+        passages = self.ranker.select(topic, {url: text}, self.map_tokens)
+        return self._complete(MAP_PROMPT.format(topic=topic), build_context(topic, passages))
+
+    def _progress(self, message: str):
+        with self._print_lock:
+            print(message, flush=True)
+
+    def summarize_all(self, topic: str, sources: Iterable[Tuple[str, str]],
+                      on_summary: Optional[Callable[[str, str], None]] = None) -> Dict[str, str]:
+        """
+        Map step over a stream of sources.
+
+        Each source is submitted the moment it arrives, so summarising
+        overlaps with the remaining downloads.
+
+        Args:
+            topic: Research topic
+            sources: (url, text) pairs, e.g. WebScraper.iter_sources()
+            on_summary: Called with (url, summary) as each one finishes
+
+        Returns:
+            url -> summary in source arrival order, irrelevant or failed sources left out
+        """
+        started = time.monotonic()
+        pool = ThreadPoolExecutor(max_workers=self.parallelism, thread_name_prefix="jarvis-summarize")
+        futures = {}
+
+        def report(url, future):
+            try:
+                summary = future.result()
+            except Exception as e:
+                self._progress(f"   ⚠️ Could not summarize {url[:50]}: {e}")
+                return
+            if "NOTHING RELEVANT" in summary:
+                self._progress(f"   ➖ Nothing relevant in {url[:50]}")
+                return
+            first_line = summary.splitlines()[0].lstrip("-*• ").strip()
+            self._progress(f"   💡 [{time.monotonic() - started:.1f}s] {url[:50]}: {first_line[:100]}")
+            if on_summary:
+                on_summary(url, summary)
+
+        try:
+            for url, text in sources:
+                future = pool.submit(self.summarize_source, topic, url, text)
+                future.add_done_callback(lambda f, url=url: report(url, f))
+                futures[url] = future
+        finally:
+            pool.shutdown(wait=True)
+
+        summaries = {}
+        for url, future in futures.items():
+            if future.exception() is None and "NOTHING RELEVANT" not in future.result():
+                summaries[url] = future.result()
+        return summaries
+
+    def reduce_messages(self, topic: str, summaries: Dict[str, str]) -> List[Dict[str, str]]:
+        """Chat messages for the reduce step."""
+        context = f"Research Topic: {topic}\n\nSource Summaries:\n"
+        for url, summary in summaries.items():
+            context += f"\n--- Source: {url} ---\n{summary}\n"
+        return [
+            {"role": "system", "content": REDUCE_PROMPT.format(topic=topic)},
+            {"role": "user", "content": context},
+        ]
+
+    def reduce(self, topic: str, summaries: Dict[str, str]) -> str:
+        """
+        Reduce step: one report from all summaries.
+
+        Raises:
+            SynthesisFailed: The LLM call failed or returned nothing
+        """
+        messages = self.reduce_messages(topic, summaries)
+        return self._complete(messages[0]["content"], messages[1]["content"])
+
+
+class ReasoningSplitter:
+    """
+    Splits a token stream into reasoning (<think>...</think>) and answer text.
+
+    Tags may arrive split across chunks, so a possible partial tag at the
+    end of a chunk is held back until the next one.
+    """
+
+    def __init__(self):
+        self.in_reasoning = False
+        self._buffer = ""
+
+    def feed(self, chunk: str) -> List[Tuple[bool, str]]:
+        """
+        Returns:
+            (is_reasoning, text) segments ready to display
+        """
+        self._buffer += chunk
+        segments = []
+        while True:
+            tag = THINK_CLOSE if self.in_reasoning else THINK_OPEN
+            index = self._buffer.find(tag)
+            if index >= 0:
+                segments.append((self.in_reasoning, self._buffer[:index]))
+                self._buffer = self._buffer[index + len(tag):]
+                self.in_reasoning = not self.in_reasoning
+                continue
+            held = next((n for n in range(min(len(tag) - 1, len(self._buffer)), 0, -1)
+                         if tag.startswith(self._buffer[-n:])), 0)
+            segments.append((self.in_reasoning, self._buffer[:len(self._buffer) - held]))
+            self._buffer = self._buffer[len(self._buffer) - held:]
+            return [(reasoning, text) for reasoning, text in segments if text]
+
+    def flush(self) -> List[Tuple[bool, str]]:
+        text, self._buffer = self._buffer, ""
+        return [(self.in_reasoning, text)] if text else []
+
+
+def stream_report(chunks: Iterator[str], filepath: Path, header: str,
+                  show_reasoning: bool = Config.RESEARCH_SHOW_REASONING,
+                  out: TextIO = sys.stdout) -> Tuple[str, bool]:
+    """
+    Write a generated report to the console and to disk as tokens arrive.
+
+    Reasoning blocks never reach the file; on the console they are shown
+    only if show_reasoning is set. Ctrl+C stops generation and keeps what
+    was written so far, marked as partial.
+
+    Args:
+        chunks: Token stream, e.g. LLMClient.chat(..., stream=True)
+        filepath: Report file
+        header: Written before the report body
+
+    Returns:
+        (report text, completed) - completed is False if the user cancelled
+    """
+    splitter = ReasoningSplitter()
+    parts: List[str] = []
+    thinking_noted = False
+    completed = True
+    with open(filepath, "w") as f:
+        f.write(header)
+        f.flush()
+
+        def emit(segments):
+            nonlocal thinking_noted
+            for reasoning, text in segments:
+                if reasoning:
+                    if show_reasoning:
+                        out.write(f"\033[2m{text}\033[0m")
+                    elif not thinking_noted:
+                        out.write("💭 Reasoning...\n")
+                        thinking_noted = True
+                else:
+                    if not parts:
+                        text = text.lstrip()  # Models pad the answer after their reasoning
+                        if not text:
+                            continue
+                    parts.append(text)
+                    out.write(text)
+                    f.write(text)
+            out.flush()
+            f.flush()
+
+        try:
+            for chunk in chunks:
+                emit(splitter.feed(chunk))
+            emit(splitter.flush())
+        except KeyboardInterrupt:
+            completed = False
+            if hasattr(chunks, "close"):
+                chunks.close()  # Ends the HTTP stream so the model stops generating
+            f.write(f"\n\n{INTERRUPTED_MARKER}\n")
+        out.write("\n")
+        out.flush()
+    return "".join(parts), completed
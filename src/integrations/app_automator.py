@@ -5,8 +5,6 @@ App Automator Module
 - Create calendar events
 """
 
-import subprocess
-import time
 from .element_finder import AccessibilityHelper
 
 
@@ -17,28 +15,33 @@ class AppAutomator:
         self.mac_control = mac_control
         self.accessibility = AccessibilityHelper()
     
+    def _bring_up(self, app_name: str) -> bool:
+        """Open or focus an app and wait until it is frontmost with a window."""
+        self.mac_control.open_app(app_name)
+        return self.accessibility.wait_for_app(app_name, timeout=5)
+    
     def send_whatsapp_message(self, contact_name: str, message: str) -> bool:
         """Send WhatsApp message to contact."""
         try:
-            self.mac_control.open_app("WhatsApp")
-            time.sleep(1)
-            self.accessibility.activate_app("WhatsApp")
-            time.sleep(0.3)
+            if not self._bring_up("WhatsApp"):
+                return False
             
             # Cmd+N to start new chat
-            subprocess.run(['osascript', '-e', 'keystroke "n" using command down'], timeout=1)
-            time.sleep(0.5)
+            self.accessibility.key_combination("n", ["command"])
+            if not self.accessibility.wait_for_text_input("WhatsApp"):
+                return False
             
-            self.accessibility.type_text(contact_name, delay=0.04)
-            time.sleep(0.5)
+            self.accessibility.type_text(contact_name, app_name="WhatsApp")
+            search_field = self.accessibility.focused_element("WhatsApp")
             self.accessibility.press_key("return")
-            time.sleep(0.5)
             
-            self.accessibility.type_text(message, delay=0.03)
-            time.sleep(0.3)
+            # Opening the chat moves focus from the search field to the message box
+            if not self.accessibility.wait_for_text_input("WhatsApp", previous=search_field):
+                return False
+            self.accessibility.type_text(message, app_name="WhatsApp")
             
             # Cmd+Enter to send
-            subprocess.run(['osascript', '-e', 'keystroke "return" using command down'], timeout=1)
+            self.accessibility.key_combination("return", ["command"])
             
             return True
         except:
@@ -47,19 +50,16 @@ class AppAutomator:
     def open_email_search(self, search_query: str) -> bool:
         """Search emails in Mail.app."""
         try:
-            self.mac_control.open_app("Mail")
-            time.sleep(0.5)
-            self.accessibility.activate_app("Mail")
-            time.sleep(0.3)
+            if not self._bring_up("Mail"):
+                return False
             
             # Cmd+F for search
-            subprocess.run(['osascript', '-e', 'keystroke "f" using command down'], timeout=1)
-            time.sleep(0.3)
+            self.accessibility.key_combination("f", ["command"])
+            if not self.accessibility.wait_for_text_input("Mail"):
+                return False
             
-            self.accessibility.type_text(search_query, delay=0.03)
-            time.sleep(0.3)
+            self.accessibility.type_text(search_query, app_name="Mail")
             self.accessibility.press_key("return")
-            time.sleep(1)
             
             return True
         except:
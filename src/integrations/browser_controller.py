@@ -8,6 +8,8 @@ Browser Controller Module
 
 import subprocess
 import time
+
+from src.core.script_runner import run_applescript
 from .element_finder import AccessibilityHelper
 
 
@@ -79,7 +81,7 @@ class BrowserController:
             self.accessibility.activate_app(self.browser)
             time.sleep(0.3)
             # Cmd+T opens new tab
-            subprocess.run(['osascript', '-e', 'tell application "System Events" to keystroke "t" using command down'], timeout=1)
+            run_applescript('tell application "System Events" to keystroke "t" using command down', timeout=1)
             time.sleep(0.5)
             return True
         except:
@@ -101,14 +103,14 @@ class BrowserController:
             time.sleep(0.2)
             
             # Cmd+L focuses address bar
-            subprocess.run(['osascript', '-e', 'tell application "System Events" to keystroke "l" using command down'], timeout=1)
+            run_applescript('tell application "System Events" to keystroke "l" using command down', timeout=1)
             time.sleep(0.3)
             
             # Add https:// if not present
             if not url.startswith("http"):
                 url = "https://" + url
             
-            self.accessibility.type_text(url, delay=0.02)
+            self.accessibility.type_text(url, app_name=self.browser)
             time.sleep(0.3)
             self.accessibility.press_key("return")
             time.sleep(2)
@@ -127,19 +129,19 @@ class BrowserController:
             self.accessibility.activate_app(self.browser)
             time.sleep(0.2)
             
-            self.accessibility.type_text(query, delay=0.03)
+            self.accessibility.type_text(query, app_name=self.browser)
             time.sleep(0.3)
             self.accessibility.press_key("return")
             time.sleep(2)
             
             # Click first video
-            subprocess.run(['osascript', '-e', '''
+            run_applescript('''
                 tell application "System Events"
                     key code 125
                     delay 0.3
                     key code 36
                 end tell
-            '''], timeout=2)
+            ''', timeout=2)
             
             return True
         except:
@@ -155,7 +157,7 @@ class BrowserController:
             self.accessibility.activate_app(self.browser)
             time.sleep(0.2)
             
-            self.accessibility.type_text(query, delay=0.03)
+            self.accessibility.type_text(query, app_name=self.browser)
             time.sleep(0.3)
             self.accessibility.press_key("return")
             time.sleep(2)
@@ -0,0 +1,247 @@
+"""
+Calendar Event Cache
+Local copy of Calendar.app events for a window of days, read in bulk by
+one AppleScript, so the briefing and conflict checks are answered from
+memory instead of a Calendar round trip each time.
+
+The read script asks each calendar for the properties of all matching
+events at once (one Apple event per property, not per event) and returns
+them as separator-delimited records. Dates are sent as numeric
+components, so parsing does not depend on the system locale.
+
+Recurring events are read with their RRULE and expanded into the window
+here by the recurrence engine, since Calendar only stores the first
+occurrence's dates. Daily, weekly, monthly and yearly rules (INTERVAL,
+BYDAY, BYMONTHDAY, BYMONTH, UNTIL, COUNT) are expanded. Occurrences moved
+or deleted in Calendar.app are not tracked, and rules the engine can't
+parse (e.g. BYSETPOS) only show their first occurrence.
+
+Events created through Jarvis are added to the cache directly; edits made
+in Calendar.app itself show up once the cache expires. If Calendar can't
+be read, the last loaded events keep being served.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, List, Optional, Tuple
+
+from src.config.config import Config
+from src.core.recurrence import Recurrence, local_timezone, localize, parse_recurrence
+from src.core.script_runner import ScriptResult, run_applescript
+
+FIELD_SEP, RECORD_SEP = "\x1f", "\x1e"
+
+READ_EVENTS_SCRIPT = '''
+on makeDate(y, m, d)
+    set theDate to current date
+    set day of theDate to 1
+    set year of theDate to y
+    set month of theDate to m
+    set day of theDate to d
+    set time of theDate to 0
+    return theDate
+end makeDate
+
+on stamp(theDate)
+    return ((year of theDate) as text) & "-" & ((month of theDate as integer) as text) & "-" & ((day of theDate) as text) & "-" & ((time of theDate) as text)
+end stamp
+
+set windowStart to my makeDate({start_year}, {start_month}, {start_day})
+set windowEnd to my makeDate({end_year}, {end_month}, {end_day})
+set fieldSep to character id 31
+set records to {{}}
+
+tell application "Calendar"
+    repeat with cal in calendars
+        set calName to name of cal
+        -- Recurring events are matched on their first occurrence, so any that started earlier are read too
+        set matching to a reference to (every event of cal whose start date < windowEnd and (end date > windowStart or recurrence is not missing value))
+        set titles to summary of matching
+        set starts to start date of matching
+        set ends to end date of matching
+        set allDays to allday event of matching
+        set rules to recurrence of matching
+        repeat with i from 1 to count of titles
+            set end of records to ((item i of titles) as text) & fieldSep & my stamp(item i of starts) & fieldSep & my stamp(item i of ends) & fieldSep & ((item i of allDays) as text) & fieldSep & calName & fieldSep & ((item i of rules) as text)
+        end repeat
+    end repeat
+end tell
+
+set AppleScript's text item delimiters to character id 30
+return records as text
+'''
+
+
+@dataclass
+class CalendarEvent:
+    summary: str
+    start: datetime
+    end: datetime
+    calendar: str = ""
+    all_day: bool = False
+    recurrence: str = ""  # RRULE of the series this is an occurrence of
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        return self.start < end and self.end > start
+
+
+def _parse_stamp(value: str) -> datetime:
+    year, month, day, seconds = (int(part) for part in value.split("-"))
+    return datetime(year, month, day) + timedelta(seconds=seconds)
+
+
+def parse_events(output: str) -> List[CalendarEvent]:
+    """Events from the read script's output; malformed records are skipped."""
+    events = []
+    for record in output.split(RECORD_SEP):
+        fields = record.strip("\r\n").split(FIELD_SEP)
+        if len(fields) != 6:
+            continue
+        summary, start, end, all_day, calendar, recurrence = fields
+        try:
+            events.append(CalendarEvent(
+                summary="" if summary == "missing value" else summary,
+                start=_parse_stamp(start),
+                end=_parse_stamp(end),
+                calendar=calendar,
+                all_day=all_day == "true",
+                recurrence="" if recurrence == "missing value" else recurrence,
+            ))
+        except ValueError:
+            continue
+    events.sort(key=lambda e: e.start)
+    return events
+
+
+def expand_recurring(event: CalendarEvent, start: datetime, end: datetime) -> List[CalendarEvent]:
+    """
+    Occurrences of an event overlapping [start, end).
+
+    Events without a recurrence, or with a rule that can't be expanded,
+    are returned as they are if their own dates overlap.
+    """
+    single = [event] if event.overlaps(start, end) else []
+    if not event.recurrence:
+        return single
+    parts = dict(item.split("=", 1) for item in event.recurrence.upper().split(";") if "=" in item)
+    tz = local_timezone()
+    first = localize(event.start, tz)
+    try:
+        rule: Recurrence = parse_recurrence(event.recurrence, dtstart=first, tz=tz)
+        count = int(parts["COUNT"]) if "COUNT" in parts else None
+    except ValueError:
+        return single  # BYSETPOS and other unsupported rules
+    duration = event.end - event.start
+
+    occurrences = []
+    if count is None:
+        # No count to keep, so skip straight to the first occurrence that can overlap
+        occurrence = first if event.start + duration > start else rule.next_after(localize(start - duration, tz))
+    else:
+        occurrence = first
+    seen = 0
+    while occurrence is not None:
+        naive = occurrence.replace(tzinfo=None)
+        if naive >= end or (count is not None and seen >= count):
+            break
+        seen += 1
+        if naive + duration > start:
+            occurrences.append(CalendarEvent(event.summary, naive, naive + duration, event.calendar,
+                                             event.all_day, event.recurrence))
+        occurrence = rule.next_after(occurrence)
+    return occurrences
+
+
+class EventCache:
+    """Events in a window of days, bulk-loaded and kept for a TTL."""
+
+    def __init__(self, ttl: float = Config.CALENDAR_CACHE_TTL, window_days: int = Config.CALENDAR_WINDOW_DAYS,
+                 runner: Callable[..., ScriptResult] = run_applescript):
+        """
+        Args:
+            ttl: Seconds loaded events are trusted before Calendar is read again
+            window_days: Days from today loaded by each read
+            runner: Runs the read script (run_applescript, or a fake in tests)
+        """
+        self.ttl = ttl
+        self.window_days = window_days
+        self.runner = runner
+        self._events: List[CalendarEvent] = []
+        self._window: Optional[Tuple[datetime, datetime]] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Force the next query to re-read Calendar."""
+        with self._lock:
+            self._loaded_at = 0.0
+
+    def _covers(self, start: datetime, end: datetime) -> bool:
+        return bool(self._window and self._window[0] <= start and end <= self._window[1])
+
+    def _load(self, start: datetime, end: datetime):
+        script = READ_EVENTS_SCRIPT.format(
+            start_year=start.year, start_month=start.month, start_day=start.day,
+            end_year=end.year, end_month=end.month, end_day=end.day,
+        )
+        result = self.runner(script, timeout=Config.CALENDAR_READ_TIMEOUT)
+        if not result:
+            raise RuntimeError(result.error or "Could not read Calendar")
+        events = [occurrence for event in parse_events(result.output)
+                  for occurrence in expand_recurring(event, start, end)]
+        events.sort(key=lambda e: e.start)
+        self._events = events
+        self._window = (start, end)
+        self._loaded_at = time.monotonic()
+
+    def events(self, start: datetime, end: datetime) -> List[CalendarEvent]:
+        """
+        Events overlapping [start, end), in start order.
+
+        Raises:
+            RuntimeError: Calendar could not be read and nothing usable is cached
+        """
+        with self._lock:
+            covered = self._covers(start, end)
+            if not covered or time.monotonic() - self._loaded_at > self.ttl:
+                window_start = datetime.combine(date.today(), datetime.min.time())
+                window_end = window_start + timedelta(days=self.window_days)
+                # Whole days, so the window boundaries match the script's midnight dates
+                window_start = min(window_start, datetime.combine(start.date(), datetime.min.time()))
+                window_end = max(window_end, datetime.combine(end.date(), datetime.min.time()) + timedelta(days=1))
+                try:
+                    self._load(window_start, window_end)
+                except RuntimeError as e:
+                    if not covered:
+                        raise
+                    print(f"⚠️ Could not refresh calendar, using events from earlier: {e}")
+            return [event for event in self._events if event.overlaps(start, end)]
+
+    def on_day(self, day: date) -> List[CalendarEvent]:
+        start = datetime.combine(day, datetime.min.time())
+        return self.events(start, start + timedelta(days=1))
+
+    def conflicts(self, start: datetime, end: datetime, load: bool = True) -> List[CalendarEvent]:
+        """
+        Timed events overlapping a proposed slot (all-day events don't block time).
+
+        Args:
+            load: False = never read Calendar: answer from events already in
+                  memory (even expired), or [] if the slot was never loaded
+        """
+        if load:
+            events = self.events(start, end)
+        else:
+            with self._lock:
+                events = [event for event in self._events if event.overlaps(start, end)] \
+                    if self._covers(start, end) else []
+        return [event for event in events if not event.all_day]
+
+    def add(self, event: CalendarEvent):
+        """Record an event just created, without re-reading Calendar."""
+        with self._lock:
+            if self._window and event.overlaps(*self._window):
+                self._events.append(event)
+                self._events.sort(key=lambda e: e.start)
@@ -3,19 +3,25 @@ Calendar Controller Module
 - Interact with macOS Calendar app via AppleScript
 - Create events/reminders
 - Parse natural language dates
+- Read events through a local cache (see calendar_cache)
 """
 
-import subprocess
-import dateparser
-from datetime import datetime
+from datetime import date, datetime
 import json
 import logging
+from typing import List
+
+from src.core.date_parser import parse_datetime
+from src.core.script_runner import run_applescript
+from src.integrations.calendar_cache import CalendarEvent, EventCache
+
 
 class CalendarController:
     """Controls macOS Calendar app using AppleScript."""
     
     def __init__(self):
         self.logger = logging.getLogger("Jarvis.Calendar")
+        self.events = EventCache()
     
     def create_event(self, summary: str, start_time_str: str, duration_mins: int = 60) -> tuple[bool, str]:
         """
@@ -31,10 +37,7 @@ class CalendarController:
         """
         try:
             # Parse the natural language date
-            start_date = dateparser.parse(
-                start_time_str,
-                settings={'PREFER_DATES_FROM': 'future'}
-            )
+            start_date = parse_datetime(start_time_str)
             
             if not start_date:
                 return (False, f"I couldn't understand the date and time '{start_time_str}', sir.")
@@ -47,6 +50,8 @@ class CalendarController:
             
             from datetime import timedelta
             end_date = start_date + timedelta(minutes=duration_mins)
+            # Only from events already loaded: a bulk read here would delay the event itself
+            conflicts = self.events.conflicts(start_date, end_date, load=False)
             
             # Format dates for AppleScript using components to avoid locale issues (MM/DD vs DD/MM)
             # We construct a base date independently of string parsing
@@ -92,22 +97,44 @@ class CalendarController:
             '''
             
             # Run the script
-            result = subprocess.run(['osascript', '-e', script], capture_output=True, text=True)
+            result = run_applescript(script, timeout=15)
             
-            if result.returncode == 0:
-                calendar_name = result.stdout.strip()
+            if result:
+                calendar_name = result.output.strip()
+                self.events.add(CalendarEvent(summary, start_date, end_date, calendar_name))
                 # Include YEAR in the confirmation to fail-safe user's concern
                 fmt_date = start_date.strftime("%A, %B %d, %Y at %I:%M %p")
-                return (True, f"Scheduled '{summary}' on {fmt_date} ({calendar_name} calendar).")
+                message = f"Scheduled '{summary}' on {fmt_date} ({calendar_name} calendar)."
+                if conflicts:
+                    clashes = ", ".join(f"'{e.summary}' at {e.start.strftime('%I:%M %p')}" for e in conflicts)
+                    message += f" Note that it overlaps with {clashes}."
+                return (True, message)
             else:
-                self.logger.error(f"AppleScript error: {result.stderr}")
+                self.logger.error(f"AppleScript error: {result.error}")
                 return (False, "I encountered an error accessing your calendar, sir. Please check permissions.")
                 
         except Exception as e:
             self.logger.error(f"Calendar error: {e}")
             return (False, f"An error occurred while scheduling: {str(e)}")
 
+    def find_conflicts(self, start: datetime, end: datetime) -> List[CalendarEvent]:
+        """Timed events overlapping a slot, from the event cache ([] if Calendar can't be read)."""
+        try:
+            return self.events.conflicts(start, end)
+        except Exception as e:
+            self.logger.warning(f"Could not check calendar conflicts: {e}")
+            return []
+
     def get_todays_events(self) -> str:
         """Get list of events for today."""
-        # TODO: Implement reading logic
-        return "Reading calendar is not yet implemented, sir."
+        events = self.events.on_day(date.today())
+        if not events:
+            return "Your calendar is clear today."
+        items = []
+        for event in events:
+            if event.all_day:
+                items.append(f"{event.summary} (all day)")
+            else:
+                items.append(f"{event.summary} at {event.start.strftime('%I:%M %p').lstrip('0')}")
+        noun = "event" if len(events) == 1 else "events"
+        return f"You have {len(events)} {noun} today: " + "; ".join(items) + "."
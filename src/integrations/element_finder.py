@@ -2,13 +2,15 @@
 Element Finder Module
 - Interact with macOS apps via Accessibility APIs
 - Type text, press keys, control UI elements
-- Uses AppleScript through osascript
+- Uses AppleScript through the persistent script worker
 """
 
-import subprocess
 import time
 from typing import Optional
 
+from src.core.script_runner import run_applescript, run_applescript_batch
+from src.core.wait import wait_until
+
 
 class AccessibilityHelper:
     """
@@ -16,6 +18,25 @@ class AccessibilityHelper:
     Controls applications through AppleScript
     """
     
+    # Text entry method per app ("paste", "keystroke" or "chars"); others use keystroke
+    TEXT_ENTRY_METHODS = {
+        "WhatsApp": "paste",
+        "Mail": "paste",
+        "Slack": "paste",
+        "Notes": "paste",
+    }
+    PASTE_SETTLE_SECONDS = 0.15  # Time the target app gets to read the clipboard before it is restored
+    
+    # Named keys are sent as key codes; `keystroke "return"` would type the word
+    KEY_CODES = {
+        "return": 36,
+        "enter": 36,
+        "tab": 48,
+        "space": 49,
+        "delete": 51,
+        "escape": 53,
+    }
+    
     @staticmethod
     def get_frontmost_app() -> str:
         """Get name of currently active application."""
@@ -24,68 +45,103 @@ class AccessibilityHelper:
             get name of first application process whose frontmost is true
         end tell
         """
-        try:
-            result = subprocess.run(
-                ['osascript', '-e', script],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return result.stdout.strip()
-        except Exception as e:
-            print(f"Error getting frontmost app: {e}")
+        result = run_applescript(script, timeout=5)
+        if not result:
+            print(f"Error getting frontmost app: {result.error}")
             return ""
+        return result.output.strip()
     
     @staticmethod
-    def type_text(text: str, delay: float = 0.05) -> bool:
-        """Type text character by character."""
+    def _quote(text: str) -> str:
+        """AppleScript string literal."""
+        return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+    
+    @staticmethod
+    def text_entry_method(text: str, app_name: Optional[str] = None, delay: float = 0.0) -> str:
+        """
+        Pick how to enter text: "paste", "keystroke" (whole string at once)
+        or "chars" (one keystroke per character).
+        
+        Paced typing always goes per character. Newlines and non-ASCII can't
+        go through `keystroke` reliably, so they are pasted. Otherwise the
+        app's entry in TEXT_ENTRY_METHODS decides, defaulting to keystroke.
+        """
+        if delay:
+            return "chars"
+        if "\n" in text or "\r" in text or not text.isascii():
+            return "paste"
+        return AccessibilityHelper.TEXT_ENTRY_METHODS.get(app_name, "keystroke")
+    
+    @staticmethod
+    def paste_text(text: str) -> bool:
+        """Paste text through the clipboard, restoring the previous clipboard afterwards."""
+        script = f"""
+        set savedClipboard to missing value
+        try
+            set savedClipboard to the clipboard as record
+        end try
+        set the clipboard to {AccessibilityHelper._quote(text)}
+        tell application "System Events" to keystroke "v" using command down
+        -- The target app reads the clipboard asynchronously
+        delay {AccessibilityHelper.PASTE_SETTLE_SECONDS}
+        if savedClipboard is not missing value then set the clipboard to savedClipboard
+        """
+        return run_applescript(script, timeout=5).ok
+    
+    @staticmethod
+    def type_text(text: str, delay: float = 0.0, app_name: Optional[str] = None) -> bool:
+        """
+        Enter text into the focused field.
+        
+        Args:
+            text: Text to enter
+            delay: Seconds between characters; forces per-character typing
+            app_name: Target app for choosing the entry method. None = frontmost app
+                      (only looked up when per-app methods are configured).
+        """
+        if not text:
+            return True
         try:
-            for char in text:
-                # Escape special characters for AppleScript
-                if char == '"':
-                    # Use backslash to escape quotes
-                    escaped_char = '\\"'
-                elif char == '\\':
-                    # Escape backslashes
-                    escaped_char = '\\\\'
-                else:
-                    escaped_char = char
-                
-                # Use single quotes to wrap the character to avoid quote issues
-                script = f"tell application \"System Events\" to keystroke \"{escaped_char}\""
-                
-                try:
-                    subprocess.run(['osascript', '-e', script], timeout=1, capture_output=True)
-                except:
-                    # If that fails, try alternative method
-                    pass
-                
+            if app_name is None and not delay and AccessibilityHelper.TEXT_ENTRY_METHODS:
+                app_name = AccessibilityHelper.get_frontmost_app()
+            method = AccessibilityHelper.text_entry_method(text, app_name, delay)
+            
+            if method == "paste" and AccessibilityHelper.paste_text(text):
+                return True
+            if method in ("paste", "keystroke") and "\n" not in text:
+                script = f'tell application "System Events" to keystroke {AccessibilityHelper._quote(text)}'
+                if run_applescript(script, timeout=max(5, len(text) * 0.05)):
+                    return True
+            
+            # Fallback: one keystroke per character
+            scripts = [f'tell application "System Events" to keystroke {AccessibilityHelper._quote(char)}'
+                       for char in text]
+            if not delay:
+                return all(run_applescript_batch(scripts, timeout=max(5, len(text) * 0.05)))
+            for script in scripts:
+                run_applescript(script, timeout=1)
                 time.sleep(delay)
             return True
         except Exception as e:
             print(f"Error typing text: {e}")
             return False
     
+    @staticmethod
+    def _key_stroke(key: str) -> str:
+        """AppleScript keystroke for a character or a named key."""
+        code = AccessibilityHelper.KEY_CODES.get(key.lower())
+        return f"key code {code}" if code is not None else f'keystroke "{key}"'
+    
     @staticmethod
     def press_key(key: str) -> bool:
-        """Press a single key."""
-        key_map = {
-            "return": "return",
-            "enter": "return",
-            "tab": "tab",
-            "space": "space",
-            "delete": "delete",
-            "escape": "escape",
-        }
-        
-        mapped_key = key_map.get(key.lower())
-        if not mapped_key:
+        """Press a single named key (return, tab, space, delete, escape)."""
+        if key.lower() not in AccessibilityHelper.KEY_CODES:
             return False
         
         try:
             # Must wrap in System Events for it to work globally
-            subprocess.run(['osascript', '-e', f'tell application "System Events" to keystroke "{mapped_key}"'], timeout=1)
-            return True
+            script = f'tell application "System Events" to {AccessibilityHelper._key_stroke(key)}'
+            return run_applescript(script, timeout=1).ok
         except Exception as e:
             print(f"Error pressing key: {e}")
             return False
@@ -95,34 +151,63 @@ class AccessibilityHelper:
         """Press key with modifiers (Cmd, Option, Shift)."""
         try:
             mod_string = ', '.join(f'{m} down' for m in modifiers)
-            script = f'tell application "System Events" to keystroke "{key}" using {{{mod_string}}}'
-            subprocess.run(['osascript', '-e', script], timeout=1)
-            return True
+            script = f'tell application "System Events" to {AccessibilityHelper._key_stroke(key)} using {{{mod_string}}}'
+            return run_applescript(script, timeout=1).ok
         except Exception as e:
             print(f"Error with key combination: {e}")
             return False
     
     @staticmethod
-    def wait_for_app(app_name: str, timeout: int = 5) -> bool:
-        """Wait for application to launch and become active."""
-        start_time = time.time()
+    def has_window(app_name: str) -> bool:
+        """Check whether the app's process has at least one window."""
+        script = f'tell application "System Events" to exists window 1 of process "{app_name}"'
+        return run_applescript(script, timeout=2).output.strip() == "true"
+    
+    @staticmethod
+    def focused_element(app_name: str) -> str:
+        """Role and description of the app's focused element, e.g. "AXTextField|search"."""
+        script = f"""
+        tell application "System Events"
+            tell process "{app_name}"
+                set focusedElement to value of attribute "AXFocusedUIElement"
+                return (role of focusedElement) & "|" & (description of focusedElement)
+            end tell
+        end tell
+        """
+        return run_applescript(script, timeout=2).output.strip()
+    
+    @staticmethod
+    def wait_for_app(app_name: str, timeout: float = 5) -> bool:
+        """Wait until the application is frontmost and has a window."""
+        return bool(wait_until(
+            lambda: AccessibilityHelper.get_frontmost_app() == app_name and AccessibilityHelper.has_window(app_name),
+            timeout=timeout
+        ))
+    
+    @staticmethod
+    def wait_for_text_input(app_name: str, timeout: float = 3, previous: Optional[str] = None) -> bool:
+        """
+        Wait until a text input has keyboard focus in the app.
         
-        while time.time() - start_time < timeout:
-            if AccessibilityHelper.get_frontmost_app() == app_name:
-                time.sleep(0.5)
-                return True
-            time.sleep(0.1)
+        Args:
+            previous: focused_element() value to move away from, when focus
+                      is expected to jump from one text field to another
+        """
+        def ready():
+            focused = AccessibilityHelper.focused_element(app_name)
+            role = focused.split("|", 1)[0]
+            return role in ("AXTextField", "AXTextArea", "AXSearchField") and focused != previous
         
-        return False
+        return bool(wait_until(ready, timeout=timeout))
     
     @staticmethod
-    def activate_app(app_name: str) -> bool:
-        """Bring app to foreground."""
+    def activate_app(app_name: str, timeout: float = 2) -> bool:
+        """Bring app to foreground and wait until it is frontmost."""
         try:
             script = f'tell application "{app_name}" to activate'
-            subprocess.run(['osascript', '-e', script], timeout=2)
-            time.sleep(0.3)
-            return True
+            if not run_applescript(script, timeout=2):
+                return False
+            return bool(wait_until(lambda: AccessibilityHelper.get_frontmost_app() == app_name, timeout=timeout))
         except Exception as e:
             print(f"Error activating {app_name}: {e}")
             return False
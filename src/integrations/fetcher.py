@@ -0,0 +1,218 @@
+"""
+Concurrent Fetcher
+Downloads several URLs at once over a pooled session, with per-host
+politeness (token buckets), per-request timeouts and an overall deadline.
+Results stream back in completion order so callers can start on the
+first source while the rest are still downloading.
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from src.config.config import Config
+from src.integrations.http_cache import HttpCache, read_body
+
+
+class TokenBucket:
+    """Allows `rate` requests per second with bursts of up to `burst`."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline: Optional[float] = None) -> bool:
+        """
+        Take a token, waiting for one if needed.
+
+        Args:
+            deadline: time.monotonic() value to give up at
+
+        Returns:
+            False if no token became available before the deadline
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait_for = (1 - self._tokens) / self.rate
+            if deadline is not None and time.monotonic() + wait_for > deadline:
+                return False
+            time.sleep(wait_for)
+
+
+class FetchResult:
+    """Outcome of one download."""
+
+    def __init__(self, url: str, status: Optional[int] = None, content: bytes = b"",
+                 headers: Optional[dict] = None, error: Optional[str] = None, elapsed: float = 0.0,
+                 cache_status: Optional[str] = None):
+        self.url = url
+        self.status = status
+        self.content = content
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.error = error
+        self.elapsed = elapsed
+        self.cache_status = cache_status  # Set when served through an HttpCache
+        self.data = None  # Output of the caller's `process` step
+        self.sink = None  # Body sink that consumed this download, if any (see read_body)
+        self.missed_deadline = False  # Cut off by the overall deadline rather than failing on its own
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status is not None and self.status < 400
+
+    def __repr__(self) -> str:
+        return f"FetchResult({self.url!r}, status={self.status}, error={self.error!r})"
+
+
+class ConcurrentFetcher:
+    """Thread-pool fetch engine with per-host rate limiting."""
+
+    def __init__(self, max_workers: int = Config.RESEARCH_MAX_WORKERS,
+                 host_rate: float = Config.RESEARCH_HOST_RATE,
+                 host_burst: int = Config.RESEARCH_HOST_BURST,
+                 request_timeout: float = Config.RESEARCH_REQUEST_TIMEOUT,
+                 headers: Optional[dict] = None, cache: Optional[HttpCache] = None,
+                 max_bytes: Optional[int] = Config.RESEARCH_MAX_BYTES):
+        """
+        Args:
+            max_workers: Downloads in flight at once
+            host_rate: Requests per second allowed to any one host
+            host_burst: Requests a host may receive back to back
+            request_timeout: Connect/read timeout for each request
+            headers: Default request headers
+            cache: HTTP cache to read through. None = always hit the network.
+            max_bytes: Body bytes read per response before the download is cut off. None = no cap.
+        """
+        self.max_workers = max_workers
+        self.host_rate = host_rate
+        self.host_burst = host_burst
+        self.request_timeout = request_timeout
+        self.max_bytes = max_bytes
+        self.cache = cache
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if headers:
+            self.session.headers.update(headers)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc.lower()
+        with self._buckets_lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.host_rate, self.host_burst)
+            return self._buckets[host]
+
+    def fetch(self, url: str, deadline: Optional[float] = None, sink=None) -> FetchResult:
+        """
+        Download one URL, waiting for its host's rate limit first.
+
+        Args:
+            sink: Fed the body as it downloads (see read_body); set as
+                  `result.sink` only if it was used, not for cache hits
+        """
+        started = time.monotonic()
+        if self.cache:
+            # Fresh cache hits never reach the host, so they skip the rate limit
+            cached = self.cache.peek(url, self.session.headers, allow_partial=sink is not None)
+            if cached:
+                return FetchResult(url, cached.status_code, cached.content, dict(cached.headers),
+                                   cache_status=cached.cache_status)
+        if not self._bucket(url).acquire(deadline):
+            result = FetchResult(url, error="Deadline reached waiting for rate limit")
+            result.missed_deadline = True
+            return result
+
+        timeout = self.request_timeout
+        capped = False
+        if deadline is not None and deadline - time.monotonic() < timeout:
+            timeout, capped = max(0.1, deadline - time.monotonic()), True
+        try:
+            if self.cache:
+                response = self.cache.get(self.session, url, timeout=timeout, max_bytes=self.max_bytes, sink=sink)
+                content = response.content
+            else:
+                response = self.session.get(url, timeout=timeout,
+                                            stream=self.max_bytes is not None or sink is not None)
+                content, _ = read_body(response, self.max_bytes, sink)
+            result = FetchResult(url, response.status_code, content, dict(response.headers),
+                                 elapsed=time.monotonic() - started,
+                                 cache_status=getattr(response, "cache_status", None))
+            if sink is not None and sink.started and result.cache_status not in ("revalidated", "stale"):
+                result.sink = sink
+            return result
+        except requests.RequestException as e:
+            result = FetchResult(url, error=str(e), elapsed=time.monotonic() - started)
+            # A timeout shortened to the deadline says nothing about the source
+            result.missed_deadline = capped and isinstance(e, requests.Timeout)
+            return result
+
+    def fetch_all(self, urls: Iterable[str], deadline: Optional[float] = None,
+                  process: Optional[Callable[[FetchResult], object]] = None,
+                  sink: Optional[Callable[[], object]] = None) -> Iterator[FetchResult]:
+        """
+        Download URLs concurrently, yielding results as they complete.
+
+        Args:
+            urls: URLs to fetch
+            deadline: Seconds from now after which unfinished downloads are dropped
+            process: Optional step run on the worker thread after each download
+                     (e.g. text extraction); its return value lands in `result.data`
+            sink: Creates a body sink per download, so processing can happen while
+                  the body arrives (see fetch)
+
+        Yields:
+            FetchResult objects in completion order; downloads cut off by the
+            deadline are dropped, even if their timeout fires just before it
+        """
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return
+        stop_at = time.monotonic() + deadline if deadline is not None else None
+
+        def task(url):
+            result = self.fetch(url, stop_at, sink() if sink else None)
+            if process and result.ok:
+                try:
+                    result.data = process(result)
+                except Exception as e:
+                    result.error = f"Processing failed: {e}"
+            return result
+
+        pool = ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls)), thread_name_prefix="jarvis-fetch")
+        pending = {pool.submit(task, url) for url in urls}
+        try:
+            while pending:
+                remaining = None if stop_at is None else stop_at - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    if not result.missed_deadline:
+                        yield result
+        finally:
+            for future in pending:
+                future.cancel()
+            # Don't block on stragglers; their timeouts bound them
+            pool.shutdown(wait=False)
+
+    def close(self):
+        self.session.close()
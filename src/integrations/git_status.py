@@ -0,0 +1,306 @@
+"""
+Git Status Service
+Repository status for "git status" / "list branches" / "latest commit"
+without spawning git on every question.
+
+- `git status --porcelain=v2 --branch -z` is parsed into a RepoStatus
+- Results are cached per repository and reused while .git/index, HEAD and
+  the checked-out branch ref are unchanged (a few stat calls), so staging,
+  committing and switching branches invalidate them immediately
+- Plain edits to tracked files don't touch the index, so a cached status
+  is also re-read once it is Config.GIT_STATUS_MAX_AGE seconds old
+- Branch names are read straight from refs/heads and packed-refs
+- Project repos are tracked explicitly (Config.GIT_REPOS) and can be
+  warmed up front; any other repo is found from the working directory
+"""
+
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.config.config import Config
+
+
+@dataclass
+class FileChange:
+    path: str
+    index: str  # Staged state, porcelain letter ("." = unchanged)
+    worktree: str  # Unstaged state
+    orig_path: Optional[str] = None  # Renames and copies
+    conflicted: bool = False
+
+    @property
+    def code(self) -> str:
+        """Two-letter code as in `git status --short`."""
+        return f"{self.index}{self.worktree}".replace(".", " ")
+
+
+@dataclass
+class RepoStatus:
+    root: str
+    branch: Optional[str] = None  # None when detached
+    oid: Optional[str] = None  # None before the first commit
+    upstream: Optional[str] = None
+    ahead: int = 0
+    behind: int = 0
+    changes: List[FileChange] = field(default_factory=list)
+    untracked: List[str] = field(default_factory=list)
+
+    @property
+    def clean(self) -> bool:
+        return not self.changes and not self.untracked
+
+    @property
+    def staged(self) -> List[FileChange]:
+        return [c for c in self.changes if c.index != "." and not c.conflicted]
+
+    @property
+    def conflicts(self) -> List[FileChange]:
+        return [c for c in self.changes if c.conflicted]
+
+    def summary(self, max_files: int = 10) -> str:
+        """Spoken/printed status."""
+        if self.branch:
+            head = f"On branch {self.branch}"
+        else:
+            head = f"HEAD detached at {self.oid[:7]}" if self.oid else "HEAD detached"
+        tracking = []
+        if self.ahead:
+            tracking.append(f"ahead of {self.upstream} by {self.ahead}")
+        if self.behind:
+            tracking.append(f"behind {self.upstream} by {self.behind}")
+        if tracking:
+            head += f" ({', '.join(tracking)})"
+        if self.clean:
+            return f"{head}. Working tree clean, sir."
+
+        counts = []
+        if self.conflicts:
+            counts.append(f"{len(self.conflicts)} conflicted")
+        if self.staged:
+            counts.append(f"{len(self.staged)} staged")
+        unstaged = [c for c in self.changes if c.worktree != "." and not c.conflicted]
+        if unstaged:
+            counts.append(f"{len(unstaged)} modified")
+        if self.untracked:
+            counts.append(f"{len(self.untracked)} untracked")
+        lines = [f"{head}: {', '.join(counts)}."]
+        entries = [f"{c.code} {c.path}" for c in self.changes] + [f"?? {path}" for path in self.untracked]
+        lines.extend(entries[:max_files])
+        if len(entries) > max_files:
+            lines.append(f"...and {len(entries) - max_files} more")
+        return "\n".join(lines)
+
+
+def parse_porcelain_v2(output: str, root: str = "") -> RepoStatus:
+    """Parse `git status --porcelain=v2 --branch -z` output."""
+    status = RepoStatus(root=root)
+    records = output.split("\0")
+    i = 0
+    while i < len(records):
+        record = records[i]
+        i += 1
+        if not record:
+            continue
+        kind = record[0]
+        if kind == "#":
+            _, name, value = record.split(" ", 2)
+            if name == "branch.oid":
+                status.oid = None if value == "(initial)" else value
+            elif name == "branch.head":
+                status.branch = None if value == "(detached)" else value
+            elif name == "branch.upstream":
+                status.upstream = value
+            elif name == "branch.ab":
+                ahead, behind = value.split()
+                status.ahead, status.behind = int(ahead), -int(behind)
+        elif kind == "1":
+            parts = record.split(" ", 8)
+            status.changes.append(FileChange(parts[8], parts[1][0], parts[1][1]))
+        elif kind == "2":
+            parts = record.split(" ", 9)
+            orig_path = records[i] if i < len(records) else None  # -z puts the source path in its own record
+            i += 1
+            status.changes.append(FileChange(parts[9], parts[1][0], parts[1][1], orig_path=orig_path))
+        elif kind == "u":
+            parts = record.split(" ", 10)
+            status.changes.append(FileChange(parts[10], parts[1][0], parts[1][1], conflicted=True))
+        elif kind == "?":
+            status.untracked.append(record[2:])
+    return status
+
+
+def find_repo_root(path: Path) -> Optional[Path]:
+    """Nearest directory at or above path containing .git."""
+    path = Path(path).resolve()
+    for candidate in (path, *path.parents):
+        if (candidate / ".git").exists():
+            return candidate
+    return None
+
+
+def git_dirs(root: Path) -> Tuple[Path, Path]:
+    """
+    (git dir, common dir) for a work tree.
+
+    Linked worktrees and submodules have a .git file pointing elsewhere;
+    their refs live in the common dir.
+    """
+    git_dir = root / ".git"
+    if git_dir.is_file():
+        content = git_dir.read_text().strip()
+        if content.startswith("gitdir:"):
+            git_dir = (root / content[len("gitdir:"):].strip()).resolve()
+    common_dir = git_dir
+    commondir_file = git_dir / "commondir"
+    if commondir_file.exists():
+        common_dir = (git_dir / commondir_file.read_text().strip()).resolve()
+    return git_dir, common_dir
+
+
+def _stat(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return None
+
+
+class GitStatusService:
+    """Per-repository status cache, invalidated by index/HEAD changes."""
+
+    def __init__(self, repos: Iterable[str] = (), max_age: float = Config.GIT_STATUS_MAX_AGE):
+        """
+        Args:
+            repos: Project repositories to track (any path inside each)
+            max_age: Seconds a cached status is trusted even if nothing changed in .git
+        """
+        self.max_age = max_age
+        self.tracked: List[Path] = []
+        self._cache: Dict[Path, Tuple[tuple, float, RepoStatus]] = {}
+        self._commits: Dict[Path, Tuple[tuple, str]] = {}
+        self._lock = threading.Lock()
+        for repo in repos:
+            self.track(repo)
+
+    def track(self, path: str) -> Optional[Path]:
+        """Add a project repository; returns its root, or None if path isn't in a repo."""
+        root = find_repo_root(Path(path).expanduser())
+        if root and root not in self.tracked:
+            self.tracked.append(root)
+        return root
+
+    def resolve(self, repo: Optional[str] = None) -> Optional[Path]:
+        """
+        Repository root for a path or tracked repo name.
+
+        With no argument: the repo containing the working directory, else
+        the first tracked repo.
+        """
+        if repo:
+            for root in self.tracked:
+                if root.name.lower() == repo.lower():
+                    return root
+            path = Path(repo).expanduser()
+            return find_repo_root(path) if path.exists() else None
+        return find_repo_root(Path.cwd()) or (self.tracked[0] if self.tracked else None)
+
+    def signature(self, root: Path) -> tuple:
+        """Stats of the files a status depends on; changes whenever git updates them."""
+        git_dir, common_dir = git_dirs(root)
+        head_path = git_dir / "HEAD"
+        ref_stat = None
+        try:
+            head = head_path.read_text().strip()
+        except OSError:
+            head = ""
+        if head.startswith("ref:"):
+            ref_stat = _stat(common_dir / head[4:].strip())
+        return (_stat(git_dir / "index"), _stat(head_path), head, ref_stat, _stat(common_dir / "packed-refs"))
+
+    def _run_git(self, root: Path, *args: str) -> str:
+        result = subprocess.run(["git", *args], cwd=root, capture_output=True, text=True, timeout=10)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip() or f"git exited with status {result.returncode}")
+        return result.stdout
+
+    def status(self, repo: Optional[str] = None) -> RepoStatus:
+        """
+        Status of a repository, from cache when nothing has changed.
+
+        Raises:
+            RuntimeError: Not a git repository, or git failed
+        """
+        root = self.resolve(repo)
+        if root is None:
+            raise RuntimeError("Not inside a git repository, and no project repos are configured")
+        signature = self.signature(root)
+        with self._lock:
+            cached = self._cache.get(root)
+            if cached and cached[0] == signature and time.monotonic() - cached[1] < self.max_age:
+                return cached[2]
+        # Without --no-optional-locks, status refreshes .git/index itself and would invalidate its own result
+        output = self._run_git(root, "--no-optional-locks", "status", "--porcelain=v2", "--branch", "-z")
+        status = parse_porcelain_v2(output, str(root))
+        with self._lock:
+            self._cache[root] = (signature, time.monotonic(), status)
+        return status
+
+    def refresh_all(self) -> Dict[str, RepoStatus]:
+        """Warm the cache for every tracked repo; unreadable repos are skipped."""
+        statuses = {}
+        for root in self.tracked:
+            try:
+                statuses[str(root)] = self.status(str(root))
+            except (RuntimeError, OSError, subprocess.SubprocessError):
+                continue
+        return statuses
+
+    def invalidate(self, repo: Optional[str] = None):
+        """Drop cached results (after a git write command)."""
+        root = self.resolve(repo)
+        with self._lock:
+            self._cache.pop(root, None)
+            self._commits.pop(root, None)
+
+    def branches(self, repo: Optional[str] = None) -> Tuple[List[str], Optional[str]]:
+        """
+        (local branch names, current branch), read from refs without git.
+        """
+        root = self.resolve(repo)
+        if root is None:
+            raise RuntimeError("Not inside a git repository, and no project repos are configured")
+        git_dir, common_dir = git_dirs(root)
+        names = set()
+        heads = common_dir / "refs" / "heads"
+        for path in heads.rglob("*"):
+            if path.is_file():
+                names.add(path.relative_to(heads).as_posix())
+        try:
+            for line in (common_dir / "packed-refs").read_text().splitlines():
+                parts = line.split(" ", 1)
+                if len(parts) == 2 and parts[1].startswith("refs/heads/"):
+                    names.add(parts[1][len("refs/heads/"):])
+        except OSError:
+            pass
+        head = (git_dir / "HEAD").read_text().strip()
+        current = head[len("ref: refs/heads/"):] if head.startswith("ref: refs/heads/") else None
+        return sorted(names), current
+
+    def latest_commit(self, repo: Optional[str] = None) -> str:
+        """`<short hash> <subject>` of HEAD, cached until HEAD moves."""
+        root = self.resolve(repo)
+        if root is None:
+            raise RuntimeError("Not inside a git repository, and no project repos are configured")
+        signature = self.signature(root)[1:]  # The index doesn't affect HEAD
+        with self._lock:
+            cached = self._commits.get(root)
+            if cached and cached[0] == signature:
+                return cached[1]
+        commit = self._run_git(root, "log", "-1", "--format=%h %s").strip()
+        with self._lock:
+            self._commits[root] = (signature, commit)
+        return commit
@@ -0,0 +1,177 @@
+"""
+GitHub API Reads
+Cached, conditional access to the GitHub REST API for the read-only
+commands ("show my repos", "latest commit").
+
+- Responses go through an HttpCache of their own (one directory per token),
+  so private data never mixes with the shared web cache
+- Each resource kind has its own TTL (Config.GITHUB_TTLS); once it expires
+  the request is revalidated with If-None-Match, and GitHub's 304 answers
+  don't count against the rate limit
+- No network access until the first read (lazy authentication)
+- X-RateLimit-* headers from every real response are tracked; once the
+  quota is exhausted (or GitHub answers 403/429 for rate limiting),
+  expired cached responses are served (marked stale) and only uncached
+  reads fail
+"""
+
+import hashlib
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+
+import requests
+
+from src.config.config import Config
+from src.integrations.http_cache import CachedResponse, HttpCache
+
+REPOS_PAGE = {"per_page": 100}
+
+
+class RateLimitExceeded(Exception):
+    """The GitHub quota is used up until `reset`."""
+
+    def __init__(self, reset: float):
+        self.reset = reset
+        super().__init__(f"GitHub rate limit reached; resets at {time.strftime('%I:%M %p', time.localtime(reset))}")
+
+
+class GitHubAPI:
+    """Read-only GitHub REST client with ETag caching and rate-limit tracking."""
+
+    def __init__(self, token: str, base_url: str = Config.GITHUB_API_URL,
+                 ttls: Optional[Dict[str, float]] = None, cache: Optional[HttpCache] = None,
+                 session: Optional[requests.Session] = None):
+        """
+        Args:
+            token: Personal access token
+            base_url: API root
+            ttls: Resource kind ("user", "repos", "commits") -> seconds fresh
+            cache: Response cache (default: per-token cache under Config.GITHUB_CACHE_DIR)
+            session: HTTP session (a new one by default)
+        """
+        self.base_url = base_url.rstrip("/")
+        self.ttls = Config.GITHUB_TTLS if ttls is None else ttls
+        if cache is None:
+            token_id = hashlib.sha256(token.encode()).hexdigest()[:12]
+            cache = HttpCache(Path(Config.GITHUB_CACHE_DIR) / token_id, ttl_overrides={})
+        self.cache = cache
+        self.session = session or requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+        })
+        self.session.hooks["response"].append(self._track_rate_limit)
+        self.rate_limit: Dict[str, int] = {}  # limit, remaining, used, reset (epoch seconds)
+        self._login: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def _track_rate_limit(self, response, *args, **kwargs):
+        values = {}
+        for name in ("limit", "remaining", "used", "reset"):
+            value = response.headers.get(f"X-RateLimit-{name.title()}")
+            if value and value.isdigit():
+                values[name] = int(value)
+        if values:
+            with self._lock:
+                self.rate_limit.update(values)
+
+    def _url(self, path: str, params: Optional[Dict] = None) -> str:
+        return f"{self.base_url}{path}" + (f"?{urlencode(params)}" if params else "")
+
+    @property
+    def rate_limited(self) -> bool:
+        """True while the quota is used up."""
+        with self._lock:
+            remaining, reset = self.rate_limit.get("remaining"), self.rate_limit.get("reset", 0)
+        return remaining == 0 and time.time() < reset
+
+    def _rate_limit_reset(self, response) -> Optional[float]:
+        """When a 403/429 answer is a rate limit (primary or secondary), the time it lifts."""
+        if response.status_code not in (403, 429):
+            return None
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return time.time() + int(retry_after)
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            with self._lock:
+                return self.rate_limit.get("reset", 0)
+        return None
+
+    def response(self, path: str, kind: str, params: Optional[Dict] = None) -> CachedResponse:
+        """
+        GET an API path through the cache.
+
+        While the quota is used up, or when GitHub rejects the request as
+        rate limited, an expired cached response is returned with
+        cache_status "stale" rather than failing.
+
+        Args:
+            path: e.g. "/user/repos"
+            kind: Resource kind, selecting the TTL
+
+        Raises:
+            RateLimitExceeded: Quota used up and the response isn't cached
+            requests.RequestException: Network or HTTP error
+        """
+        url = self._url(path, params)
+        cached = self.cache.peek(url, self.session.headers)
+        if cached:
+            return cached
+        if self.rate_limited:
+            stale = self.cache.peek(url, self.session.headers, allow_stale=True)
+            if stale:
+                return stale
+            raise RateLimitExceeded(self.rate_limit.get("reset", 0))
+        response = self.cache.get(self.session, url, timeout=Config.GITHUB_REQUEST_TIMEOUT, ttl=self.ttls.get(kind))
+        reset = self._rate_limit_reset(response)
+        if reset is not None:
+            stale = self.cache.peek(url, self.session.headers, allow_stale=True)
+            if stale:
+                return stale
+            raise RateLimitExceeded(reset)
+        response.raise_for_status()
+        return response
+
+    def get(self, path: str, kind: str, params: Optional[Dict] = None):
+        """JSON body of response()."""
+        return self.response(path, kind, params).json()
+
+    def invalidate(self, path: str, params: Optional[Dict] = None):
+        """Revalidate a path on its next read (after a write that changes it)."""
+        self.cache.invalidate(self._url(path, params), self.session.headers)
+
+    @property
+    def login(self) -> str:
+        """Authenticated user's login; the first call is what verifies the token."""
+        if self._login is None:
+            self._login = self.get("/user", "user")["login"]
+        return self._login
+
+    def repos(self, limit: int = 10) -> List[Dict]:
+        """The user's repositories."""
+        # Always the same URL, so every limit shares one cache entry
+        return self.get("/user/repos", "repos", REPOS_PAGE)[:limit]
+
+    def invalidate_repos(self):
+        self.invalidate("/user/repos", REPOS_PAGE)
+
+    def latest_commit(self, repo_name: str) -> Optional[Dict]:
+        """Newest commit on the default branch of "name" (the user's) or "owner/name"."""
+        full_name = repo_name if "/" in repo_name else f"{self.login}/{repo_name}"
+        commits = self.get(f"/repos/{full_name}/commits", "commits", {"per_page": 1})
+        return commits[0] if commits else None
+
+    def rate_limit_status(self) -> str:
+        """Spoken summary of the remaining quota."""
+        with self._lock:
+            rate = dict(self.rate_limit)
+        if "remaining" not in rate:
+            return "I haven't made any GitHub requests yet, sir."
+        message = f"{rate['remaining']} of {rate.get('limit', '?')} GitHub API requests remain"
+        if rate.get("reset"):
+            message += f", resetting at {time.strftime('%I:%M %p', time.localtime(rate['reset']))}"
+        return message + "."
@@ -1,39 +1,61 @@
 """
 GitHub Integration
 Manage GitHub repos and git operations via voice/text commands
+
+Reads go through GitHubAPI (cached, conditional, rate-limit aware);
+PyGithub is only set up when a write such as create_repo needs it.
+Local status, branches and latest commit come from GitStatusService.
 """
 
 import subprocess
 import os
+import threading
 from typing import Tuple, List, Optional
 from github import Github, GithubException
 from pathlib import Path
 
+from src.config.config import Config
+from src.integrations.github_api import GitHubAPI
+from src.integrations.git_status import GitStatusService, find_repo_root
+
 
 class GitHubController:
     """Controls GitHub operations and local git commands."""
     
-    def __init__(self, github_token: Optional[str] = None):
+    def __init__(self, github_token: Optional[str] = None, repos: Optional[List[str]] = None):
         """
         Initialize GitHub controller.
         
         Args:
             github_token: GitHub personal access token (optional)
+            repos: Local project repos to track (default Config.GIT_REPOS)
         """
         self.github_token = github_token or os.getenv("GITHUB_TOKEN")
+        # Nothing talks to GitHub until the first GitHub command
+        self.api = GitHubAPI(self.github_token) if self.github_token else None
         self.gh = None
+        self.user = None
         
-        if self.github_token:
-            try:
-                self.gh = Github(self.github_token)
-                self.user = self.gh.get_user()
-            except Exception as e:
-                print(f"GitHub authentication failed: {e}")
-                self.gh = None
+        self.git = GitStatusService(Config.GIT_REPOS if repos is None else repos)
+        if self.git.tracked:
+            threading.Thread(target=self.git.refresh_all, name="jarvis-git-status", daemon=True).start()
     
     def is_authenticated(self) -> bool:
-        """Check if GitHub is authenticated."""
-        return self.gh is not None
+        """Check if a GitHub token is configured (it is verified on first use)."""
+        return self.api is not None
+    
+    def _pygithub_user(self):
+        """PyGithub user for write operations, created on first use."""
+        if self.user is None:
+            self.gh = Github(self.github_token)
+            self.user = self.gh.get_user()
+        return self.user
+    
+    def rate_limit_status(self) -> Tuple[bool, str]:
+        """Remaining GitHub API quota, as seen in the latest responses."""
+        if not self.is_authenticated():
+            return (False, "GitHub authentication required, sir. Please set GITHUB_TOKEN.")
+        return (True, self.api.rate_limit_status())
     
     # ============================================================================
     # GitHub API Operations
@@ -50,15 +72,17 @@ class GitHubController:
             return (False, "GitHub authentication required, sir. Please set GITHUB_TOKEN.")
         
         try:
-            repos = list(self.user.get_repos()[:limit])
+            repos = self.api.repos(limit)
             
             if not repos:
                 return (True, "You have no repositories, sir.")
             
             repo_list = "Your repositories, sir:\n"
             for repo in repos:
-                stars = f"⭐{repo.stargazers_count}" if repo.stargazers_count > 0 else ""
-                repo_list += f"- {repo.name} {stars}\n"
+                stars = f"⭐{repo['stargazers_count']}" if repo.get("stargazers_count", 0) > 0 else ""
+                repo_list += f"- {repo['name']} {stars}\n"
+            if self.api.rate_limited:
+                repo_list += "(From my cache - the GitHub rate limit has been reached.)\n"
             
             return (True, repo_list)
         
@@ -76,12 +100,13 @@ class GitHubController:
             return (False, "GitHub authentication required, sir.")
         
         try:
-            repo = self.user.create_repo(
+            repo = self._pygithub_user().create_repo(
                 name=repo_name,
                 description=description,
                 private=private,
                 auto_init=True
             )
+            self.api.invalidate_repos()
             
             return (True, f"Created repository '{repo_name}', sir. URL: {repo.html_url}")
         
@@ -89,6 +114,8 @@ class GitHubController:
             if e.status == 422:
                 return (False, f"Repository '{repo_name}' already exists, sir.")
             return (False, f"Could not create repository: {e}")
+        except Exception as e:
+            return (False, f"Could not create repository: {e}")
     
     def get_latest_commit(self, repo_name: Optional[str] = None) -> Tuple[bool, str]:
         """
@@ -102,26 +129,32 @@ class GitHubController:
         """
         if repo_name and self.is_authenticated():
             try:
-                repo = self.user.get_repo(repo_name)
-                commits = list(repo.get_commits()[:1])
-                if commits:
-                    commit = commits[0]
-                    return (True, f"Latest commit: {commit.commit.message} by {commit.commit.author.name}")
+                commit = self.api.latest_commit(repo_name)
+                if commit:
+                    details = commit["commit"]
+                    message = f"Latest commit: {details['message']} by {details['author']['name']}"
+                    if self.api.rate_limited:
+                        message += " (from my cache - the GitHub rate limit has been reached)"
+                    return (True, message)
             except Exception as e:
                 return (False, f"Could not fetch commit: {e}")
         
         # Fallback to local git
-        return self._run_git_command(["git", "log", "-1", "--oneline"])
+        try:
+            return (True, self.git.latest_commit(repo_name))
+        except (RuntimeError, OSError, subprocess.SubprocessError) as e:
+            return (False, f"Could not read the latest commit: {e}")
     
     # ============================================================================
     # Local Git Operations
     # ============================================================================
     
-    def _run_git_command(self, command: List[str]) -> Tuple[bool, str]:
+    def _run_git_command(self, command: List[str], cwd: Optional[Path] = None) -> Tuple[bool, str]:
         """Run a git command locally."""
         try:
             result = subprocess.run(
                 command,
+                cwd=cwd,
                 capture_output=True,
                 text=True,
                 timeout=10
@@ -139,49 +172,81 @@ class GitHubController:
         except Exception as e:
             return (False, f"Error: {e}")
     
-    def git_status(self) -> Tuple[bool, str]:
+    def _run_git_write(self, command: List[str], repo: Optional[str] = None) -> Tuple[bool, str]:
+        """
+        Run a git command that changes the repo, then drop its cached status.
+
+        Writes go to the repo containing the working directory, or to `repo`
+        when one is named - never to a tracked repo picked as a fallback.
+        """
+        if repo:
+            root = self.git.resolve(repo)
+            if root is None:
+                return (False, f"I couldn't find a repository called {repo}, sir.")
+        else:
+            root = find_repo_root(Path.cwd())
+            if root is None:
+                return (False, "The current directory is not a git repository, sir.")
+        try:
+            return self._run_git_command(command, cwd=root)
+        finally:
+            self.git.invalidate()
+    
+    def git_status(self, repo: Optional[str] = None) -> Tuple[bool, str]:
         """Get git status."""
-        return self._run_git_command(["git", "status", "--short"])
+        try:
+            return (True, self.git.status(repo).summary())
+        except (RuntimeError, OSError, subprocess.SubprocessError) as e:
+            return (False, f"Could not read git status: {e}")
     
-    def git_add_all(self) -> Tuple[bool, str]:
+    def git_add_all(self, repo: Optional[str] = None) -> Tuple[bool, str]:
         """Stage all changes."""
-        return self._run_git_command(["git", "add", "-A"])
+        return self._run_git_write(["git", "add", "-A"], repo)
     
-    def git_commit(self, message: str) -> Tuple[bool, str]:
+    def git_commit(self, message: str, repo: Optional[str] = None) -> Tuple[bool, str]:
         """Commit staged changes."""
-        return self._run_git_command(["git", "commit", "-m", message])
+        return self._run_git_write(["git", "commit", "-m", message], repo)
     
-    def git_push(self) -> Tuple[bool, str]:
+    def git_push(self, repo: Optional[str] = None) -> Tuple[bool, str]:
         """Push to remote."""
-        return self._run_git_command(["git", "push"])
+        return self._run_git_write(["git", "push"], repo)
     
-    def git_pull(self) -> Tuple[bool, str]:
+    def git_pull(self, repo: Optional[str] = None) -> Tuple[bool, str]:
         """Pull from remote."""
-        return self._run_git_command(["git", "pull"])
+        return self._run_git_write(["git", "pull"], repo)
     
-    def git_branch(self) -> Tuple[bool, str]:
+    def git_branch(self, repo: Optional[str] = None) -> Tuple[bool, str]:
         """List branches."""
-        return self._run_git_command(["git", "branch"])
+        try:
+            names, current = self.git.branches(repo)
+        except (RuntimeError, OSError) as e:
+            return (False, f"Could not list branches: {e}")
+        if not names:
+            return (True, "No branches yet, sir.")
+        return (True, "\n".join(f"{'*' if name == current else ' '} {name}" for name in names))
     
-    def quick_commit_push(self, message: str) -> Tuple[bool, str]:
+    def quick_commit_push(self, message: str, repo: Optional[str] = None) -> Tuple[bool, str]:
         """
         Quick workflow: add all, commit, push.
         
+        Args:
+            repo: Tracked repo name or path; default is the working directory's repo
+        
         Returns:
             (success: bool, message: str)
         """
         # Add all
-        success, msg = self.git_add_all()
+        success, msg = self.git_add_all(repo)
         if not success:
             return (False, f"Could not stage changes: {msg}")
         
         # Commit
-        success, msg = self.git_commit(message)
+        success, msg = self.git_commit(message, repo)
         if not success:
             return (False, f"Could not commit: {msg}")
         
         # Push
-        success, msg = self.git_push()
+        success, msg = self.git_push(repo)
         if not success:
             return (False, f"Could not push: {msg}")
         
@@ -0,0 +1,243 @@
+"""
+HTML Text Extraction
+Streaming HTML-to-text for research sources, built on the stdlib tokenizer
+instead of a full BeautifulSoup tree.
+
+- Input is fed in chunks and parsing stops once the character budget is met;
+  a TextStream does this while the page downloads, so the rest of the body
+  is never fetched
+- Navigation, sidebars, comments and other boilerplate subtrees are skipped
+- Link-heavy and very short blocks (menus, tag clouds, share bars) are dropped
+- When the page marks its main content (<article>, <main>, role="main" or a
+  content-like class/id), only that content is returned
+"""
+
+import codecs
+import re
+from html.parser import HTMLParser
+from typing import Iterable, List, Mapping, Optional
+
+from src.config.config import Config
+
+# Subtrees never worth reading
+SKIP_TAGS = {
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe", "object",
+    "nav", "header", "footer", "aside", "form", "button", "select", "textarea",
+}
+
+# Elements whose boundaries end a block of text
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "li", "ul", "ol", "dl", "dt", "dd",
+    "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre", "table", "tr", "td", "th",
+    "figure", "figcaption", "body", "br", "hr",
+}
+
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+    "param", "source", "track", "wbr",
+}
+
+BOILERPLATE_HINTS = re.compile(
+    r"nav|menu|footer|sidebar|comment|share|social|cookie|banner|breadcrumb|"
+    r"related|promo|advert|\bads?\b|subscribe|newsletter|signup|popup|modal",
+    re.I,
+)
+CONTENT_HINTS = re.compile(r"article|content|post|entry|story|main|body-text", re.I)
+CHARSET_META = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.I)
+
+MIN_BLOCK_CHARS = 25  # Shorter non-heading blocks are usually UI chrome
+MAX_LINK_DENSITY = 0.5  # Blocks mostly made of link text are menus
+CHUNK_BYTES = 16384
+
+
+class _Frame:
+    """State inherited by everything inside an open element."""
+
+    __slots__ = ("tag", "skip", "main", "link")
+
+    def __init__(self, tag: str, skip: bool, main: bool, link: bool):
+        self.tag = tag
+        self.skip = skip
+        self.main = main
+        self.link = link
+
+
+class TextExtractor(HTMLParser):
+    """Incremental extractor; feed() chunks until `done`, then read `text()`."""
+
+    def __init__(self, max_chars: int = Config.RESEARCH_MAX_CHARS):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self._stack: List[_Frame] = [_Frame("", False, False, False)]
+        self._parts: List[str] = []
+        self._link_chars = 0
+        self._block_main = False
+        self._main_blocks: List[str] = []
+        self._other_blocks: List[str] = []
+        self._main_chars = 0
+        self._other_chars = 0
+        self.done = False
+
+    def _flush(self):
+        if not self._parts:
+            return
+        text = " ".join("".join(self._parts).split())
+        link_chars, in_main = self._link_chars, self._block_main
+        self._parts, self._link_chars = [], 0
+        if not text:
+            return
+        heading = self._stack[-1].tag in HEADING_TAGS
+        if len(text) < MIN_BLOCK_CHARS and not heading:
+            return
+        if link_chars / len(text) > MAX_LINK_DENSITY:
+            return
+        if in_main:
+            self._main_blocks.append(text)
+            self._main_chars += len(text) + 1
+        else:
+            self._other_blocks.append(text)
+            self._other_chars += len(text) + 1
+        # Once main content exists it wins, so only its size counts towards the budget
+        if (self._main_chars if self._main_blocks else self._other_chars) >= self.max_chars:
+            self.done = True
+
+    def handle_starttag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self._flush()
+        if tag in VOID_TAGS:
+            return
+        top = self._stack[-1]
+        skip, main = top.skip, top.main
+        if not skip:
+            attributes = dict(attrs)
+            hints = f"{attributes.get('id') or ''} {attributes.get('class') or ''}".strip()
+            if tag in ("html", "body"):
+                hints = ""  # Page-wide classes say nothing about any one block
+            role = attributes.get("role") or ""
+            if tag in SKIP_TAGS or role in ("navigation", "banner", "contentinfo", "complementary"):
+                skip = True
+            elif tag in ("article", "main") or role == "main":
+                main = True
+            elif hints and BOILERPLATE_HINTS.search(hints):
+                skip = True
+            elif hints and CONTENT_HINTS.search(hints):
+                main = True
+        self._stack.append(_Frame(tag, skip, main, top.link or tag == "a"))
+
+    def handle_endtag(self, tag):
+        # Pop to the matching element; unmatched end tags are ignored
+        for i in range(len(self._stack) - 1, 0, -1):
+            if self._stack[i].tag == tag:
+                if tag in BLOCK_TAGS:
+                    self._flush()
+                del self._stack[i:]
+                return
+
+    def handle_data(self, data):
+        top = self._stack[-1]
+        if top.skip or self.done:
+            return
+        if not self._parts:
+            self._block_main = top.main
+        self._parts.append(data)
+        if top.link:
+            self._link_chars += len(data.strip())
+
+    def close(self):
+        super().close()
+        self._flush()
+
+    def text(self) -> str:
+        blocks = self._main_blocks or self._other_blocks
+        return "\n".join(blocks)[:self.max_chars]
+
+
+def sniff_encoding(head: bytes, content_type: Optional[str] = None) -> str:
+    """Charset from the Content-Type header or a <meta> tag, defaulting to UTF-8."""
+    if content_type and "charset=" in content_type.lower():
+        candidate = content_type.lower().split("charset=")[-1].split(";")[0].strip(" \"'")
+    else:
+        match = CHARSET_META.search(head[:4096])
+        candidate = match.group(1).decode("ascii", "ignore").lower() if match else "utf-8"
+    try:
+        return codecs.lookup(candidate).name
+    except LookupError:
+        return "utf-8"
+
+
+class TextStream:
+    """
+    Text extraction fed with raw body chunks as they download.
+
+    Works as a body sink for read_body: begin() gets the response headers,
+    feed() each chunk and returns True once the budget is filled (`done`),
+    which ends the download.
+    """
+
+    def __init__(self, max_chars: int = Config.RESEARCH_MAX_CHARS, encoding: Optional[str] = None):
+        """
+        Args:
+            max_chars: Character budget
+            encoding: Document encoding. None = from the Content-Type header or the first chunk.
+        """
+        self.encoding = encoding
+        self.content_type: Optional[str] = None
+        self.started = False
+        self._extractor = TextExtractor(max_chars)
+        self._decoder = None
+        self._closed = False
+
+    def begin(self, headers: Mapping[str, str]):
+        self.started = True
+        self.content_type = headers.get("Content-Type")
+
+    @property
+    def done(self) -> bool:
+        """True once the budget is filled."""
+        return self._extractor.done
+
+    def feed(self, chunk: bytes) -> bool:
+        """Parse one chunk; True once no more input is needed."""
+        if self._decoder is None:
+            encoding = self.encoding or sniff_encoding(chunk, self.content_type)
+            self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        if not self._extractor.done:
+            self._extractor.feed(self._decoder.decode(chunk))
+        return self._extractor.done
+
+    def text(self) -> str:
+        """Up to max_chars of text, one block per line."""
+        if not self._closed:
+            self._extractor.close()
+            self._closed = True
+        return self._extractor.text()
+
+
+def extract_text(chunks: Iterable[bytes], max_chars: int = Config.RESEARCH_MAX_CHARS,
+                 encoding: Optional[str] = None) -> str:
+    """
+    Extract readable main-content text from a stream of HTML bytes.
+
+    Args:
+        chunks: Raw HTML, in order (e.g. response.iter_content())
+        max_chars: Character budget; parsing stops once it is filled
+        encoding: Document encoding. None = sniff from the first chunk.
+
+    Returns:
+        Up to max_chars of text, one block per line
+    """
+    stream = TextStream(max_chars, encoding)
+    for chunk in chunks:
+        if stream.feed(chunk):
+            break
+    return stream.text()
+
+
+def html_to_text(content: bytes, max_chars: int = Config.RESEARCH_MAX_CHARS,
+                 content_type: Optional[str] = None) -> str:
+    """Extract text from an already-downloaded document, parsing only as much as needed."""
+    encoding = sniff_encoding(content[:4096], content_type)
+    chunks = (content[i:i + CHUNK_BYTES] for i in range(0, len(content), CHUNK_BYTES))
+    return extract_text(chunks, max_chars, encoding)
@@ -0,0 +1,369 @@
+"""
+HTTP Cache
+On-disk response cache shared by research and the morning briefing.
+
+- Freshness from Cache-Control (max-age, no-cache, no-store) or Expires,
+  with a Last-Modified heuristic when neither is given
+- Stale entries are revalidated with If-None-Match / If-Modified-Since
+- Per-host TTL overrides (Config.HTTP_CACHE_TTLS), or a TTL per request
+- Least-recently-used eviction once the store exceeds its byte budget;
+  access times are kept in memory and written with the next store,
+  eviction or flush, so cache hits never write to disk
+- Entries are keyed on the URL plus the request headers that change the
+  response (Accept, Accept-Language, Authorization)
+- Offline: stale entries are served when the network is unreachable or
+  the server fails (5xx), or always when JARVIS_OFFLINE is set
+- A body a sink stopped reading early (e.g. once a research page has
+  enough text) is stored marked partial, and only served to callers
+  that read with a sink
+"""
+
+import hashlib
+import json
+import threading
+import time
+import weakref
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from src.config.config import Config
+
+# Request headers that select a different representation of the same URL
+KEY_HEADERS = ("Accept", "Accept-Language", "Authorization")
+
+
+class CachedResponse:
+    """Minimal response object, from the network or the cache."""
+
+    def __init__(self, url: str, status_code: int, content: bytes, headers: Dict[str, str], cache_status: str,
+                 partial: bool = False):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = CaseInsensitiveDict(headers)
+        self.cache_status = cache_status  # miss, fresh, revalidated, stale, uncacheable
+        self.partial = partial  # Only the start of the body, as far as a sink read it
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} for {self.url}")
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def cache_directives(headers) -> Dict[str, Optional[str]]:
+    """Parsed Cache-Control header, e.g. {"max-age": "60", "no-cache": None}."""
+    directives = {}
+    for part in CaseInsensitiveDict(headers).get("Cache-Control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+    return directives
+
+
+def read_body(response: requests.Response, max_bytes: Optional[int] = None, sink=None) -> Tuple[bytes, bool]:
+    """
+    Read a response body, stopping at max_bytes for streamed responses.
+
+    Args:
+        sink: Optional consumer of a 200 body as it arrives: begin(headers) is
+              called first, then feed(chunk) per chunk; feed returning True
+              stops the download and sets the sink's `done`
+              (e.g. html_text.TextStream)
+
+    Returns:
+        (content, truncated)
+    """
+    if sink is not None and response.status_code == 200:
+        sink.begin(response.headers)
+    else:
+        sink = None
+    if max_bytes is None and sink is None:
+        return response.content, False
+    chunks, size = [], 0
+    try:
+        for chunk in response.iter_content(chunk_size=16384):
+            chunks.append(chunk)
+            size += len(chunk)
+            if sink is not None and sink.feed(chunk):
+                break
+            if max_bytes is not None and size > max_bytes:
+                break
+        else:
+            return b"".join(chunks), False
+    finally:
+        response.close()  # Drops the connection instead of draining the rest of the body
+    return b"".join(chunks)[:max_bytes], True
+
+
+class HttpCache:
+    """Disk-backed HTTP cache with conditional revalidation and LRU eviction."""
+
+    HEURISTIC_FRACTION = 0.1  # Of the Last-Modified age, per RFC 9111 4.2.2
+    HEURISTIC_MAX = 86400
+
+    def __init__(self, cache_dir: Path = Config.HTTP_CACHE_DIR, max_bytes: int = Config.HTTP_CACHE_MAX_BYTES,
+                 ttl_overrides: Optional[Dict[str, float]] = None, offline: bool = Config.OFFLINE):
+        """
+        Args:
+            cache_dir: Directory for bodies and the index
+            max_bytes: Total body size kept before LRU eviction
+            ttl_overrides: Host (or parent domain) -> freshness seconds, overriding headers
+            offline: Never touch the network; serve whatever is cached
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.ttl_overrides = Config.HTTP_CACHE_TTLS if ttl_overrides is None else ttl_overrides
+        self.offline = offline
+        self.index_path = self.cache_dir / "index.json"
+        self._lock = threading.Lock()
+        self._index: Dict[str, dict] = self._load_index()
+        self._dirty = False  # Access times not yet written
+        _caches.add(self)
+
+    def _load_index(self) -> Dict[str, dict]:
+        try:
+            with open(self.index_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self._index, f)
+        tmp.replace(self.index_path)
+        self._dirty = False
+
+    def flush(self):
+        """Write access times recorded by cache hits since the last save."""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    @staticmethod
+    def _key(url: str, headers: Optional[Mapping[str, str]] = None) -> str:
+        headers = CaseInsensitiveDict(headers or {})
+        varying = [f"{name}: {headers[name]}" for name in KEY_HEADERS
+                   if headers.get(name) and not (name == "Accept" and headers[name] == "*/*")]  # requests' default
+        # Only a hash is stored, so credentials never reach the index
+        return hashlib.sha256("\n".join([url, *varying]).encode()).hexdigest()
+
+    def _body_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.body"
+
+    def _ttl_override(self, url: str) -> Optional[float]:
+        host = urlsplit(url).hostname or ""
+        for domain, ttl in self.ttl_overrides.items():
+            if host == domain or host.endswith("." + domain):
+                return ttl
+        return None
+
+    def _freshness(self, url: str, headers, now: float, ttl: Optional[float] = None) -> float:
+        """Seconds a response stays fresh."""
+        override = self._ttl_override(url) if ttl is None else ttl
+        if override is not None:
+            return override
+        headers = CaseInsensitiveDict(headers)
+        directives = cache_directives(headers)
+        if "no-cache" in directives:
+            return 0
+        if directives.get("max-age", "").isdigit():
+            return int(directives["max-age"]) - int(headers.get("Age", "0") or 0)
+        expires = _parse_http_date(headers.get("Expires"))
+        if expires is not None:
+            return expires - (_parse_http_date(headers.get("Date")) or now)
+        last_modified = _parse_http_date(headers.get("Last-Modified"))
+        if last_modified is not None:
+            return min(self.HEURISTIC_MAX, (now - last_modified) * self.HEURISTIC_FRACTION)
+        return 0
+
+    def _lookup(self, key: str, allow_partial: bool = False) -> Optional[dict]:
+        entry = self._index.get(key)
+        if entry and not self._body_path(key).exists():
+            self._index.pop(key, None)
+            return None
+        if entry and entry.get("partial") and not allow_partial:
+            return None
+        return entry
+
+    def _read(self, key: str, entry: dict, cache_status: str) -> CachedResponse:
+        entry["last_access"] = time.time()
+        self._dirty = True
+        content = self._body_path(key).read_bytes()
+        return CachedResponse(entry["url"], entry["status"], content, entry["headers"], cache_status,
+                              entry.get("partial", False))
+
+    def _store(self, key: str, url: str, response, content: bytes, now: float, ttl: Optional[float] = None,
+               partial: bool = False):
+        if "no-store" in cache_directives(response.headers):
+            return
+        body_path = self._body_path(key)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = body_path.with_suffix(".tmp")
+        tmp.write_bytes(content)
+        tmp.replace(body_path)
+        headers = dict(response.headers)
+        self._index[key] = {
+            "url": url,
+            "status": response.status_code,
+            "headers": headers,
+            "size": len(content),
+            "expires_at": now + self._freshness(url, response.headers, now, ttl),
+            "last_access": now,
+            "partial": partial,
+        }
+        self._evict()
+
+    def _evict(self):
+        total = sum(entry["size"] for entry in self._index.values())
+        for key in sorted(self._index, key=lambda k: self._index[k]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            total -= self._index.pop(key)["size"]
+            self._body_path(key).unlink(missing_ok=True)
+
+    def peek(self, url: str, headers: Optional[Mapping[str, str]] = None,
+             allow_stale: bool = False, allow_partial: bool = False) -> Optional[CachedResponse]:
+        """
+        The cached response if it is still fresh (or offline), without any network access.
+
+        Args:
+            headers: Request headers the response would be fetched with (session defaults included)
+            allow_stale: Also return an expired entry (cache_status "stale")
+            allow_partial: Also return a body a sink stopped reading early
+        """
+        key = self._key(url, headers)
+        now = time.time()
+        with self._lock:
+            entry = self._lookup(key, allow_partial)
+            if entry and (now < entry["expires_at"] or self.offline or allow_stale):
+                return self._read(key, entry, "fresh" if now < entry["expires_at"] else "stale")
+        return None
+
+    def get(self, session: requests.Session, url: str, timeout: float = 5,
+            max_bytes: Optional[int] = None, ttl: Optional[float] = None, sink=None, **kwargs) -> CachedResponse:
+        """
+        GET through the cache.
+
+        Args:
+            max_bytes: Stop downloading after this many body bytes. Truncated
+                       bodies are returned but never stored.
+            ttl: Seconds the response stays fresh, overriding headers and host TTLs
+            sink: Fed a downloaded body as it arrives (see read_body); not used
+                  for responses served from the cache. A body it cut short is
+                  stored marked partial, and partial entries can be returned.
+
+        Raises:
+            requests.RequestException: network failure with nothing cached
+        """
+        headers = dict(kwargs.pop("headers", None) or {})
+        request_headers = {**session.headers, **headers}
+        key = self._key(url, request_headers)
+        partial_ok = sink is not None
+        cached = self.peek(url, request_headers, allow_partial=partial_ok)
+        if cached:
+            return cached
+        if self.offline:
+            raise requests.ConnectionError(f"Offline and {url} is not cached")
+
+        with self._lock:
+            entry = self._lookup(key, partial_ok)
+        if entry:
+            validators = CaseInsensitiveDict(entry["headers"])
+            if validators.get("ETag"):
+                headers["If-None-Match"] = validators["ETag"]
+            if validators.get("Last-Modified"):
+                headers["If-Modified-Since"] = validators["Last-Modified"]
+
+        try:
+            response = session.get(url, timeout=timeout, headers=headers,
+                                   stream=max_bytes is not None or sink is not None, **kwargs)
+            content, truncated = read_body(response, max_bytes, sink)
+        except requests.RequestException:
+            with self._lock:
+                entry = self._lookup(key, partial_ok)
+                if entry:
+                    return self._read(key, entry, "stale")
+            raise
+
+        now = time.time()
+        with self._lock:
+            if response.status_code >= 500 and self._lookup(key, partial_ok):
+                return self._read(key, self._index[key], "stale")
+            if response.status_code == 304 and self._lookup(key, partial_ok):
+                entry = self._index[key]
+                headers = CaseInsensitiveDict(entry["headers"])
+                for name in ("Cache-Control", "Expires", "Date", "ETag", "Last-Modified"):
+                    if name in response.headers:
+                        headers[name] = response.headers[name]
+                entry["headers"] = dict(headers)
+                entry["expires_at"] = now + self._freshness(url, entry["headers"], now, ttl)
+                cached = self._read(key, entry, "revalidated")
+                self._save_index()
+                return cached
+            # Cut short by the sink: the part it read is all a sink reader needs next time
+            partial = truncated and sink is not None and sink.done
+            if response.status_code == 200 and (not truncated or partial):
+                self._store(key, url, response, content, now, ttl, partial)
+                self._save_index()
+                status = "miss" if key in self._index else "uncacheable"
+            else:
+                status = "uncacheable"
+        return CachedResponse(url, response.status_code, content, dict(response.headers), status, partial)
+
+    def invalidate(self, url: str, headers: Optional[Mapping[str, str]] = None):
+        """Mark a cached response stale, so the next get revalidates it (after a write)."""
+        with self._lock:
+            entry = self._lookup(self._key(url, headers))
+            if entry:
+                entry["expires_at"] = 0
+                self._save_index()
+
+    def clear(self):
+        """Drop every cached entry."""
+        with self._lock:
+            for key in list(self._index):
+                self._body_path(key).unlink(missing_ok=True)
+            self._index = {}
+            self._save_index()
+
+
+_cache: Optional[HttpCache] = None
+_cache_lock = threading.Lock()
+_caches: "weakref.WeakSet[HttpCache]" = weakref.WeakSet()
+
+
+def get_http_cache() -> HttpCache:
+    """Process-wide shared cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = HttpCache()
+        return _cache
+
+
+def flush_http_caches():
+    """Write pending access times of every open cache (on shutdown)."""
+    for cache in list(_caches):
+        cache.flush()
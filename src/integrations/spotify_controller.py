@@ -5,9 +5,10 @@ Spotify Controller Module
 - Get current track information
 """
 
-import subprocess
-import time
 from typing import Optional
+
+from src.core.script_runner import run_applescript
+from src.core.wait import wait_until
 from .element_finder import AccessibilityHelper
 
 
@@ -21,6 +22,10 @@ class SpotifyController:
     def open_spotify(self) -> bool:
         """Open Spotify application."""
         try:
+            # Already running: just bring it forward, no relaunch or wait
+            if self.mac_control.is_app_running("Spotify"):
+                return self.accessibility.activate_app("Spotify")
+            
             self.mac_control.open_app("Spotify")
             return self.accessibility.wait_for_app("Spotify", timeout=3)
         except Exception as e:
@@ -34,32 +39,29 @@ class SpotifyController:
         Uses Spotlight URL scheme to play individual track, preventing playlist auto-play.
         """
         try:
+            # Returns once Spotify is frontmost with a window
             if not self.open_spotify():
                 return False
             
-            time.sleep(0.5)
-            self.accessibility.activate_app("Spotify")
-            time.sleep(0.5)
-            
             # Method 1: Use Spotify's search and play directly via AppleScript
             # This plays the song individually, not in a playlist context
+            escaped_query = query.replace('"', '\\"')
             script = f'''
             tell application "Spotify"
                 activate
                 
                 -- Play the track by searching
-                play track "spotify:search:{query.replace('"', '\\"')}"
+                play track "spotify:search:{escaped_query}"
             end tell
             '''
             
-            try:
-                subprocess.run(['osascript', '-e', script], timeout=5, check=True)
-                time.sleep(1)
+            if run_applescript(script, timeout=5):
+                wait_until(lambda: self.get_player_state() == "playing", timeout=3)
                 return True
-            except:
-                # Fallback to UI navigation method
-                print("Direct play failed, trying UI navigation...")
-                return self._ui_search_and_play(query)
+            
+            # Fallback to UI navigation method
+            print("Direct play failed, trying UI navigation...")
+            return self._ui_search_and_play(query)
             
         except Exception as e:
             print(f"Spotify search error: {e}")
@@ -71,23 +73,23 @@ class SpotifyController:
         Tries to select from Songs section to avoid playlist context.
         """
         try:
-            # Type the query character by character with delay to ensure it all gets typed
             escaped_query = query.replace('"', '\\"')
             
+            # Open search with Cmd+K and wait for the search field to take focus
+            self.accessibility.key_combination("k", ["command"])
+            if not self.accessibility.wait_for_text_input("Spotify", timeout=3):
+                print("UI navigation error: Spotify search field never focused")
+                return False
+            
+            # Search results have no readiness signal, so their render delays stay
             script = f'''
             tell application "System Events"
                 tell process "Spotify"
-                    -- Open search with Cmd+K
-                    keystroke "k" using command down
-                    delay 1.0
-                    
                     -- Clear any existing search
                     keystroke "a" using command down
-                    delay 0.2
                     key code 51
-                    delay 0.3
                     
-                    -- Type the search query slowly
+                    -- Type the search query
                     keystroke "{escaped_query}"
                     delay 2.0
                     
@@ -110,7 +112,12 @@ class SpotifyController:
             end tell
             '''
             
-            subprocess.run(['osascript', '-e', script], timeout=15, check=True)
+            result = run_applescript(script, timeout=15)
+            if not result:
+                print(f"UI navigation error: {result.error}")
+                return False
+            
+            wait_until(lambda: self.get_player_state() == "playing", timeout=3)
             return True
             
         except Exception as e:
@@ -121,8 +128,7 @@ class SpotifyController:
         """Pause current playback."""
         try:
             script = 'tell application "Spotify" to pause'
-            subprocess.run(['osascript', '-e', script], timeout=1)
-            return True
+            return run_applescript(script, timeout=1).ok
         except:
             return False
     
@@ -130,8 +136,7 @@ class SpotifyController:
         """Resume playback."""
         try:
             script = 'tell application "Spotify" to play'
-            subprocess.run(['osascript', '-e', script], timeout=1)
-            return True
+            return run_applescript(script, timeout=1).ok
         except:
             return False
     
@@ -139,8 +144,7 @@ class SpotifyController:
         """Skip to next track."""
         try:
             script = 'tell application "Spotify" to next track'
-            subprocess.run(['osascript', '-e', script], timeout=1)
-            return True
+            return run_applescript(script, timeout=1).ok
         except:
             return False
     
@@ -148,11 +152,15 @@ class SpotifyController:
         """Go to previous track."""
         try:
             script = 'tell application "Spotify" to previous track'
-            subprocess.run(['osascript', '-e', script], timeout=1)
-            return True
+            return run_applescript(script, timeout=1).ok
         except:
             return False
     
+    def get_player_state(self) -> str:
+        """Player state: "playing", "paused" or "stopped" ("" if unavailable)."""
+        result = run_applescript('tell application "Spotify" to player state as string', timeout=2)
+        return result.output.strip()
+    
     def get_current_track(self) -> Optional[str]:
         """Get currently playing track info."""
         try:
@@ -165,13 +173,8 @@ class SpotifyController:
             end tell
             '''
             
-            result = subprocess.run(
-                ['osascript', '-e', script],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
+            result = run_applescript(script, timeout=2)
             
-            return result.stdout.strip() if result.stdout else None
+            return result.output.strip() if result.output else None
         except:
             return None
@@ -1,9 +1,9 @@
-
-import requests
-from bs4 import BeautifulSoup
 from googlesearch import search
-from typing import List, Dict
-import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from src.config.config import Config
+from src.integrations.fetcher import ConcurrentFetcher, FetchResult
+from src.integrations.html_text import TextStream, html_to_text
+from src.integrations.http_cache import get_http_cache
 
 class WebScraper:
     """Handles deep internet research without opening a browser."""
@@ -12,6 +12,7 @@ class WebScraper:
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36'
         }
+        self.fetcher = ConcurrentFetcher(headers=self.headers, cache=get_http_cache())
 
     def search_google(self, query: str, num_results: int = 5) -> List[str]:
         """Get top URLs for a query."""
@@ -24,38 +25,57 @@ class WebScraper:
             print(f"Search error: {e}")
         return results
 
+    @staticmethod
+    def html_to_text(content: bytes, content_type: Optional[str] = None) -> str:
+        """Extract main content text from an HTML document."""
+        return html_to_text(content, Config.RESEARCH_MAX_CHARS, content_type)
+
+    @staticmethod
+    def _text_stream() -> TextStream:
+        """Extracts while downloading and ends the download once RESEARCH_MAX_CHARS is reached."""
+        return TextStream(Config.RESEARCH_MAX_CHARS)
+
+    def _page_text(self, result: FetchResult) -> str:
+        if result.sink is not None:
+            return result.sink.text()
+        # Served from the cache
+        return self.html_to_text(result.content, result.headers.get("Content-Type"))
+
     def extract_text(self, url: str) -> str:
         """Extract main content text from a URL."""
+        result = self.fetcher.fetch(url, sink=self._text_stream())
+        if not result.ok:
+            return f"Error reading {url}: {result.error or f'HTTP {result.status}'}"
         try:
-            response = requests.get(url, headers=self.headers, timeout=5)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove scripts and styles
-            for script in soup(["script", "style", "nav", "footer", "header"]):
-                script.decompose()
-                
-            text = soup.get_text()
-            
-            # Clean text
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            clean_text = ' '.join(chunk for chunk in chunks if chunk)
-            
-            return clean_text[:5000] # Limit content length
-            
+            return self._page_text(result)
         except Exception as e:
             return f"Error reading {url}: {e}"
 
-    def research_topic(self, topic: str, num_sources: int = 3) -> Dict[str, str]:
-        """Search and extract text from multiple sources."""
+    def iter_sources(self, topic: str, num_sources: int = 3,
+                     deadline: Optional[float] = Config.RESEARCH_DEADLINE,
+                     exclude: Iterable[str] = ()) -> Iterator[Tuple[str, str]]:
+        """
+        Search and extract sources concurrently.
+        
+        Args:
+            exclude: URLs already read (e.g. for an earlier report); only new sources are fetched
+        
+        Yields:
+            (url, text) as each source finishes downloading and extracting
+        """
         print(f"🔎 Searching for: {topic}...")
-        urls = self.search_google(topic, num_results=num_sources)
+        exclude = set(exclude)
+        urls = self.search_google(topic, num_results=num_sources + len(exclude))
+        urls = [url for url in urls if url not in exclude][:num_sources]
         
-        results = {}
-        for i, url in enumerate(urls, 1):
-            print(f"   📄 Reading source {i}/{len(urls)}: {url[:50]}...")
-            text = self.extract_text(url)
-            results[url] = text
-            time.sleep(1) # Be polite
-            
-        return results
+        for i, result in enumerate(self.fetcher.fetch_all(urls, deadline=deadline, process=self._page_text,
+                                                                  sink=self._text_stream), 1):
+            if result.ok:
+                print(f"   📄 Read source {i}/{len(urls)} in {result.elapsed:.1f}s: {result.url[:50]}...")
+                yield result.url, result.data
+            else:
+                print(f"   ⚠️ Skipped source {i}/{len(urls)}: {result.url[:50]} ({result.error or f'HTTP {result.status}'})")
+
+    def research_topic(self, topic: str, num_sources: int = 3) -> Dict[str, str]:
+        """Search and extract text from multiple sources."""
+        return dict(self.iter_sources(topic, num_sources))
@@ -0,0 +1,141 @@
+"""
+Test fuzzy app-name resolution against a scanned catalog
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.app_catalog import AppCatalog
+from src.core.desktop import FakeBackend
+from src.core.mac_control import MacController
+
+APPS = ["Spotify", "Visual Studio Code", "Google Chrome", "Safari", "Notion", "Slack", "Calculator", "Calendar"]
+
+
+def make_install_dir(names=APPS):
+    directory = Path(tempfile.mkdtemp())
+    for name in names:
+        (directory / f"{name}.app").mkdir()
+    return directory
+
+
+def make_catalog(directory, cache_path=None):
+    return AppCatalog(cache_path=cache_path, app_dirs=[directory], aliases=MacController.APP_MAPPINGS)
+
+
+def test_fuzzy_resolution():
+    """Typos and partial names resolve to installed apps"""
+    print("Testing fuzzy resolution...")
+    catalog = make_catalog(make_install_dir())
+    assert catalog.resolve("spotfy") == "Spotify"
+    assert catalog.resolve("vs cod") == "Visual Studio Code"
+    assert catalog.resolve("google chrom") == "Google Chrome"
+    assert catalog.resolve("calculater") == "Calculator"
+    assert catalog.resolve("slak") == "Slack"
+    assert catalog.resolve("photoshop") is None
+    print("✅ Fuzzy resolution tests passed\n")
+
+
+def test_resolution_is_fast():
+    """Lookups stay well under a millisecond"""
+    print("Testing lookup latency...")
+    names = APPS + [f"Utility App {i}" for i in range(500)]
+    catalog = make_catalog(make_install_dir(names))
+    catalog.resolve("warmup")
+
+    queries = ["spotfy", "vs cod", "notoin", "utlity app 42"] * 250
+    start = time.perf_counter()
+    for query in queries:
+        catalog.resolve(query)
+    per_lookup = (time.perf_counter() - start) / len(queries)
+    print(f"  {per_lookup * 1e6:.0f} µs per lookup over {len(names)} apps")
+    assert per_lookup < 0.001
+    print("✅ Latency tests passed\n")
+
+
+def test_disk_cache_and_incremental_refresh():
+    """The scan is cached and only changed directories are rescanned"""
+    print("Testing catalog cache...")
+    directory = make_install_dir()
+    cache_path = Path(tempfile.mkdtemp()) / "app_catalog.json"
+    make_catalog(directory, cache_path).resolve("safari")
+    assert "Spotify" in json.loads(cache_path.read_text())["dirs"][str(directory)]["apps"]
+
+    # A fresh catalog trusts the cache while the directory is unchanged
+    cached = json.loads(cache_path.read_text())
+    cached["dirs"][str(directory)]["apps"].append("Only In Cache")
+    cache_path.write_text(json.dumps(cached))
+    catalog = make_catalog(directory, cache_path)
+    assert "Only In Cache" in catalog.apps
+
+    # Installing an app bumps the mtime; a miss triggers the rescan
+    (directory / "Obsidian.app").mkdir()
+    os.utime(directory, (time.time() + 5, time.time() + 5))
+    assert catalog.resolve("obsidan") == "Obsidian"
+    assert "Only In Cache" not in catalog.apps
+    print("✅ Catalog cache tests passed\n")
+
+
+def test_controller_launches_resolved_name():
+    """MacController resolves before launching"""
+    print("Testing MacController resolution...")
+    backend = FakeBackend()
+    mac = MacController(backend=backend, catalog=make_catalog(make_install_dir()))
+    assert mac.open_app("spotfy") == (True, "Opened Spotify, sir.")
+    assert mac.open_app("vs code")[0]
+    assert backend.calls == [("open_app", "Spotify"), ("open_app", "Visual Studio Code")]
+    print("✅ MacController resolution tests passed\n")
+
+
+def test_near_misses_rejected():
+    """Short or different names don't fuzzy-match a similar-looking app"""
+    print("Testing near-miss queries...")
+    catalog = make_catalog(make_install_dir(APPS + ["Terminal", "Photos", "Obsidian"]))
+    assert catalog.resolve("teams") is None
+    assert catalog.resolve("photoshop") is None
+    assert catalog.resolve("obs") is None
+    assert catalog.resolve("obsidan") == "Obsidian"  # Real typos still resolve
+    assert catalog.exact("obsidian") == "Obsidian"
+    assert catalog.exact("obsidan") is None
+    print("✅ Near-miss tests passed\n")
+
+
+def test_close_requires_exact_name():
+    """close_app never acts on a fuzzy guess"""
+    print("Testing exact names for close...")
+    backend = FakeBackend()
+    mac = MacController(backend=backend, catalog=make_catalog(make_install_dir(APPS + ["Terminal", "Photos"])))
+    mac.open_app("Terminal")
+    mac.open_app("Photos")
+    for query in ["teams", "photoshop", "termnal"]:
+        assert not mac.close_app(query)[0]
+    assert ("close_app", "Terminal") not in backend.calls and ("close_app", "Photos") not in backend.calls
+    assert ("close_app", "teams") in backend.calls  # Passed through unchanged
+    assert mac.close_app("term") == (True, "Closed Terminal, sir.")
+    assert mac.close_app("photos") == (True, "Closed Photos, sir.")
+    print("✅ Exact close tests passed\n")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("App Catalog Tests")
+    print("=" * 50 + "\n")
+
+    test_fuzzy_resolution()
+    test_resolution_is_fast()
+    test_disk_cache_and_incremental_refresh()
+    test_controller_launches_resolved_name()
+    test_near_misses_rejected()
+    test_close_requires_exact_name()
+
+    print("=" * 50)
+    print("All tests passed! ✅")
+    print("=" * 50)
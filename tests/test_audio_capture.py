@@ -0,0 +1,132 @@
+"""
+Test the capture ring buffer, chunk energies and wake pre-roll
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.audio_capture import AudioRingBuffer, ContinuousCapture, chunk_energies
+from src.core.simple_wake import SimplePushToTalk
+
+
+class ScriptedCapture(ContinuousCapture):
+    """Capture fed from a list of sample blocks instead of a microphone."""
+
+    def __init__(self, blocks, **kwargs):
+        super().__init__(pa=object(), **kwargs)
+        self.blocks = blocks
+
+    def start(self):
+        if self.is_running():
+            return
+        self._running.set()
+
+        def feed():
+            for block in self.blocks:
+                time.sleep(0.005)
+                self.buffer.write(block)
+
+        self._thread = threading.Thread(target=feed, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running.clear()
+
+
+def test_ring_wraparound():
+    """Reads across the wrap point return samples in order"""
+    print("Testing ring wraparound...")
+    ring = AudioRingBuffer(10)
+    ring.write(np.arange(7, dtype=np.int16))
+    ring.write(np.arange(7, 13, dtype=np.int16))
+    assert ring.position == 13 and ring.oldest == 3
+    samples, start = ring.read(5)
+    assert start == 5 and samples.tolist() == list(range(5, 13))
+    samples, start = ring.read(8, 12)
+    assert samples.tolist() == [8, 9, 10, 11]
+
+    # A write larger than the ring keeps only its tail
+    ring.write(np.arange(100, 125, dtype=np.int16))
+    assert ring.position == 38
+    assert ring.read(0)[0].tolist() == list(range(115, 125))
+    print("✅ Wraparound tests passed\n")
+
+
+def test_overwritten_positions():
+    """Positions that were overwritten clamp to the oldest retained sample"""
+    print("Testing overwritten positions...")
+    ring = AudioRingBuffer(4)
+    ring.write(np.arange(10, dtype=np.int16))
+    samples, start = ring.read(2)
+    assert start == 6 and samples.tolist() == [6, 7, 8, 9]
+    samples, start = ring.read(20)
+    assert len(samples) == 0 and start == 10
+    assert ring.read(0, 3)[0].size == 0
+    print("✅ Overwritten position tests passed\n")
+
+
+def test_read_since_skips_nothing():
+    """read_since's new position follows the samples it returned"""
+    print("Testing read_since...")
+    capture = ContinuousCapture(pa=object(), sample_rate=100, buffer_seconds=1)
+    capture.buffer.write(np.ones(30, dtype=np.int16))
+    samples, position = capture.read_since(0, timeout=0)
+    assert len(samples) == 30 and position == 30
+    capture.buffer.write(np.ones(5, dtype=np.int16))
+    samples, position = capture.read_since(position, timeout=0)
+    assert len(samples) == 5 and position == 35
+
+    # After an overwrite the position still matches what was returned
+    capture.buffer.write(np.ones(250, dtype=np.int16))
+    samples, position = capture.read_since(35, timeout=0)
+    assert len(samples) == 100 and position == 285
+    print("✅ read_since tests passed\n")
+
+
+def test_chunk_energies():
+    """Mean absolute amplitude per full chunk; partial chunks are ignored"""
+    print("Testing chunk energies...")
+    samples = np.array([1, -1, 2, -2, -32768, -32768, 5], dtype=np.int16)
+    assert chunk_energies(samples, 2).tolist() == [1.0, 2.0, 32768.0]
+    assert chunk_energies(samples[:1], 2).size == 0
+    print("✅ Chunk energy tests passed\n")
+
+
+def test_wake_preroll():
+    """Voice activation hands the audio before the trigger to the recorder"""
+    print("Testing wake pre-roll...")
+    chunk = 10
+    quiet = [np.zeros(chunk, dtype=np.int16)] * 8
+    loud = [np.full(chunk, 5000, dtype=np.int16)] * 2
+    capture = ScriptedCapture(quiet + loud, sample_rate=100, chunk=chunk, buffer_seconds=5)
+    wake = SimplePushToTalk(energy_threshold=1000, capture=capture, preroll_seconds=0.3)
+    assert wake.listen(timeout=5)
+    assert wake.activation_position == 80
+    assert wake.preroll_position() == 50
+    samples, _ = capture.buffer.read(wake.preroll_position())
+    assert samples[:30].tolist() == [0] * 30 and samples[30] == 5000
+    print("✅ Wake pre-roll tests passed\n")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("Audio Capture Tests")
+    print("=" * 50 + "\n")
+
+    test_ring_wraparound()
+    test_overwritten_positions()
+    test_read_since_skips_nothing()
+    test_chunk_energies()
+    test_wake_preroll()
+
+    print("=" * 50)
+    print("All audio capture tests passed!")
+    print("=" * 50)
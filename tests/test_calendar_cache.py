@@ -0,0 +1,240 @@
+"""
+Test the calendar event cache and its use by CalendarController
+"""
+
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.script_runner import ScriptResult
+from src.integrations import calendar_controller
+from src.integrations.calendar_cache import (CalendarEvent, EventCache, FIELD_SEP, READ_EVENTS_SCRIPT,
+                                             RECORD_SEP, expand_recurring, parse_events)
+from src.integrations.calendar_controller import CalendarController
+
+TODAY = date.today()
+
+
+def stamp(day: date, hour: int, minute: int = 0) -> str:
+    return f"{day.year}-{day.month}-{day.day}-{hour * 3600 + minute * 60}"
+
+
+def record(summary, start, end, all_day="false", calendar="Work", recurrence="missing value"):
+    return FIELD_SEP.join([summary, start, end, all_day, calendar, recurrence])
+
+
+TOMORROW = TODAY + timedelta(days=1)
+OUTPUT = RECORD_SEP.join([
+    record("Lunch", stamp(TODAY, 12), stamp(TODAY, 13), calendar="Home"),
+    record("Standup", stamp(TODAY, 9, 30), stamp(TODAY, 9, 45)),
+    record("Holiday", stamp(TODAY, 0), stamp(TOMORROW, 0), all_day="true", calendar="Home"),
+    record("Review", stamp(TOMORROW, 15), stamp(TOMORROW, 16)),
+    "garbage",
+])
+
+
+class FakeCalendar:
+    """Stands in for run_applescript; counts bulk reads."""
+
+    def __init__(self, output=OUTPUT, ok=True):
+        self.output = output
+        self.ok = ok
+        self.scripts = []
+
+    def __call__(self, script, timeout=5.0):
+        self.scripts.append(script)
+        return ScriptResult(self.ok, self.output if self.ok else "", "" if self.ok else "Not authorized")
+
+
+def at(day: date, hour: int, minute: int = 0) -> datetime:
+    return datetime.combine(day, datetime.min.time()) + timedelta(hours=hour, minutes=minute)
+
+
+def test_parse_events():
+    """Records become sorted events; malformed ones are skipped"""
+    print("Testing event parsing...")
+    events = parse_events(OUTPUT)
+    assert [e.summary for e in events] == ["Holiday", "Standup", "Lunch", "Review"]
+    standup = events[1]
+    assert standup.start == at(TODAY, 9, 30) and standup.end == at(TODAY, 9, 45)
+    assert standup.calendar == "Work" and not standup.all_day and standup.recurrence == ""
+    assert events[0].all_day
+    assert parse_events("") == []
+    print("✅ Parsing test passed\n")
+
+
+def test_script_template():
+    """The read script formats cleanly for a window"""
+    print("Testing script template...")
+    script = READ_EVENTS_SCRIPT.format(start_year=2026, start_month=3, start_day=5,
+                                       end_year=2026, end_month=3, end_day=19)
+    assert "makeDate(2026, 3, 5)" in script and "makeDate(2026, 3, 19)" in script
+    assert "set records to {}" in script
+    assert "recurrence is not missing value" in script
+    print("✅ Script template test passed\n")
+
+
+def test_single_bulk_read():
+    """Repeated queries inside the window are served from memory"""
+    print("Testing bulk read...")
+    fake = FakeCalendar()
+    cache = EventCache(ttl=60, window_days=7, runner=fake)
+    assert [e.summary for e in cache.on_day(TODAY)] == ["Holiday", "Standup", "Lunch"]
+    assert [e.summary for e in cache.on_day(TOMORROW)] == ["Review"]
+    assert [e.summary for e in cache.conflicts(at(TODAY, 12, 30), at(TODAY, 14))] == ["Lunch"]
+    assert cache.conflicts(at(TODAY, 10), at(TODAY, 11)) == []  # All-day events don't block
+    assert len(fake.scripts) == 1
+
+    # Outside the window, or after invalidation, Calendar is read again
+    cache.on_day(TODAY + timedelta(days=30))
+    assert len(fake.scripts) == 2
+    cache.invalidate()
+    cache.on_day(TODAY)
+    assert len(fake.scripts) == 3
+    print("✅ Bulk read test passed\n")
+
+
+def test_ttl_expiry():
+    """Expired events are re-read"""
+    print("Testing TTL expiry...")
+    fake = FakeCalendar()
+    cache = EventCache(ttl=0, runner=fake)
+    cache.on_day(TODAY)
+    cache.on_day(TODAY)
+    assert len(fake.scripts) == 2
+    print("✅ TTL expiry test passed\n")
+
+
+def test_incremental_add():
+    """Created events are visible without another read"""
+    print("Testing incremental add...")
+    fake = FakeCalendar()
+    cache = EventCache(ttl=60, runner=fake)
+    cache.on_day(TODAY)
+    cache.add(CalendarEvent("Dentist", at(TODAY, 16), at(TODAY, 17)))
+    assert [e.summary for e in cache.on_day(TODAY)][-1] == "Dentist"
+    assert [e.summary for e in cache.conflicts(at(TODAY, 16, 30), at(TODAY, 17, 30))] == ["Dentist"]
+    assert len(fake.scripts) == 1
+    print("✅ Incremental add test passed\n")
+
+
+def test_recurring_events():
+    """Series that started before the window are expanded into it"""
+    print("Testing recurring events...")
+    start, end = at(TODAY, 0), at(TODAY + timedelta(days=14), 0)
+    weekly = CalendarEvent("1:1", at(TODAY - timedelta(days=70), 10), at(TODAY - timedelta(days=70), 10, 30),
+                           recurrence="FREQ=WEEKLY;INTERVAL=1")
+    occurrences = expand_recurring(weekly, start, end)
+    assert [e.start for e in occurrences] == [at(TODAY, 10), at(TODAY + timedelta(days=7), 10)]
+    assert all(e.end - e.start == timedelta(minutes=30) for e in occurrences)
+
+    # Both the series' end and its occurrence count are respected
+    daily = CalendarEvent("Gym", at(TODAY - timedelta(days=3), 7), at(TODAY - timedelta(days=3), 8),
+                          recurrence="FREQ=DAILY;COUNT=5")
+    assert [e.start.date() for e in expand_recurring(daily, start, end)] == [TODAY, TOMORROW]
+    until = (TODAY + timedelta(days=2)).strftime("%Y%m%d")
+    daily.recurrence = f"FREQ=DAILY;INTERVAL=2;UNTIL={until}"
+    assert [e.start.date() for e in expand_recurring(daily, start, end)] == [TOMORROW]  # Not day 3
+
+    # Monthly and yearly series land on the same day of the month / year
+    target = next(day for day in (TODAY + timedelta(days=i) for i in range(14)) if day.day <= 28)
+    first = target.replace(year=target.year - 1)
+    monthly = CalendarEvent("Rent", at(first, 9), at(first, 10), recurrence="FREQ=MONTHLY;INTERVAL=1")
+    assert [e.start for e in expand_recurring(monthly, start, end)] == [at(target, 9)]
+    yearly = CalendarEvent("Birthday", at(first, 0), at(first + timedelta(days=1), 0), all_day=True,
+                           recurrence="FREQ=YEARLY")
+    assert [e.start for e in expand_recurring(yearly, start, end)] == [at(target, 0)]
+    unsupported = CalendarEvent("Last weekday", at(first, 9), at(first, 10),
+                                recurrence="FREQ=MONTHLY;BYDAY=MO,TU,WE,TH,FR;BYSETPOS=-1")
+    assert expand_recurring(unsupported, start, end) == []
+
+    fake = FakeCalendar(output=record("1:1", stamp(weekly.start.date(), 10), stamp(weekly.start.date(), 10, 30),
+                                      recurrence="FREQ=WEEKLY;INTERVAL=1"))
+    cache = EventCache(ttl=60, runner=fake)
+    assert [e.summary for e in cache.on_day(TODAY)] == ["1:1"]
+    assert cache.on_day(TOMORROW) == []
+    print("✅ Recurring events test passed\n")
+
+
+def test_read_failure():
+    """A failed read raises unless earlier events can be served"""
+    print("Testing read failure...")
+    cache = EventCache(runner=FakeCalendar(ok=False))
+    try:
+        cache.on_day(TODAY)
+        assert False, "expected RuntimeError"
+    except RuntimeError as e:
+        assert "Not authorized" in str(e)
+
+    fake = FakeCalendar()
+    cache = EventCache(ttl=0, runner=fake)
+    assert len(cache.on_day(TODAY)) == 3
+    fake.ok = False
+    assert len(cache.on_day(TODAY)) == 3  # Expired, but better than nothing
+    assert len(fake.scripts) == 2
+    try:
+        cache.on_day(TODAY + timedelta(days=60))  # Never loaded
+        assert False, "expected RuntimeError"
+    except RuntimeError:
+        pass
+    print("✅ Read failure test passed\n")
+
+
+def test_controller():
+    """Today's events, conflict notes and cache updates through the controller"""
+    print("Testing controller...")
+    fake = FakeCalendar()
+    controller = CalendarController()
+    controller.events = EventCache(ttl=60, runner=fake)
+    summary = controller.get_todays_events()
+    assert summary == "You have 3 events today: Holiday (all day); Standup at 9:30 AM; Lunch at 12:00 PM."
+
+    created = []
+    original = calendar_controller.run_applescript
+    calendar_controller.run_applescript = lambda script, timeout=5.0: created.append(script) or ScriptResult(True, "Work")
+    try:
+        ok, message = controller.create_event("Sync", f"{TODAY.isoformat()} 12:30")
+    finally:
+        calendar_controller.run_applescript = original
+    assert ok and len(created) == 1
+    assert "overlaps with 'Lunch'" in message
+
+    # Creating an event never waits for a bulk read just to check conflicts
+    cold = CalendarController()
+    cold.events = EventCache(ttl=60, runner=FakeCalendar())
+    calendar_controller.run_applescript = lambda script, timeout=5.0: ScriptResult(True, "Work")
+    try:
+        ok, message = cold.create_event("Sync", f"{TODAY.isoformat()} 12:30")
+    finally:
+        calendar_controller.run_applescript = original
+    assert ok and "overlaps" not in message and cold.events.runner.scripts == []
+    assert "Sync at 12:30 PM" in controller.get_todays_events()
+    assert len(fake.scripts) == 1
+
+    empty = CalendarController()
+    empty.events = EventCache(runner=FakeCalendar(output=""))
+    assert empty.get_todays_events() == "Your calendar is clear today."
+    print("✅ Controller test passed\n")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("Calendar Cache Tests")
+    print("=" * 50 + "\n")
+
+    test_parse_events()
+    test_script_template()
+    test_single_bulk_read()
+    test_ttl_expiry()
+    test_incremental_add()
+    test_recurring_events()
+    test_read_failure()
+    test_controller()
+
+    print("=" * 50)
+    print("All calendar cache tests passed!")
+    print("=" * 50)
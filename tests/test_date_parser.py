@@ -0,0 +1,130 @@
+"""
+Test the fast-path date parser and compare it with dateparser
+"""
+
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core import date_parser
+from src.core.date_parser import parse_datetime, parse_fast
+
+# Thursday afternoon
+NOW = datetime(2026, 3, 5, 15, 30, 12)
+
+# Phrases the LLM typically extracts for calendar events -> expected result at NOW
+CORPUS = {
+    "tomorrow at 5pm": datetime(2026, 3, 6, 17, 0),
+    "5pm tomorrow": datetime(2026, 3, 6, 17, 0),
+    "Tomorrow at 9:30 AM": datetime(2026, 3, 6, 9, 30),
+    "today at 4pm": datetime(2026, 3, 5, 16, 0),
+    "tonight at 8": datetime(2026, 3, 5, 20, 0),
+    "tonight": datetime(2026, 3, 5, 20, 0),
+    "tomorrow morning": datetime(2026, 3, 6, 9, 0),
+    "day after tomorrow at noon": datetime(2026, 3, 7, 12, 0),
+    "6pm": datetime(2026, 3, 5, 18, 0),
+    "2pm": datetime(2026, 3, 6, 14, 0),  # Already past today
+    "14:30": datetime(2026, 3, 6, 14, 30),
+    "at 18:45": datetime(2026, 3, 5, 18, 45),
+    "midnight": datetime(2026, 3, 6, 0, 0),
+    "friday at 3pm": datetime(2026, 3, 6, 15, 0),
+    "on monday at 10am": datetime(2026, 3, 9, 10, 0),
+    "next friday 11am": datetime(2026, 3, 6, 11, 0),
+    "thursday at 5pm": datetime(2026, 3, 5, 17, 0),  # Later today
+    "thursday at 9am": datetime(2026, 3, 12, 9, 0),  # Passed today
+    "next thursday at 5pm": datetime(2026, 3, 12, 17, 0),
+    "this sat 10:00": datetime(2026, 3, 7, 10, 0),
+    "March 10 at 2pm": datetime(2026, 3, 10, 14, 0),
+    "march 1st at 2pm": datetime(2027, 3, 1, 14, 0),  # Passed this year
+    "on the 20th of april at 9am": datetime(2026, 4, 20, 9, 0),
+    "dec 24, 2026 7pm": datetime(2026, 12, 24, 19, 0),
+    "2026-04-01 09:15": datetime(2026, 4, 1, 9, 15),
+    "in 20 minutes": datetime(2026, 3, 5, 15, 50, 12),
+    "in an hour": datetime(2026, 3, 5, 16, 30, 12),
+    "in half an hour": datetime(2026, 3, 5, 16, 0, 12),
+    "in 3 days": datetime(2026, 3, 8, 15, 30, 12),
+    "tomorrow": datetime(2026, 3, 6, 15, 30),
+}
+
+# Left to dateparser
+OUTSIDE_GRAMMAR = ["next week", "in 1 hour and 30 minutes", "3/5 at 2pm", "at 25", "13pm tomorrow",
+                   "february 30", "sometime soon", ""]
+
+
+def test_corpus():
+    """Every corpus phrase resolves on the fast path"""
+    print("Testing fast-path corpus...")
+    for phrase, expected in CORPUS.items():
+        result = parse_fast(phrase, NOW)
+        assert result == expected, f"{phrase!r}: {result} != {expected}"
+        assert parse_datetime(phrase, NOW) == expected
+    print(f"✅ {len(CORPUS)} phrases parsed\n")
+
+
+def test_outside_grammar():
+    """Unsupported or invalid phrases are left to the fallback"""
+    print("Testing phrases outside the grammar...")
+    for phrase in OUTSIDE_GRAMMAR:
+        assert parse_fast(phrase, NOW) is None, phrase
+    print("✅ Outside-grammar test passed\n")
+
+
+def test_fallback_is_lazy():
+    """dateparser is only called when the grammar gives up"""
+    print("Testing lazy fallback...")
+    calls = []
+    original = date_parser._fallback
+    date_parser._fallback = lambda text, base: calls.append((text, base)) or NOW
+    try:
+        parse_datetime("tomorrow at 5pm", NOW)
+        assert calls == []
+        assert parse_datetime("next week", NOW) == NOW
+        assert calls == [("next week", "2026-03-05T15:30:00")]
+    finally:
+        date_parser._fallback = original
+    print("✅ Lazy fallback test passed\n")
+
+
+def test_benchmark():
+    """Fast path against dateparser on the corpus"""
+    print("Testing benchmark...")
+    rounds = 200
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for phrase in CORPUS:
+            parse_fast(phrase, NOW)
+    fast = (time.perf_counter() - start) / (rounds * len(CORPUS))
+    print(f"   fast path: {fast * 1e6:.1f}µs per phrase")
+    assert fast < 0.001
+
+    try:
+        import dateparser
+    except ImportError:
+        print("   dateparser not installed; comparison skipped")
+    else:
+        start = time.perf_counter()
+        for phrase in CORPUS:
+            dateparser.parse(phrase, settings={"PREFER_DATES_FROM": "future", "RELATIVE_BASE": NOW})
+        slow = (time.perf_counter() - start) / len(CORPUS)
+        print(f"   dateparser: {slow * 1e6:.1f}µs per phrase ({slow / fast:.0f}x)")
+    print("✅ Benchmark test passed\n")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("Date Parser Tests")
+    print("=" * 50 + "\n")
+
+    test_corpus()
+    test_outside_grammar()
+    test_fallback_is_lazy()
+    test_benchmark()
+
+    print("=" * 50)
+    print("All date parser tests passed!")
+    print("=" * 50)
@@ -0,0 +1,213 @@
+"""
+Test porcelain v2 parsing and the cached git status service
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.integrations.git_status import GitStatusService, parse_porcelain_v2
+from src.integrations.github_control import GitHubController
+
+SAMPLE = "\0".join([
+    "# branch.oid 1234567890abcdef1234567890abcdef12345678",
+    "# branch.head main",
+    "# branch.upstream origin/main",
+    "# branch.ab +2 -1",
+    "1 M. N... 100644 100644 100644 aaa bbb src/app.py",
+    "1 .M N... 100644 100644 100644 aaa aaa README.md",
+    "2 R. N... 100644 100644 100644 aaa aaa R100 docs/new name.md",
+    "docs/old.md",
+    "u UU N... 100644 100644 100644 100644 a b c conflict.txt",
+    "? notes.txt",
+    "",
+])
+
+
+def git(repo, *args):
+    subprocess.run(["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+                   cwd=repo, check=True, capture_output=True)
+
+
+def make_repo():
+    repo = Path(tempfile.mkdtemp())
+    git(repo, "init", "-q", "-b", "main")
+    (repo / "a.txt").write_text("one\n")
+    git(repo, "add", "a.txt")
+    git(repo, "commit", "-q", "-m", "First commit")
+    return repo
+
+
+class CountingService(GitStatusService):
+    """Counts git processes spawned."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.runs = 0
+
+    def _run_git(self, root, *args):
+        self.runs += 1
+        return super()._run_git(root, *args)
+
+
+def test_parse():
+    """Headers, ordinary, renamed, unmerged and untracked records"""
+    print("Testing porcelain v2 parsing...")
+    status = parse_porcelain_v2(SAMPLE, "/repo")
+    assert status.branch == "main" and status.upstream == "origin/main"
+    assert (status.ahead, status.behind) == (2, 1)
+    assert [c.path for c in status.changes] == ["src/app.py", "README.md", "docs/new name.md", "conflict.txt"]
+    assert status.changes[2].orig_path == "docs/old.md"
+    assert [c.path for c in status.staged] == ["src/app.py", "docs/new name.md"]
+    assert [c.path for c in status.conflicts] == ["conflict.txt"]
+    assert status.untracked == ["notes.txt"]
+    summary = status.summary()
+    assert summary.startswith("On branch main (ahead of origin/main by 2, behind origin/main by 1): "
+                              "1 conflicted, 2 staged, 1 modified, 1 untracked.")
+    assert "M  src/app.py" in summary and " M README.md" in summary and "?? notes.txt" in summary
+
+    initial = parse_porcelain_v2("# branch.oid (initial)\0# branch.head (detached)\0")
+    assert initial.oid is None and initial.branch is None and initial.clean
+    print("✅ Parsing test passed\n")
+
+
+def test_cache_and_invalidation():
+    """Status is reused until the index or HEAD changes"""
+    print("Testing status cache...")
+    repo = make_repo()
+    service = CountingService([str(repo)], max_age=60)
+    assert service.status(str(repo)).clean
+    assert service.status(str(repo)).clean
+    assert service.runs == 1
+
+    # An unstaged edit is only seen after max_age...
+    (repo / "a.txt").write_text("two\n")
+    assert service.status(str(repo)).clean
+    # ...but staging it touches the index
+    git(repo, "add", "a.txt")
+    status = service.status(str(repo))
+    assert [c.code for c in status.changes] == ["M "]
+    assert service.runs == 2
+
+    # Committing moves the branch ref
+    git(repo, "commit", "-q", "-m", "Second commit")
+    assert service.status(str(repo)).clean
+    assert service.runs == 3
+
+    # Switching branches rewrites HEAD
+    git(repo, "checkout", "-q", "-b", "feature")
+    assert service.status(str(repo)).branch == "feature"
+    assert service.runs == 4
+
+    expiring = CountingService([str(repo)], max_age=0)
+    expiring.status(str(repo))
+    expiring.status(str(repo))
+    assert expiring.runs == 2
+    print("✅ Status cache test passed\n")
+
+
+def test_cached_speed():
+    """Cached answers cost a few stat calls, not a process"""
+    print("Testing cached status speed...")
+    repo = make_repo()
+    service = CountingService([str(repo)], max_age=60)
+    service.status(str(repo))
+    rounds = 1000
+    start = time.perf_counter()
+    for _ in range(rounds):
+        service.status(str(repo))
+    per_call = (time.perf_counter() - start) / rounds
+    print(f"   cached status: {per_call * 1e6:.0f}µs")
+    assert service.runs == 1
+    assert per_call < 0.005
+    print("✅ Speed test passed\n")
+
+
+def test_branches_and_commit():
+    """Branches come from refs (loose and packed); latest commit is cached per HEAD"""
+    print("Testing branches and latest commit...")
+    repo = make_repo()
+    git(repo, "branch", "packed-one")
+    git(repo, "pack-refs", "--all")
+    git(repo, "branch", "loose/two")
+    service = CountingService([str(repo)])
+    names, current = service.branches(repo.name)  # Tracked repos are found by name
+    assert names == ["loose/two", "main", "packed-one"] and current == "main"
+    assert service.runs == 0
+
+    assert service.latest_commit(str(repo)).endswith(" First commit")
+    service.latest_commit(str(repo))
+    assert service.runs == 1
+    (repo / "b.txt").write_text("b\n")
+    git(repo, "add", "b.txt")
+    service.latest_commit(str(repo))
+    assert service.runs == 1  # Staging doesn't move HEAD
+    git(repo, "commit", "-q", "-m", "Add b")
+    assert service.latest_commit(str(repo)).endswith(" Add b")
+    assert service.runs == 2
+    assert service.resolve("not-a-repo-anywhere") is None
+    print("✅ Branches and commit test passed\n")
+
+
+def test_controller():
+    """Controller answers from the service and invalidates after writes"""
+    print("Testing controller...")
+    repo = make_repo()
+    controller = GitHubController(github_token="", repos=[str(repo)])
+    controller.git = CountingService([str(repo)], max_age=60)
+    ok, message = controller.git_status(str(repo))
+    assert ok and message == "On branch main. Working tree clean, sir."
+    ok, message = controller.git_branch(str(repo))
+    assert ok and message == "* main"
+
+    (repo / "c.txt").write_text("c\n")
+    controller.git.invalidate(str(repo))
+    ok, message = controller.git_status(str(repo))
+    assert "1 untracked" in message and "?? c.txt" in message
+    print("✅ Controller test passed\n")
+
+
+def test_writes_stay_in_working_directory():
+    """Writes never fall back to a tracked repo; one is only used when named"""
+    print("Testing write targets...")
+    repo = make_repo()
+    (repo / "d.txt").write_text("d\n")
+    controller = GitHubController(github_token="", repos=[str(repo)])
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    try:
+        ok, message = controller.git_add_all()
+        assert not ok and "not a git repository" in message
+        ok, _ = controller.git_add_all("some-other-repo")
+        assert not ok
+        assert "?? d.txt" in controller.git_status(repo.name)[1]
+
+        assert controller.git_add_all(repo.name)[0]
+        assert "A  d.txt" in controller.git_status(repo.name)[1]
+    finally:
+        os.chdir(cwd)
+    print("✅ Write target test passed\n")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("Git Status Tests")
+    print("=" * 50 + "\n")
+
+    test_parse()
+    test_cache_and_invalidation()
+    test_cached_speed()
+    test_branches_and_commit()
+    test_controller()
+    test_writes_stay_in_working_directory()
+
+    print("=" * 50)
+    print("All git status tests passed!")
+    print("=" * 50)
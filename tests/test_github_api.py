@@ -0,0 +1,238 @@
+"""
+Test cached GitHub API reads against a local fake GitHub
+"""
+
+import json
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.integrations.github_api import REPOS_PAGE, GitHubAPI, RateLimitExceeded
+from src.integrations.github_control import GitHubController
+from src.integrations.http_cache import HttpCache
+
+RESOURCES = {
+    "/user": {"login": "tony"},
+    "/user/repos?per_page=100": [{"name": "jarvis", "stargazers_count": 3}, {"name": "mark-42", "stargazers_count": 0}],
+    "/repos/tony/jarvis/commits?per_page=1": [{"commit": {"message": "Add suit telemetry", "author": {"name": "Tony"}}}],
+}
+
+
+class FakeGitHub(BaseHTTPRequestHandler):
+    """Serves RESOURCES with ETags; 304s don't use up the quota, like GitHub. 403s once it's gone."""
+
+    hits = []
+    remaining = 5000
+    version = 1
+
+    def do_GET(self):
+        FakeGitHub.hits.append(self.path)
+        if self.headers.get("Authorization") != "Bearer secret":
+            self.send_response(401)
+            self.end_headers()
+            return
+        if FakeGitHub.remaining <= 0:
+            self.send_response(403)
+            self.send_header("Content-Length", "0")
+            self.rate_headers()
+            self.end_headers()
+            return
+        etag = f'"{self.path}-v{FakeGitHub.version}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.rate_headers()
+            self.end_headers()
+            return
+        FakeGitHub.remaining -= 1
+        body = json.dumps(RESOURCES[self.path]).encode()
+        self.send_response(200)
+        self.send_header("Cache-Control", "private, max-age=60")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.rate_headers()
+        self.end_headers()
+        self.wfile.write(body)
+
+    def rate_headers(self):
+        self.send_header("X-RateLimit-Limit", "5000")
+        self.send_header("X-RateLimit-Remaining", str(FakeGitHub.remaining))
+        self.send_header("X-RateLimit-Reset", str(int(time.time()) + 3600))
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    FakeGitHub.hits, FakeGitHub.remaining, FakeGitHub.version = [], 5000, 1
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGitHub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def make_api(base, token="secret", **kwargs):
+    cache = HttpCache(cache_dir=Path(tempfile.mkdtemp()), ttl_overrides={})
+    return GitHubAPI(token, base_url=base, cache=cache, **kwargs)
+
+
+def test_cached_reads():
+    """Repeated reads inside the TTL never reach GitHub"""
+    print("Testing cached reads...")
+    server, base = start_server()
+    try:
+        api = make_api(base, ttls={"repos": 60, "user": 60, "commits": 60})
+        assert [r["name"] for r in api.repos(1)] == ["jarvis"]
+        assert len(api.repos()) == 2
+        assert api.latest_commit("jarvis")["commit"]["message"] == "Add suit telemetry"
+        api.latest_commit("jarvis")
+        assert FakeGitHub.hits == ["/user/repos?per_page=100", "/user", "/repos/tony/jarvis/commits?per_page=1"]
+    finally:
+        server.shutdown()
+    print("✅ Cached reads test passed\n")
+
+
+def test_conditional_revalidation():
+    """Expired entries are revalidated with If-None-Match; 304s cost no quota"""
+    print("Testing conditional revalidation...")
+    server, base = start_server()
+    try:
+        api = make_api(base, ttls={"repos": 0})
+        api.repos()
+        assert api.rate_limit["remaining"] == 4999
+        for _ in range(3):
+            assert len(api.repos()) == 2
+        assert len(FakeGitHub.hits) == 4
+        assert api.rate_limit["remaining"] == 4999
+        assert "4999 of 5000" in api.rate_limit_status()
+
+        # A changed resource comes back in full
+        FakeGitHub.version = 2
+        api.repos()
+        assert api.rate_limit["remaining"] == 4998
+    finally:
+        server.shutdown()
+    print("✅ Conditional revalidation test passed\n")
+
+
+def test_invalidate_after_write():
+    """A write marks the cached list stale without dropping its ETag"""
+    print("Testing invalidation...")
+    server, base = start_server()
+    try:
+        api = make_api(base, ttls={"repos": 300})
+        api.repos()
+        api.invalidate_repos()
+        api.repos()
+        assert len(FakeGitHub.hits) == 2
+        assert api.rate_limit["remaining"] == 4999  # Unchanged list: 304
+    finally:
+        server.shutdown()
+    print("✅ Invalidation test passed\n")
+
+
+def test_rate_limit_exhausted():
+    """Once the quota is gone, cached responses are served even if expired; uncached reads fail"""
+    print("Testing exhausted quota...")
+    server, base = start_server()
+    try:
+        api = make_api(base, ttls={"repos": 300, "commits": 0, "user": 0})
+        api.repos()
+        api.latest_commit("tony/jarvis")
+        api.rate_limit.update(remaining=0, reset=time.time() + 600)
+        assert len(api.repos()) == 2
+        assert api.response("/user/repos", "repos", {"per_page": 100}).cache_status == "fresh"
+
+        # Expired: served from the cache, marked stale, without a request
+        stale = api.response("/repos/tony/jarvis/commits", "commits", {"per_page": 1})
+        assert stale.cache_status == "stale"
+        assert api.latest_commit("tony/jarvis")["commit"]["message"] == "Add suit telemetry"
+        try:
+            api.login
+            assert False, "expected RateLimitExceeded"
+        except RateLimitExceeded as e:
+            assert "resets at" in str(e)
+        assert len(FakeGitHub.hits) == 2
+
+        controller = GitHubController(github_token="secret")
+        controller.api = api
+        ok, message = controller.list_repos()
+        assert ok and "- jarvis" in message and "rate limit has been reached" in message
+
+        # After the reset, expired entries are revalidated again
+        api.rate_limit.update(reset=time.time() - 1)
+        assert api.response("/repos/tony/jarvis/commits", "commits", {"per_page": 1}).cache_status == "revalidated"
+    finally:
+        server.shutdown()
+    print("✅ Exhausted quota test passed\n")
+
+
+def test_rate_limited_response():
+    """The first 403 for an exhausted quota is answered from the cache when possible"""
+    print("Testing rate-limited responses...")
+    server, base = start_server()
+    try:
+        api = make_api(base, ttls={"repos": 0, "user": 0})
+        api.repos()
+        FakeGitHub.remaining = 0
+        assert not api.rate_limited
+        response = api.response("/user/repos", "repos", REPOS_PAGE)
+        assert response.cache_status == "stale" and api.rate_limited
+        assert len(FakeGitHub.hits) == 2
+
+        try:
+            make_api(base).login
+            assert False, "expected RateLimitExceeded"
+        except RateLimitExceeded as e:
+            assert "resets at" in str(e)
+    finally:
+        server.shutdown()
+    print("✅ Rate-limited response test passed\n")
+
+
+def test_controller_is_lazy():
+    """The controller makes no request until a GitHub command runs"""
+    print("Testing lazy controller...")
+    server, base = start_server()
+    try:
+        controller = GitHubController(github_token="wrong")
+        controller.api = make_api(base, token="wrong")
+        assert controller.is_authenticated()
+        assert FakeGitHub.hits == []
+        ok, message = controller.list_repos()
+        assert not ok and "401" in message
+
+        controller = GitHubController(github_token="secret")
+        controller.api = make_api(base)
+        ok, message = controller.list_repos()
+        assert ok and "- jarvis ⭐3" in message and "- mark-42" in message
+        ok, message = controller.get_latest_commit("jarvis")
+        assert message == "Latest commit: Add suit telemetry by Tony"
+        assert "GitHub API requests remain" in controller.rate_limit_status()[1]
+        assert controller.user is None  # PyGithub is only for writes
+    finally:
+        server.shutdown()
+    print("✅ Lazy controller test passed\n")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("GitHub API Cache Tests")
+    print("=" * 50 + "\n")
+
+    test_cached_reads()
+    test_conditional_revalidation()
+    test_invalidate_after_write()
+    test_rate_limit_exhausted()
+    test_rate_limited_response()
+    test_controller_is_lazy()
+
+    print("=" * 50)
+    print("All GitHub API cache tests passed!")
+    print("=" * 50)
@@ -0,0 +1,133 @@
+"""
+Test streaming HTML-to-text extraction and benchmark it against the old
+BeautifulSoup path. Set JARVIS_PAGE_CORPUS to a directory of saved .html
+pages to benchmark real pages as well as the generated ones.
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.integrations.html_text import extract_text, html_to_text, sniff_encoding
+
+ARTICLE = ("The James Webb Space Telescope observes in the infrared, which lets it see "
+           "through dust clouds where stars and planetary systems are forming. ")
+
+
+def make_page(paragraphs: int, comments: int = 200, article_tag: bool = True) -> bytes:
+    """A news-style page: header, nav, sidebar, article, comments, scripts."""
+    nav = "".join(f'<li><a href="/s{i}">Section {i}</a></li>' for i in range(40))
+    sidebar = "".join(f'<p><a href="/r{i}">Related story number {i} you might like</a></p>' for i in range(30))
+    body = "".join(f"<p>{ARTICLE}Paragraph {i}.</p>" for i in range(paragraphs))
+    comment_html = "".join(f'<div class="comment"><p>Comment {i}: great article, thanks for sharing this!</p></div>'
+                           for i in range(comments))
+    wrapper = ("article", "article") if article_tag else ('div class="entry-content"', "div")
+    return (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Webb</title>"
+        f"<style>{'.x{color:red}' * 500}</style><script>{'var a = 1;' * 2000}</script></head>"
+        f"<body><header><h1>Daily Science</h1></header><nav><ul>{nav}</ul></nav>"
+        f'<div class="layout"><aside class="sidebar">{sidebar}</aside>'
+        f"<{wrapper[0]}><h2>How Webb sees through dust</h2>{body}</{wrapper[1]}>"
+        f'<section id="comments">{comment_html}</section></div>'
+        "<footer><p>Copyright Daily Science. All rights reserved worldwide.</p></footer>"
+        "</body></html>"
+    ).encode()
+
+
+def legacy_html_to_text(content: bytes) -> str:
+    """The previous WebScraper.html_to_text, kept as the benchmark baseline."""
+    soup = BeautifulSoup(content, 'html.parser')
+    for script in soup(["script", "style", "nav", "footer", "header"]):
+        script.decompose()
+    text = soup.get_text()
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return ' '.join(chunk for chunk in chunks if chunk)[:5000]
+
+
+def load_corpus():
+    pages = {f"generated-{n}p": make_page(n) for n in (20, 200, 2000)}
+    corpus_dir = os.environ.get("JARVIS_PAGE_CORPUS")
+    if corpus_dir:
+        for path in sorted(Path(corpus_dir).glob("*.htm*")):
+            pages[path.name] = path.read_bytes()
+    return pages
+
+
+def test_main_content_only():
+    """Boilerplate is dropped and the article text is kept"""
+    print("Testing main content detection...")
+    for article_tag in (True, False):
+        text = html_to_text(make_page(10, article_tag=article_tag))
+        assert text.startswith("How Webb sees through dust")
+        assert "Paragraph 9." in text
+        for boilerplate in ("Section 1", "Related story", "Comment 1", "Copyright", "var a", "color:red"):
+            assert boilerplate not in text, boilerplate
+
+    # Without any main-content markers, link-light blocks are still kept
+    page = b"<html><body><div><a href='/'>Home</a> <a href='/b'>Blog</a></div>" \
+           b"<p>" + ARTICLE.encode() + b"</p><p>Hi</p></body></html>"
+    assert html_to_text(page) == ARTICLE.strip()
+    print("✅ Main content tests passed\n")
+
+
+def test_budget_and_streaming():
+    """Parsing stops at the character budget; chunk boundaries don't matter"""
+    print("Testing early stop and chunked input...")
+    text = html_to_text(make_page(2000), max_chars=1000)
+    assert len(text) == 1000
+
+    page = "<article><p>Café crème and crêpes are served all afternoon here.</p></article>".encode()
+    one_byte_chunks = [page[i:i + 1] for i in range(len(page))]
+    assert extract_text(one_byte_chunks) == html_to_text(page) == "Café crème and crêpes are served all afternoon here."
+
+    latin1 = "<meta charset='iso-8859-1'><p>Café crème and crêpes are served all day long.</p>".encode("latin-1")
+    assert sniff_encoding(latin1) == "iso8859-1"
+    assert "Café" in html_to_text(latin1)
+    assert sniff_encoding(b"", "text/html; charset=windows-1252") == "cp1252"
+    print("✅ Streaming tests passed\n")
+
+
+def test_benchmark():
+    """Throughput and peak memory against the BeautifulSoup baseline"""
+    print("Benchmarking extraction...")
+    totals = {"legacy": [0.0, 0], "streaming": [0.0, 0]}
+    for name, page in load_corpus().items():
+        row = []
+        for label, extract in (("legacy", legacy_html_to_text), ("streaming", html_to_text)):
+            tracemalloc.start()
+            start = time.perf_counter()
+            extract(page)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            totals[label][0] += elapsed
+            totals[label][1] = max(totals[label][1], peak)
+            row.append(f"{label} {len(page) / elapsed / 1e6:6.1f} MB/s {peak / 1e6:6.1f} MB peak")
+        print(f"  {name:>18} ({len(page) / 1e3:7.0f} KB): " + " | ".join(row))
+
+    assert totals["streaming"][0] * 3 < totals["legacy"][0], totals
+    assert totals["streaming"][1] * 3 < totals["legacy"][1], totals
+    print("✅ Benchmark passed\n")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("HTML Text Extraction Tests")
+    print("=" * 50 + "\n")
+
+    test_main_content_only()
+    test_budget_and_streaming()
+    test_benchmark()
+
+    print("=" * 50)
+    print("All tests passed! ✅")
+    print("=" * 50)
@@ -0,0 +1,228 @@
+"""
+Test the on-disk HTTP cache against a local HTTP server
+"""
+
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.integrations.http_cache import HttpCache, flush_http_caches
+
+
+class CacheHandler(BaseHTTPRequestHandler):
+    """Serves /<cache-control>/<name>; honours If-None-Match for a fixed ETag. 503s while failing."""
+
+    hits = []
+    failing = False
+
+    def do_GET(self):
+        CacheHandler.hits.append(self.path)
+        if CacheHandler.failing:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        _, cache_control, name = self.path.split("/", 2)
+        etag = f'"{name}-v1"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        body = (name * 100).encode()
+        self.send_response(200)
+        self.send_header("Cache-Control", cache_control.replace("_", "="))
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    CacheHandler.hits = []
+    CacheHandler.failing = False
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CacheHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def make_cache(**kwargs):
+    kwargs.setdefault("ttl_overrides", {})
+    return HttpCache(cache_dir=Path(tempfile.mkdtemp()), **kwargs)
+
+
+def test_fresh_and_revalidated():
+    """max-age responses are served locally; no-cache ones revalidate with ETag"""
+    print("Testing freshness and revalidation...")
+    server, base = start_server()
+    session = requests.Session()
+    try:
+        cache = make_cache()
+        assert cache.get(session, f"{base}/max-age_60/a").cache_status == "miss"
+        assert cache.get(session, f"{base}/max-age_60/a").cache_status == "fresh"
+        assert CacheHandler.hits == ["/max-age_60/a"]
+
+        cache.get(session, f"{base}/no-cache/b")
+        response = cache.get(session, f"{base}/no-cache/b")
+        assert response.cache_status == "revalidated" and response.content == b"b" * 100
+        assert len(CacheHandler.hits) == 3
+
+        cache.get(session, f"{base}/no-store/c")
+        assert cache.get(session, f"{base}/no-store/c").cache_status == "uncacheable"
+
+        # Truncated downloads are never stored
+        assert len(cache.get(session, f"{base}/max-age_60/t", max_bytes=10).content) == 10
+        assert cache.get(session, f"{base}/max-age_60/t").cache_status == "miss"
+
+        # The index survives a restart
+        reopened = HttpCache(cache.cache_dir, ttl_overrides={})
+        assert reopened.get(session, f"{base}/max-age_60/a").cache_status == "fresh"
+    finally:
+        server.shutdown()
+        server.server_close()
+    print("✅ Freshness tests passed\n")
+
+
+def test_ttl_override_and_offline():
+    """Per-host TTLs beat headers; stale entries are served when the network is down"""
+    print("Testing TTL overrides and offline mode...")
+    server, base = start_server()
+    session = requests.Session()
+    overridden = make_cache(ttl_overrides={"127.0.0.1": 60})
+    cache = make_cache()
+    overridden.get(session, f"{base}/no-cache/d")
+    cache.get(session, f"{base}/no-cache/d")
+    assert overridden.get(session, f"{base}/no-cache/d").cache_status == "fresh"
+    server.shutdown()
+    server.server_close()
+
+    response = cache.get(session, f"{base}/no-cache/d", timeout=1)
+    assert response.cache_status == "stale" and response.content == b"d" * 100
+    try:
+        cache.get(session, f"{base}/no-cache/never-seen", timeout=1)
+    except requests.RequestException:
+        pass
+    else:
+        raise AssertionError("Uncached URL served while offline")
+
+    offline = HttpCache(cache.cache_dir, ttl_overrides={}, offline=True)
+    assert offline.get(session, f"{base}/no-cache/d").cache_status == "stale"
+    print("✅ TTL override and offline tests passed\n")
+
+
+def test_server_error_serves_stale():
+    """A 5xx answer falls back to the stored copy instead of replacing it"""
+    print("Testing stale on server errors...")
+    server, base = start_server()
+    session = requests.Session()
+    try:
+        cache = make_cache()
+        cache.get(session, f"{base}/no-cache/s")
+        CacheHandler.failing = True
+        response = cache.get(session, f"{base}/no-cache/s")
+        assert response.cache_status == "stale" and response.content == b"s" * 100
+        response = cache.get(session, f"{base}/no-cache/never-seen")
+        assert response.status_code == 503 and response.cache_status == "uncacheable"
+        CacheHandler.failing = False
+        assert cache.get(session, f"{base}/no-cache/s").cache_status == "revalidated"
+    finally:
+        server.shutdown()
+        server.server_close()
+    print("✅ Server error tests passed\n")
+
+
+def test_lru_eviction():
+    """Least recently used entries go first once over budget"""
+    print("Testing LRU eviction...")
+    server, base = start_server()
+    session = requests.Session()
+    try:
+        cache = make_cache(max_bytes=250)  # Room for two 100-byte bodies
+        cache.get(session, f"{base}/max-age_60/e")
+        cache.get(session, f"{base}/max-age_60/f")
+        cache.get(session, f"{base}/max-age_60/e")  # e is now most recent
+        cache.get(session, f"{base}/max-age_60/g")
+
+        assert cache.get(session, f"{base}/max-age_60/e").cache_status == "fresh"
+        assert cache.get(session, f"{base}/max-age_60/f").cache_status == "miss"
+    finally:
+        server.shutdown()
+        server.server_close()
+    print("✅ LRU tests passed\n")
+
+
+def test_hits_dont_write_index():
+    """Cache hits update access times in memory; they're written on flush"""
+    print("Testing index writes...")
+    server, base = start_server()
+    session = requests.Session()
+    try:
+        cache = make_cache()
+        cache.get(session, f"{base}/max-age_60/h")
+        written = cache.index_path.read_bytes()
+        first_access = next(iter(cache._index.values()))["last_access"]
+        for _ in range(50):
+            assert cache.peek(f"{base}/max-age_60/h").cache_status == "fresh"
+        assert cache.index_path.read_bytes() == written
+
+        flush_http_caches()
+        reopened = HttpCache(cache.cache_dir, ttl_overrides={})
+        assert next(iter(reopened._index.values()))["last_access"] > first_access
+    finally:
+        server.shutdown()
+        server.server_close()
+    print("✅ Index write tests passed\n")
+
+
+def test_key_includes_request_headers():
+    """Different Accept or Authorization headers never share an entry"""
+    print("Testing header-aware keys...")
+    server, base = start_server()
+    try:
+        cache = make_cache()
+        url = f"{base}/max-age_60/k"
+        plain = requests.Session()
+        alice, bob = requests.Session(), requests.Session()
+        alice.headers["Authorization"] = "Bearer alice-token"
+        bob.headers["Authorization"] = "Bearer bob-token"
+        assert cache.get(plain, url).cache_status == "miss"
+        assert cache.get(plain, url, headers={"Accept": "application/json"}).cache_status == "miss"
+        assert cache.get(plain, url, headers={"Accept": "application/json"}).cache_status == "fresh"
+        assert cache.get(alice, url).cache_status == "miss"
+        assert cache.get(bob, url).cache_status == "miss"
+        assert cache.get(alice, url).cache_status == "fresh"
+        assert cache.peek(url, bob.headers) and cache.peek(url, {"Authorization": "Bearer eve"}) is None
+        assert len(CacheHandler.hits) == 4
+        assert b"alice-token" not in cache.index_path.read_bytes()
+    finally:
+        server.shutdown()
+        server.server_close()
+    print("✅ Header-aware key tests passed\n")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("HTTP Cache Tests")
+    print("=" * 50 + "\n")
+
+    test_fresh_and_revalidated()
+    test_ttl_override_and_offline()
+    test_server_error_serves_stale()
+    test_lru_eviction()
+    test_hits_dont_write_index()
+    test_key_includes_request_headers()
+
+    print("=" * 50)
+    print("All tests passed! ✅")
+    print("=" * 50)
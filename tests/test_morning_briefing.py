@@ -0,0 +1,181 @@
+"""
+Test parallel gathering, deadlines and TTL caching in the morning briefing
+"""
+
+import datetime
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.scheduler import Scheduler, ScheduledTask
+from src.features.morning_briefing import FirstInteractionLog, MorningBriefing, typical_start_time
+
+
+def slow(value, delay, calls=None):
+    def source():
+        if calls is not None:
+            calls.append(value)
+        time.sleep(delay)
+        return value
+    return source
+
+
+def make_briefing(weather_delay=0.2, news_delay=0.2, system_delay=0.2, deadline=1.0, ttls=None):
+    briefing = MorningBriefing(deadline=deadline, ttls=ttls or {"weather": 60, "news": 60, "system": 60})
+    briefing.calls = []
+    briefing.sources = {
+        "weather": slow("21°C and clear", weather_delay, briefing.calls),
+        "system": slow("Systems running at 3% capacity", system_delay, briefing.calls),
+        "news": slow(["Chip news", "AI news"], news_delay, briefing.calls),
+    }
+    return briefing
+
+
+def test_sources_gathered_in_parallel():
+    """Three 0.2s sources finish together, not one after another"""
+    print("Testing parallel gathering...")
+    briefing = make_briefing()
+    start = time.monotonic()
+    text = briefing.generate_briefing()
+    elapsed = time.monotonic() - start
+    assert elapsed < 0.45, f"Took {elapsed:.2f}s"
+    assert "21°C and clear" in text and "Chip news." in text and "3% capacity" in text
+    print("✅ Parallel gathering tests passed\n")
+
+
+def test_deadline_and_late_sources():
+    """Late sources get a placeholder, then come from cache next time"""
+    print("Testing deadline placeholders...")
+    briefing = make_briefing(news_delay=0.5, deadline=0.2)
+    start = time.monotonic()
+    text = briefing.generate_briefing()
+    assert time.monotonic() - start < 0.35
+    assert "21°C and clear" in text
+    assert "Headlines are still loading" in text
+
+    time.sleep(0.5)  # News finishes in the background
+    calls_before = len(briefing.calls)
+    start = time.monotonic()
+    text = briefing.generate_briefing()
+    assert time.monotonic() - start < 0.05
+    assert "Chip news." in text
+    assert len(briefing.calls) == calls_before, "Fresh sources were fetched again"
+    print("✅ Deadline tests passed\n")
+
+
+def test_ttl_expiry_and_failures():
+    """Expired values are refetched; failures are reported, not cached"""
+    print("Testing TTL expiry and failures...")
+    briefing = make_briefing(weather_delay=0, news_delay=0, system_delay=0,
+                             ttls={"weather": 0.1, "news": 60, "system": 60})
+    briefing.generate_briefing()
+    time.sleep(0.15)
+    briefing.generate_briefing()
+    assert briefing.calls.count("21°C and clear") == 2
+    assert briefing.calls.count("Systems running at 3% capacity") == 1
+
+    def broken():
+        raise ConnectionError("network down")
+    briefing.sources["weather"] = broken
+    time.sleep(0.15)
+    assert "unavailable (network down)" in briefing.generate_briefing()
+    assert "weather" not in briefing._cache or briefing._cache["weather"][1] == "21°C and clear"
+    print("✅ TTL tests passed\n")
+
+
+def test_learns_typical_start_time():
+    """Median first command per day, with late nights counted as the day before"""
+    print("Testing start time learning...")
+    log = []
+    for day, first in enumerate(["07:50", "08:05", "08:00", "08:20", "07:55"], start=1):
+        log.append({"timestamp": f"2026-03-{day:02d}T{first}:00"})
+        log.append({"timestamp": f"2026-03-{day:02d}T11:30:00"})
+    log.append({"timestamp": "2026-03-03T01:15:00"})  # Up late on the 2nd, not an early start
+    assert typical_start_time(log) == datetime.time(8, 0)
+    assert typical_start_time(log[:4]) is None  # Only two days of history
+    assert typical_start_time([{"timestamp": "garbage"}, {}]) is None
+    print("✅ Start time tests passed\n")
+
+
+def test_first_interaction_log():
+    """One entry per day, kept across restarts and beyond the command log's 100 entries"""
+    print("Testing first interaction log...")
+    path = Path(tempfile.mkdtemp()) / "first.json"
+    today = datetime.date.today()
+    log = FirstInteractionLog(path, history_days=30)
+    for days_ago, first in [(5, "08:10"), (4, "07:50"), (3, "08:00")]:
+        day = datetime.datetime.combine(today - datetime.timedelta(days=days_ago), datetime.time.fromisoformat(first))
+        assert log.record(day)
+        assert not log.record(day + datetime.timedelta(hours=2))  # Later the same day
+    assert not log.record(datetime.datetime.combine(today - datetime.timedelta(days=2), datetime.time(1, 30)))
+    assert log.typical_start_time() == datetime.time(8, 0)
+    log.record(datetime.datetime.combine(today - datetime.timedelta(days=40), datetime.time(6, 0)))
+
+    reopened = FirstInteractionLog(path, history_days=30)
+    assert len(reopened._days) == 3  # The 40-day-old entry aged out
+    assert reopened.typical_start_time() == datetime.time(8, 0)
+
+    # Existing command history seeds the days it covers; earlier times win
+    seeded = FirstInteractionLog(Path(tempfile.mkdtemp()) / "first.json")
+    yesterday = (today - datetime.timedelta(days=1)).isoformat()
+    seeded.seed([{"timestamp": f"{yesterday}T09:00:00"}, {"timestamp": f"{yesterday}T07:00:00"}, {"bad": 1}])
+    assert seeded._days == {yesterday: f"{yesterday}T07:00:00"}
+    assert seeded.typical_start_time() is None  # Only one day
+    print("✅ First interaction log tests passed\n")
+
+
+def test_prepared_briefing_and_scheduled_job():
+    """The scheduled job prepares a briefing that is served instantly"""
+    print("Testing prepared briefing...")
+    briefing = make_briefing(weather_delay=0.3, news_delay=0.3, system_delay=0.3,
+                             ttls={"weather": 0, "news": 0, "system": 0})
+
+    class Agent:
+        morning_briefing = briefing
+        relearned = 0
+
+        def schedule_briefing_preparation(self):
+            Agent.relearned += 1
+
+    scheduler = Scheduler(Agent(), Path(tempfile.mkdtemp()) / "tasks.json")
+    task = ScheduledTask("recurring_0", "recurring", "Prepare morning briefing", "prepare_briefing",
+                         {"time": "07:45"}, "daily at 07:45")
+    scheduler._execute_task(task)
+    assert briefing.prepared and "Chip news." in briefing.prepared["body"]
+    assert Agent.relearned == 1  # The preparation time is re-learned after each run
+
+    start = time.perf_counter()
+    text = briefing.generate_briefing()
+    elapsed = time.perf_counter() - start
+    print(f"  Served prepared briefing in {elapsed * 1000:.2f} ms")
+    assert elapsed < 0.01
+    assert text.startswith("Good morning, sir. It is ") and "21°C and clear" in text
+
+    # Yesterday's preparation is not served
+    briefing.prepared["date"] -= datetime.timedelta(days=1)
+    start = time.perf_counter()
+    briefing.generate_briefing()
+    assert time.perf_counter() - start > 0.2
+    print("✅ Prepared briefing tests passed\n")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("Morning Briefing Tests")
+    print("=" * 50 + "\n")
+
+    test_sources_gathered_in_parallel()
+    test_deadline_and_late_sources()
+    test_ttl_expiry_and_failures()
+    test_learns_typical_start_time()
+    test_first_interaction_log()
+    test_prepared_briefing_and_scheduled_job()
+
+    print("=" * 50)
+    print("All tests passed! ✅")
+    print("=" * 50)
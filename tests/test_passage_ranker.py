@@ -0,0 +1,73 @@
+"""
+Test passage splitting, BM25 ranking, de-duplication and the token budget
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.features.passage_ranker import PassageRanker, build_context, estimate_tokens, split_passages
+
+FILLER = "Subscribe to our newsletter for weekly updates on gardening, cooking and travel deals. "
+RELEVANT = ("Solid-state batteries replace the liquid electrolyte with a solid one, "
+            "which improves energy density and reduces fire risk in electric vehicles. ")
+DEEP = ("Manufacturing solid-state battery cells at scale remains difficult because "
+        "dendrites still form at the lithium metal anode during fast charging. ")
+
+
+def test_split_passages():
+    """Short blocks merge, long blocks split on sentences"""
+    print("Testing passage splitting...")
+    text = "\n".join(["Short heading", RELEVANT * 2, FILLER * 20])
+    passages = split_passages("u", text, target_words=40)
+    assert [p.position for p in passages] == list(range(len(passages)))
+    assert passages[0].text.startswith("Short heading Solid-state")
+    assert all(len(p.text.split()) <= 40 for p in passages[1:])
+    assert " ".join(p.text for p in passages).split() == text.split()
+    print("✅ Splitting tests passed\n")
+
+
+def test_ranking_and_budget():
+    """Relevant passages deep in a page beat boilerplate at the top"""
+    print("Testing ranking, de-duplication and budget...")
+    documents = {
+        "https://a.example/ev": "\n".join([FILLER * 8] * 5 + [RELEVANT * 3, DEEP * 3]),
+        "https://b.example/mirror": "\n".join([RELEVANT * 3]),  # Syndicated copy of a's passage
+        "https://c.example/recipes": "\n".join([FILLER * 8] * 10),
+    }
+    ranker = PassageRanker()
+    selected = ranker.select("solid-state battery dendrites", documents, token_budget=400)
+
+    texts = [p.text for p in selected]
+    assert any("dendrites" in t for t in texts)
+    assert sum("liquid electrolyte" in t for t in texts) == 1, "Duplicate passage kept"
+    assert not any("newsletter" in t for t in texts)
+    assert sum(estimate_tokens(t) for t in texts) <= 400
+
+    # Grouped by source, in reading order
+    keys = [(list(documents).index(p.url), p.position) for p in selected]
+    assert keys == sorted(keys)
+
+    context = build_context("solid-state batteries", selected)
+    assert context.count("--- Source:") == len({p.url for p in selected})
+
+    # No topic words anywhere: fall back to the start of each source
+    fallback = ranker.select("quantum chromodynamics", {"x": RELEVANT * 12, "y": DEEP * 12}, token_budget=400)
+    assert [(p.url, p.position) for p in fallback] == [("x", 0), ("y", 0)]
+    print("✅ Ranking tests passed\n")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("Passage Ranker Tests")
+    print("=" * 50 + "\n")
+
+    test_split_passages()
+    test_ranking_and_budget()
+
+    print("=" * 50)
+    print("All tests passed! ✅")
+    print("=" * 50)
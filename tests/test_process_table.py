@@ -0,0 +1,146 @@
+"""
+Test the running-process snapshot cache
+"""
+
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.app_catalog import AppCatalog
+from src.core.desktop import FakeBackend
+from src.core.mac_control import MacController
+from src.core.process_table import ProcessTable, index_keys
+
+
+class CountingTable(ProcessTable):
+    def __init__(self, ttl):
+        super().__init__(ttl)
+        self.reads = 0
+
+    def _take_snapshot(self):
+        self.reads += 1
+        return super()._take_snapshot()
+
+
+def spawn_app(name):
+    """Start a long-running process whose executable is called `name`."""
+    binary = Path(tempfile.mkdtemp()) / name
+    shutil.copy(shutil.which("sleep"), binary)
+    return subprocess.Popen([str(binary), "30"])
+
+
+def spawn_stubborn_app(name):
+    """Like spawn_app, but the process ignores SIGTERM."""
+    binary = Path(tempfile.mkdtemp()) / name
+    shutil.copy(shutil.which("sh"), binary)
+    return subprocess.Popen([str(binary), "-c", "trap '' TERM; while :; do sleep 0.1; done"])
+
+
+def test_index_keys():
+    """Processes are indexed by name, executable and outer .app bundle"""
+    print("Testing index keys...")
+    exe = "/Applications/Google Chrome.app/Contents/Frameworks/Helper.app/Contents/MacOS/Google Chrome Helper"
+    assert index_keys("Google Chrome Helper", exe) == {"google chrome helper", "google chrome"}
+    assert index_keys("code", "/usr/share/code/code") == {"code"}
+    assert index_keys(None, None) == set()
+    print("✅ Index key tests passed\n")
+
+
+def test_snapshot_ttl_and_invalidate():
+    """Queries within the TTL share one snapshot; invalidate forces a re-read"""
+    print("Testing snapshot TTL...")
+    table = CountingTable(ttl=60)
+    for _ in range(50):
+        table.is_running("definitely-not-running")
+    assert table.reads == 1
+    table.invalidate()
+    table.is_running("definitely-not-running")
+    assert table.reads == 2
+    print("✅ Snapshot TTL tests passed\n")
+
+
+def test_terminate_exact_pids():
+    """Only processes indexed under the app name are terminated"""
+    print("Testing targeted terminate...")
+    target = spawn_app("jarvistarget")
+    bystander = spawn_app("jarvistargetzz")
+    try:
+        table = ProcessTable(ttl=60)
+        assert table.pids("JarvisTarget") == [target.pid]
+        assert table.terminate("jarvistarget") == [target.pid]
+        assert target.wait(timeout=5) is not None
+        assert bystander.poll() is None
+        assert not table.is_running("jarvistarget")
+    finally:
+        for proc in (target, bystander):
+            proc.kill()
+            proc.wait()
+    print("✅ Targeted terminate tests passed\n")
+
+
+def test_terminate_skips_exited_processes():
+    """A process that exited since the snapshot is not signalled, even if its PID comes back"""
+    print("Testing stale snapshot entries...")
+    target = spawn_app("jarvisgone")
+    table = ProcessTable(ttl=60)
+    assert table.pids("jarvisgone") == [target.pid]
+    target.kill()
+    target.wait()
+    assert table.terminate("jarvisgone") == []
+    print("✅ Stale snapshot tests passed\n")
+
+
+def test_terminate_only_kills_when_forced():
+    """SIGTERM is all an app gets unless the caller forces it"""
+    print("Testing forced terminate...")
+    target = spawn_stubborn_app("jarvisstubborn")
+    try:
+        table = ProcessTable(ttl=60)
+        assert table.terminate("jarvisstubborn", timeout=0.2) == [target.pid]
+        time.sleep(0.5)
+        assert target.poll() is None
+        assert table.terminate("jarvisstubborn", force=True, timeout=0.5) == [target.pid]
+        assert target.wait(timeout=5) is not None
+    finally:
+        target.kill()
+        target.wait()
+    print("✅ Forced terminate tests passed\n")
+
+
+def test_running_app_is_not_relaunched():
+    """open_app focuses a running app instead of launching it again"""
+    print("Testing redundant launch skip...")
+    backend = FakeBackend()
+    catalog = AppCatalog(cache_path=None, app_dirs=[], aliases=MacController.APP_MAPPINGS)
+    mac = MacController(backend=backend, catalog=catalog)
+
+    assert mac.open_app("spotify") == (True, "Opened Spotify, sir.")
+    assert mac.is_app_running("music")
+    assert mac.open_app("spotify") == (True, "Switched to Spotify, sir.")
+    assert [call for call, _ in backend.calls] == ["open_app", "activate_app"]
+    assert mac.running_apps() == ["Spotify"]
+    print("✅ Redundant launch tests passed\n")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("Process Table Tests")
+    print("=" * 50 + "\n")
+
+    test_index_keys()
+    test_snapshot_ttl_and_invalidate()
+    test_terminate_exact_pids()
+    test_terminate_skips_exited_processes()
+    test_terminate_only_kills_when_forced()
+    test_running_app_is_not_relaunched()
+
+    print("=" * 50)
+    print("All tests passed! ✅")
+    print("=" * 50)
@@ -0,0 +1,104 @@
+"""
+Test recurrence parsing and next-fire calculation
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.recurrence import parse_recurrence
+
+NY = ZoneInfo("America/New_York")
+# Thursday, three days before the US spring-forward change
+START = datetime(2026, 3, 5, 12, 0, tzinfo=NY)
+
+
+def fires(text, count=3, start=START):
+    rule = parse_recurrence(text, dtstart=start, tz=NY)
+    out, current = [], start
+    for _ in range(count):
+        current = rule.next_after(current)
+        if current is None:
+            break
+        out.append(current.strftime("%a %H:%M"))
+    return out
+
+
+def test_natural_language():
+    """Common spoken schedules"""
+    print("Testing natural language recurrences...")
+    assert fires("daily at 9:00") == ["Fri 09:00", "Sat 09:00", "Sun 09:00"]
+    assert fires("every weekday at 8:30am") == ["Fri 08:30", "Mon 08:30", "Tue 08:30"]
+    assert fires("every monday and friday at 5pm") == ["Fri 17:00", "Mon 17:00", "Fri 17:00"]
+    assert fires("every 2 hours") == ["Thu 14:00", "Thu 16:00", "Thu 18:00"]
+    assert fires("every 3 days at 10:00 until 2026-03-12", count=5) == ["Sun 10:00", "Wed 10:00"]
+    print("✅ Natural language tests passed\n")
+
+
+def test_cron_and_rrule():
+    """Cron and RRULE input"""
+    print("Testing cron/RRULE...")
+    assert fires("cron: 0 9 * * 1-5") == ["Fri 09:00", "Mon 09:00", "Tue 09:00"]
+    assert fires("FREQ=WEEKLY;INTERVAL=2;BYDAY=MO;BYHOUR=9;BYMINUTE=0") == ["Mon 09:00", "Mon 09:00", "Mon 09:00"]
+    
+    # Monthly/yearly: by day of month (counted from the end if negative) or nth weekday
+    for text, expected in [
+        ("FREQ=MONTHLY;BYDAY=2TU;BYHOUR=9;BYMINUTE=0", ["2026-03-10", "2026-04-14", "2026-05-12"]),
+        ("FREQ=MONTHLY;INTERVAL=2;BYMONTHDAY=-1;BYHOUR=9;BYMINUTE=0", ["2026-03-31", "2026-05-31", "2026-07-31"]),
+        ("FREQ=MONTHLY;BYMONTHDAY=31;BYHOUR=9;BYMINUTE=0", ["2026-03-31", "2026-05-31", "2026-07-31"]),
+        ("FREQ=YEARLY;BYMONTH=11;BYDAY=4TH", ["2026-11-26", "2027-11-25", "2028-11-23"]),
+    ]:
+        rule = parse_recurrence(text, dtstart=START, tz=NY)
+        current, dates = START, []
+        for _ in range(3):
+            current = rule.next_after(current)
+            dates.append(current.date().isoformat())
+        assert dates == expected, text
+        assert fires(rule.describe(), count=5) == fires(text, count=5), text
+    try:
+        parse_recurrence("FREQ=MONTHLY;BYDAY=MO,TU,WE,TH,FR;BYSETPOS=-1", dtstart=START, tz=NY)
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+    print("✅ Cron/RRULE tests passed\n")
+
+
+def test_dst_wall_clock():
+    """Wall-clock times hold across DST; skipped times roll past the gap"""
+    print("Testing DST handling...")
+    rule = parse_recurrence("daily at 9:00", dtstart=START, tz=NY)
+    sunday = rule.next_after(datetime(2026, 3, 8, 0, 0, tzinfo=NY))
+    assert (sunday.hour, sunday.utcoffset().total_seconds()) == (9, -4 * 3600)
+    
+    # 02:30 doesn't exist on 2026-03-08 in New York
+    assert fires("cron: 30 2 * * *", start=datetime(2026, 3, 7, 12, 0, tzinfo=NY)) == ["Sun 03:30", "Mon 02:30", "Tue 02:30"]
+    print("✅ DST tests passed\n")
+
+
+def test_describe_round_trips():
+    """Stored trigger text parses back to the same schedule"""
+    print("Testing describe()...")
+    for text in ["every weekday at 8:30am", "every other week on tuesday at 2pm", "hourly at :15"]:
+        rule = parse_recurrence(text, dtstart=START, tz=NY)
+        assert fires(rule.describe(), count=5) == fires(text, count=5), text
+    print("✅ describe() tests passed\n")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("Recurrence Tests")
+    print("=" * 50 + "\n")
+    
+    test_natural_language()
+    test_cron_and_rrule()
+    test_dst_wall_clock()
+    test_describe_round_trips()
+    
+    print("=" * 50)
+    print("All tests passed! ✅")
+    print("=" * 50)
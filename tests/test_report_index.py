@@ -0,0 +1,87 @@
+"""
+Test the research report index: topic matching, freshness and legacy reports
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.features.report_index import ReportIndex, normalize_topic
+
+
+def test_topic_normalization():
+    """Phrasing differences map to the same key"""
+    print("Testing topic normalization...")
+    assert normalize_topic("The Best EV Batteries?") == normalize_topic("best ev battery")
+    assert normalize_topic("research solid state batteries") == normalize_topic("Solid-State Battery")
+    assert normalize_topic("glass") == "glass"
+    print("✅ Normalization tests passed\n")
+
+
+def test_lookup_record_and_freshness():
+    """Recorded reports are found again, fuzzily, until they go stale"""
+    print("Testing lookup and freshness...")
+    reports = Path(tempfile.mkdtemp())
+    index = ReportIndex(reports, max_age=60, match_threshold=0.6)
+    report = reports / "Research_fusion_power_plants_20260101.md"
+    report.write_text("# Research Report: fusion power plants\nDate: 2026-01-01 09:00\n\nTokamaks lead.")
+
+    entry = index.record("fusion power plants", report, ["https://a.example", "https://b.example"],
+                         {"https://a.example": "- Tokamaks lead"})
+    assert index.lookup("Fusion power plants?") is entry
+    assert index.lookup("fusion power plant designs") is entry  # 3 of 4 words shared
+    assert index.lookup("fusion cuisine") is None
+    assert index.is_fresh(entry)
+    assert ReportIndex.read(entry) == "Tokamaks lead."
+
+    # Persisted, and goes stale with age
+    reopened = ReportIndex(reports, max_age=60)
+    entry = reopened.lookup("fusion power plants")
+    assert entry["summaries"] == {"https://a.example": "- Tokamaks lead"}
+    entry["updated"] -= 120
+    assert not reopened.is_fresh(entry)
+    reopened.touch(entry)
+    assert reopened.is_fresh(entry)
+
+    # Deleted reports drop out of the index
+    report.unlink()
+    assert ReportIndex(reports).lookup("fusion power plants") is None
+    print("✅ Lookup tests passed\n")
+
+
+def test_indexes_existing_reports():
+    """Reports written before the index existed are picked up, newest per topic"""
+    print("Testing legacy report discovery...")
+    reports = Path(tempfile.mkdtemp())
+    old = reports / "Research_quantum_computing_20250101.md"
+    old.write_text("# Research Report: quantum computing\nDate: 2025-01-01 10:00\n\nOld (https://old.example).")
+    new = reports / "Research_quantum_computing_20250301.md"
+    new.write_text("# Research Report: quantum computing\nDate: 2025-03-01 10:00\n\n"
+                   "See [IBM](https://ibm.example/q) and https://arxiv.example/abs/1.")
+    os.utime(old, (time.time() - 100, time.time() - 100))
+
+    entry = ReportIndex(reports, max_age=3600).lookup("Quantum Computing")
+    assert entry["path"] == str(new)
+    assert entry["sources"] == ["https://ibm.example/q", "https://arxiv.example/abs/1"]
+    assert entry["summaries"] == {}
+    print("✅ Legacy report tests passed\n")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("Report Index Tests")
+    print("=" * 50 + "\n")
+
+    test_topic_normalization()
+    test_lookup_record_and_freshness()
+    test_indexes_existing_reports()
+
+    print("=" * 50)
+    print("All tests passed! ✅")
+    print("=" * 50)
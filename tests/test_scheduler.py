@@ -0,0 +1,179 @@
+"""
+Test background Scheduler
+"""
+
+import json
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.scheduler import Scheduler
+
+
+class FakeMacControl:
+    def __init__(self):
+        self.opened = []
+    
+    def open_app(self, app_name):
+        self.opened.append(app_name)
+        return (True, f"Opened {app_name}, sir.")
+
+
+class FakeAgent:
+    def __init__(self):
+        self.mac_control = FakeMacControl()
+
+
+def make_scheduler(storage=None, **kwargs):
+    storage = storage or Path(tempfile.mkdtemp()) / "scheduled_tasks.json"
+    return Scheduler(FakeAgent(), storage, **kwargs)
+
+
+def write_overdue_task(storage, minutes_ago=30):
+    """Journal an open_app task whose deadline passed while Jarvis was off."""
+    deadline = datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)
+    task = {
+        "task_id": "reminder_7",
+        "task_type": "one_time",
+        "description": "Open Notes",
+        "action": "open_app",
+        "params": {"app": "Notes"},
+        "trigger": "once",
+        "next_run": deadline.isoformat(),
+    }
+    storage.write_text(json.dumps({"op": "put", "task": task}) + "\n")
+
+
+def test_reminder_fires_without_main_loop():
+    """Reminders fire from the scheduler thread on their own"""
+    print("Testing reminder dispatch...")
+    scheduler = make_scheduler()
+    scheduler.start()
+    try:
+        scheduler.add_reminder("stretch", delay_minutes=0.5 / 60)
+        assert len(scheduler.list_tasks()) == 1
+        
+        deadline = time.time() + 3
+        while scheduler.list_tasks() and time.time() < deadline:
+            time.sleep(0.05)
+        
+        assert not scheduler.list_tasks(), "Reminder did not fire"
+    finally:
+        scheduler.shutdown(wait=True)
+    
+    print("✅ Reminder dispatch tests passed\n")
+
+
+def test_cancel_wakes_and_drops_deadline():
+    """Cancelling removes the task's deadline from the index"""
+    print("Testing cancel...")
+    scheduler = make_scheduler()
+    scheduler.start()
+    try:
+        first = scheduler.add_reminder("soon", delay_minutes=1)
+        scheduler.add_reminder("later", delay_minutes=10)
+        soon_deadline = scheduler.next_deadline()
+        
+        assert scheduler.cancel_task(first)
+        assert scheduler.next_deadline() > soon_deadline
+        assert not scheduler.cancel_task(first)
+    finally:
+        scheduler.shutdown()
+    
+    print("✅ Cancel tests passed\n")
+
+
+def test_reminders_survive_restart():
+    """One-time reminders are reloaded with their absolute deadline"""
+    print("Testing reminder persistence...")
+    scheduler = make_scheduler()
+    task_id = scheduler.add_reminder("call mom", delay_minutes=90)
+    deadline = scheduler.next_deadline()
+    
+    reloaded = make_scheduler(scheduler.storage_path)
+    assert [t.task_id for t in reloaded.list_tasks()] == [task_id]
+    assert abs(reloaded.next_deadline() - deadline) < 0.001
+    
+    # New IDs don't collide with reloaded ones
+    assert reloaded.add_reminder("again", delay_minutes=5) != task_id
+    
+    print("✅ Reminder persistence tests passed\n")
+
+
+class SlowLock:
+    """Lock that makes the thread named "compactor" wait 0.2s before each acquire."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+    
+    def __enter__(self):
+        if threading.current_thread().name == "compactor":
+            time.sleep(0.2)
+        self._lock.acquire()
+    
+    def __exit__(self, *exc):
+        self._lock.release()
+
+
+def test_cancels_survive_compaction():
+    """A removal journaled while the file is being compacted is not lost"""
+    print("Testing concurrent compaction...")
+    scheduler = make_scheduler()
+    scheduler._io_lock = SlowLock()
+    cancelled = scheduler.add_reminder("cancel me", delay_minutes=60)
+    kept = scheduler.add_reminder("keep me", delay_minutes=60)
+    
+    compactor = threading.Thread(target=scheduler._compact, name="compactor")
+    compactor.start()
+    time.sleep(0.05)
+    assert scheduler.cancel_task(cancelled)
+    compactor.join()
+    
+    reloaded = make_scheduler(scheduler.storage_path)
+    assert [t.task_id for t in reloaded.list_tasks()] == [kept]
+    
+    print("✅ Concurrent compaction tests passed\n")
+
+
+def test_misfire_policies():
+    """Overdue tasks fire late or are dropped according to policy"""
+    print("Testing misfire policies...")
+    for policy, expected in [("coalesce", ["Notes"]), ("drop", [])]:
+        storage = Path(tempfile.mkdtemp()) / "scheduled_tasks.json"
+        write_overdue_task(storage)
+        scheduler = make_scheduler(storage, misfire_policy=policy)
+        scheduler.start()
+        try:
+            deadline = time.time() + 3
+            while scheduler.list_tasks() and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            scheduler.shutdown(wait=True)
+        
+        assert scheduler.agent.mac_control.opened == expected, policy
+        assert not make_scheduler(storage).list_tasks(), policy
+    
+    print("✅ Misfire policy tests passed\n")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("Scheduler Tests")
+    print("=" * 50 + "\n")
+    
+    test_reminder_fires_without_main_loop()
+    test_cancel_wakes_and_drops_deadline()
+    test_reminders_survive_restart()
+    test_cancels_survive_compaction()
+    test_misfire_policies()
+    
+    print("=" * 50)
+    print("All tests passed! ✅")
+    print("=" * 50)
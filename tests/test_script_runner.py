@@ -0,0 +1,93 @@
+"""
+Test the persistent script worker against the local stub process
+"""
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.script_runner import ScriptWorker, worker_command
+
+
+def test_round_trip():
+    """Single requests return output and errors"""
+    print("Testing request/response...")
+    worker = ScriptWorker(worker_command("stub"))
+    try:
+        assert worker.run('return "Song by Artist"').output == "Song by Artist"
+        failed = worker.run('error "Not authorized"')
+        assert not failed and failed.error == "Not authorized"
+        assert worker.run('tell application "Spotify" to pause').ok
+    finally:
+        worker.close()
+    print("✅ Round-trip tests passed\n")
+
+
+def test_batch_keeps_order():
+    """A batch is one request with one result per script"""
+    print("Testing batching...")
+    worker = ScriptWorker(worker_command("stub"))
+    try:
+        results = worker.run_batch(['return "a"', 'error "b"', 'return "c"'])
+        assert [(r.ok, r.output, r.error) for r in results] == [(True, "a", ""), (False, "", "b"), (True, "c", "")]
+    finally:
+        worker.close()
+    print("✅ Batch tests passed\n")
+
+
+def test_timeout_restarts_worker():
+    """A hung worker is killed and the next request gets a fresh one"""
+    print("Testing timeout recovery...")
+    worker = ScriptWorker([sys.executable, "-c", "import time; time.sleep(30)"])
+    result = worker.run('return "x"', timeout=0.2)
+    assert not result and "timed out" in result.error
+    assert worker.process is None
+
+    worker.command = worker_command("stub")
+    assert worker.run('return "back"').output == "back"
+    worker.close()
+    print("✅ Timeout tests passed\n")
+
+
+def benchmark(calls=200):
+    """Per-call latency: persistent worker vs a process per call"""
+    worker = ScriptWorker(worker_command("stub"))
+    worker.run('return "warm"')
+    start = time.perf_counter()
+    for _ in range(calls):
+        worker.run('tell application "Spotify" to pause')
+    persistent = (time.perf_counter() - start) / calls
+
+    start = time.perf_counter()
+    worker.run_batch(['tell application "Spotify" to pause'] * calls)
+    batched = (time.perf_counter() - start) / calls
+    worker.close()
+
+    start = time.perf_counter()
+    for _ in range(20):
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+    spawned = (time.perf_counter() - start) / 20
+
+    print(f"process per call: {spawned * 1000:.2f} ms")
+    print(f"persistent worker: {persistent * 1000:.3f} ms")
+    print(f"batched: {batched * 1000:.4f} ms")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("Script Worker Tests")
+    print("=" * 50 + "\n")
+
+    test_round_trip()
+    test_batch_keeps_order()
+    test_timeout_restarts_worker()
+    benchmark()
+
+    print("=" * 50)
+    print("All tests passed! ✅")
+    print("=" * 50)
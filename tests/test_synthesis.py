@@ -0,0 +1,195 @@
+"""
+Test map-reduce research synthesis with a fake LLM client
+"""
+
+import io
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.features.report_index import ReportIndex
+from src.core.llm import FAILURE_PREFIX
+from src.features.synthesis import (INTERRUPTED_MARKER, MapReduceSynthesizer, ReasoningSplitter, SynthesisFailed,
+                                    is_failed_output, stream_report, strip_reasoning)
+
+
+class FakeLLM:
+    """Answers after a fixed latency and records how many calls overlap."""
+
+    def __init__(self, latency=0.2):
+        self.latency = latency
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def chat(self, messages, stream=True, use_jarvis_personality=True):
+        with self.lock:
+            self.calls.append(messages)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.latency)
+        with self.lock:
+            self.active -= 1
+        source = messages[1]["content"]
+        if "Source Summaries" in source:
+            yield "# Report\n" + source
+        elif "gardening" in source:
+            yield "NOTHING RELEVANT"
+        else:
+            yield "<think>the user wants bullets</think>\n- Fact from " + source.split("--- Source: ")[1].split(" ---")[0]
+
+
+class FailingLLM:
+    """Behaves like LLMClient when Ollama is unreachable; "s1" gets an empty reply instead."""
+
+    def chat(self, messages, stream=True, use_jarvis_personality=True):
+        if "s1.example" in messages[1]["content"]:
+            yield "<think>...</think>"
+            return
+        yield f"{FAILURE_PREFIX}: Connection refused"
+
+
+def sources(urls, delay=0.0):
+    for url in urls:
+        time.sleep(delay)
+        yield url, f"Fusion reactors use magnetic confinement. Detail {url}."
+
+
+def test_parallel_map_and_reduce():
+    """Summaries run side by side and start before all sources have arrived"""
+    print("Testing parallel map step...")
+    llm = FakeLLM(latency=0.2)
+    synthesizer = MapReduceSynthesizer(llm, parallelism=4)
+    seen = []
+    start = time.monotonic()
+    urls = [f"https://s{i}.example" for i in range(4)]
+    summaries = synthesizer.summarize_all("fusion reactors", sources(urls, delay=0.1),
+                                          on_summary=lambda url, s: seen.append(time.monotonic() - start))
+    elapsed = time.monotonic() - start
+
+    assert list(summaries) == urls
+    assert summaries[urls[0]] == f"- Fact from {urls[0]}"
+    assert llm.peak > 1
+    assert elapsed < 0.9, f"Map took {elapsed:.2f}s"
+    assert seen[0] < 0.38, "First summary waited for every source"
+
+    report = synthesizer.reduce("fusion reactors", summaries)
+    assert report.startswith("# Report") and all(url in report for url in urls)
+    print("✅ Map-reduce tests passed\n")
+
+
+def test_parallelism_limit_and_irrelevant_sources():
+    """Parallelism is capped and irrelevant sources are dropped"""
+    print("Testing parallelism cap and relevance filter...")
+    llm = FakeLLM(latency=0.05)
+    synthesizer = MapReduceSynthesizer(llm, parallelism=2)
+    docs = [(f"https://f{i}.example", "Fusion reactors need tritium breeding blankets.") for i in range(5)]
+    docs.append(("https://garden.example", "Fusion of gardening tips and recipes."))
+    summaries = synthesizer.summarize_all("fusion reactors", docs)
+
+    assert llm.peak == 2
+    assert "https://garden.example" not in summaries and len(summaries) == 5
+    assert strip_reasoning("<think>\nhmm\n</think>\n\nAnswer") == "Answer"
+    assert strip_reasoning("<think>cut off mid thought") == ""
+    print("✅ Parallelism tests passed\n")
+
+
+def test_reasoning_split_across_chunks():
+    """Think tags are recognised however the stream is chunked"""
+    print("Testing reasoning splitter...")
+    text = "<think>plan the answer</think>\n\n# Fusion\nTokamaks <b>lead</b>."
+    for size in (1, 2, 3, 7, len(text)):
+        splitter = ReasoningSplitter()
+        segments = []
+        for i in range(0, len(text), size):
+            segments += splitter.feed(text[i:i + size])
+        segments += splitter.flush()
+        reasoning = "".join(t for r, t in segments if r)
+        answer = "".join(t for r, t in segments if not r)
+        assert reasoning == "plan the answer", (size, reasoning)
+        assert answer == "\n\n# Fusion\nTokamaks <b>lead</b>.", (size, answer)
+    print("✅ Splitter tests passed\n")
+
+
+def test_stream_report_and_cancel():
+    """Tokens reach the file as they arrive; a cancel keeps the partial report"""
+    print("Testing streamed report output...")
+    reports = Path(tempfile.mkdtemp())
+    path = reports / "Research_fusion_20260101.md"
+    header = "# Research Report: fusion\nDate: 2026-01-01 09:00\n\n"
+    console = io.StringIO()
+    written = []
+
+    def tokens():
+        for token in ["<thi", "nk>hmm</think>", "\n\n# Fusion", "\nTokamaks lead."]:
+            yield token
+            written.append(path.read_text())
+
+    report, completed = stream_report(tokens(), path, header, out=console)
+    assert completed and report == "# Fusion\nTokamaks lead."
+    assert written[2] == header + "# Fusion"  # On disk before the next token arrived
+    assert path.read_text() == header + report
+    assert "hmm" not in console.getvalue() and "Reasoning" in console.getvalue()
+
+    shown = io.StringIO()
+    stream_report(iter(["<think>hmm</think>ok"]), path, header, show_reasoning=True, out=shown)
+    assert "hmm" in shown.getvalue()
+
+    def cancelled():
+        yield "# Fusion\nPartial"
+        raise KeyboardInterrupt
+
+    report, completed = stream_report(cancelled(), path, header, out=io.StringIO())
+    assert not completed and report == "# Fusion\nPartial"
+    assert path.read_text().startswith(header + "# Fusion\nPartial")
+    assert INTERRUPTED_MARKER in path.read_text()
+    assert ReportIndex(reports).lookup("fusion") is None  # Partial reports aren't indexed
+    print("✅ Streaming tests passed\n")
+
+
+def test_failed_llm_is_not_a_summary():
+    """Error replies and empty replies never become summaries, reports or index entries"""
+    print("Testing failed LLM calls...")
+    synthesizer = MapReduceSynthesizer(FailingLLM(), parallelism=2)
+    urls = [f"https://s{i}.example" for i in range(3)]
+    assert synthesizer.summarize_all("fusion reactors", sources(urls)) == {}
+    try:
+        synthesizer.reduce("fusion reactors", {urls[0]: "- Fact"})
+        assert False, "expected SynthesisFailed"
+    except SynthesisFailed as e:
+        assert "Connection refused" in str(e)
+
+    assert is_failed_output(f"{FAILURE_PREFIX}: timeout") and is_failed_output("  \n")
+    assert not is_failed_output("# Fusion")
+
+    # A failed report left on disk (e.g. by an older version) isn't picked up by the index
+    reports = Path(tempfile.mkdtemp())
+    header = "# Research Report: fusion\nDate: 2026-01-01 09:00\n\n"
+    report, completed = stream_report(FailingLLM().chat([{}, {"content": ""}]), reports / "Research_fusion_20260101.md",
+                                      header, out=io.StringIO())
+    assert completed and is_failed_output(report)
+    assert ReportIndex(reports).lookup("fusion") is None
+    print("✅ Failed LLM tests passed\n")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("Research Synthesis Tests")
+    print("=" * 50 + "\n")
+
+    test_parallel_map_and_reduce()
+    test_parallelism_limit_and_irrelevant_sources()
+    test_reasoning_split_across_chunks()
+    test_stream_report_and_cancel()
+    test_failed_llm_is_not_a_summary()
+
+    print("=" * 50)
+    print("All tests passed! ✅")
+    print("=" * 50)
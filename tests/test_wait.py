@@ -0,0 +1,69 @@
+"""
+Test condition-polling waits
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.wait import wait_until
+
+
+def test_returns_immediately_when_ready():
+    """A condition that already holds costs no sleep"""
+    print("Testing immediate success...")
+    sleeps = []
+    assert wait_until(lambda: "ready", sleep=sleeps.append) == "ready"
+    assert sleeps == []
+    print("✅ Immediate success tests passed\n")
+
+
+def test_backoff_schedule():
+    """Gaps between checks grow geometrically up to the cap"""
+    print("Testing backoff...")
+    sleeps = []
+    checks = iter([False] * 6 + [True])
+    assert wait_until(lambda: next(checks), timeout=10, interval=0.01, max_interval=0.1, sleep=sleeps.append)
+    assert sleeps == [0.01, 0.02, 0.04, 0.08, 0.1, 0.1]
+    print("✅ Backoff tests passed\n")
+
+
+def test_follows_readiness_not_worst_case():
+    """Returns shortly after the condition flips, well before the timeout"""
+    print("Testing readiness latency...")
+    ready_at = time.monotonic() + 0.15
+    start = time.monotonic()
+    assert wait_until(lambda: time.monotonic() >= ready_at, timeout=5)
+    elapsed = time.monotonic() - start
+    print(f"  ready after {elapsed * 1000:.0f} ms")
+    assert elapsed < 0.15 + 0.25
+    print("✅ Readiness tests passed\n")
+
+
+def test_timeout_and_errors():
+    """Exceptions count as not-ready; timeout returns the last falsy result"""
+    print("Testing timeout...")
+    start = time.monotonic()
+    assert wait_until(lambda: 1 / 0, timeout=0.1) is None
+    assert wait_until(lambda: "", timeout=0.1) == ""
+    assert time.monotonic() - start < 0.5
+    print("✅ Timeout tests passed\n")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("Wait Tests")
+    print("=" * 50 + "\n")
+
+    test_returns_immediately_when_ready()
+    test_backoff_schedule()
+    test_follows_readiness_not_worst_case()
+    test_timeout_and_errors()
+
+    print("=" * 50)
+    print("All tests passed! ✅")
+    print("=" * 50)
@@ -0,0 +1,203 @@
+"""
+Test parallel workflow execution
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.workflows import WorkflowExecutor
+
+
+class SlowMacControl:
+    """Records calls; each app launch takes `delay` seconds."""
+    
+    def __init__(self, delay=0.3):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+    
+    def _record(self, call):
+        with self.lock:
+            self.calls.append((call, time.perf_counter()))
+    
+    def open_app(self, app_name):
+        time.sleep(self.delay)
+        self._record(f"open {app_name}")
+        return (True, f"Opened {app_name}, sir.")
+    
+    def close_app(self, app_name):
+        self._record(f"close {app_name}")
+        return (True, f"Closed {app_name}, sir.")
+    
+    def set_volume(self, level):
+        self._record(f"volume {level}")
+        return (True, f"Volume set to {level}%, sir.")
+
+
+class FakeAgent:
+    def __init__(self, delay=0.3):
+        self.mac_control = SlowMacControl(delay)
+        self.mode_switched_at = None
+    
+    def switch_model(self, mode):
+        self.mode_switched_at = time.perf_counter()
+        return True
+
+
+def make_executor(agent, workflows=None):
+    """Executor reading user workflows from a temporary file."""
+    workflows_file = Path(tempfile.mkdtemp()) / "workflows.json"
+    if workflows is not None:
+        workflows_file.write_text(json.dumps(workflows))
+    return WorkflowExecutor(agent, workflows_file=workflows_file)
+
+
+def test_independent_steps_run_concurrently():
+    """Coding session takes about one app launch, not three"""
+    print("Testing concurrent workflow steps...")
+    agent = FakeAgent(delay=0.3)
+    executor = make_executor(agent)
+    
+    result = executor.run("coding_session")
+    print(result.timing_breakdown())
+    
+    assert result.duration < 0.6, f"Took {result.duration:.2f}s"
+    opened = [t for call, t in agent.mac_control.calls if call.startswith("open")]
+    assert len(opened) == 3
+    # Mode switch depends on every app launch
+    assert agent.mode_switched_at >= max(opened)
+    
+    success, message = executor.execute("coding_session")
+    assert success and "switched to coding mode" in message
+    executor.shutdown()
+    
+    print("✅ Concurrent workflow tests passed\n")
+
+
+def test_step_timeout_releases_dependents():
+    """A hung step is abandoned and its dependents still run"""
+    print("Testing step timeout...")
+    agent = FakeAgent(delay=2)
+    executor = make_executor(agent, {"slow": {"description": "", "steps": [
+        {"id": "app", "action": "open_app", "params": {"app": "Slow"}, "timeout": 0.2},
+        {"id": "mode", "action": "switch_mode", "params": {"mode": "coding"}, "after": ["app"]},
+    ]}})
+    
+    result = executor.run("slow")
+    assert result.steps[0].timed_out
+    assert result.steps[1].success
+    assert result.duration < 1
+    executor.shutdown()
+    
+    print("✅ Step timeout tests passed\n")
+
+
+def test_invalid_graphs_rejected():
+    """Cycles and unknown dependencies fail validation"""
+    print("Testing validation...")
+    for steps in [
+        [{"id": "a", "action": "open_app", "params": {"app": "X"}, "after": ["b"]},
+         {"id": "b", "action": "open_app", "params": {"app": "Y"}, "after": ["a"]}],
+        [{"id": "a", "action": "open_app", "params": {"app": "X"}, "after": ["missing"]}],
+        [{"id": "a", "action": "format_disk", "params": {}}],
+        [{"id": "a", "action": "set_volume", "params": {"level": 400}}],
+        [{"id": "a", "action": "set_volume", "params": {"level": True}}],
+        [{"id": "a", "action": "open_app", "params": {"app": "X"}, "timeout": "5"}],
+        [{"id": "a", "action": "open_app", "params": {"app": "X"}, "timeout": 0}],
+        [{"id": "a", "action": "open_app", "params": {"app": "X"}, "timeout": -3}],
+        [{"id": "a", "action": "open_app", "params": {"app": "X"}, "timeout": True}],
+        [{"id": "a", "action": "open_app", "params": {"app": "X"}},
+         {"id": "b", "action": "open_app", "params": {"app": "Y"}, "after": [["a"]]}],
+        [{"id": "a", "action": "open_app", "params": {"app": "X"}, "after": 1}],
+    ]:
+        try:
+            WorkflowExecutor.compile_steps(steps)
+        except ValueError:
+            continue
+        raise AssertionError(f"Accepted invalid workflow: {steps}")
+    
+    # Valid numeric timeouts still compile
+    plan = WorkflowExecutor.compile_steps([{"id": "a", "action": "open_app", "params": {"app": "X"}, "timeout": 2.5}])
+    assert plan[0].timeout == 2.5
+    
+    print("✅ Validation tests passed\n")
+
+
+def test_concurrent_runs_share_one_pool():
+    """Runs from the scheduler and main threads share a single pool; shutdown releases it"""
+    print("Testing concurrent runs...")
+    executor = make_executor(FakeAgent(delay=0.05))
+    pools = set()
+    
+    def run():
+        executor.run("coding_session")
+        pools.add(id(executor._pool))
+    
+    threads = [threading.Thread(target=run) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(pools) == 1
+    
+    executor.shutdown()
+    assert executor._pool is None
+    # A run after shutdown gets a fresh pool
+    assert executor.run("coding_session").success
+    executor.shutdown()
+    
+    print("✅ Concurrent run tests passed\n")
+
+
+def test_user_workflows_hot_reload():
+    """Edits to the workflow file are picked up incrementally"""
+    print("Testing workflow file reload...")
+    step = {"id": "notes", "action": "open_app", "params": {"app": "Notes"}}
+    executor = make_executor(FakeAgent(delay=0), {"journal": {"description": "Journal", "steps": [step]}})
+    assert "journal" in executor.list_workflows()
+    assert "coding_session" in executor.list_workflows()
+    
+    # No change on disk: nothing is recompiled
+    assert executor.reload_if_changed() == []
+    
+    # Valid edit: only the edited workflow recompiles
+    definitions = {"journal": {"description": "Evening journal", "steps": [step]}}
+    executor.workflows_file.write_text(json.dumps(definitions))
+    os.utime(executor.workflows_file, ns=(time.time_ns(), time.time_ns() + 10**9))
+    assert executor.reload_if_changed() == ["journal"]
+    assert executor.get_workflow_description("journal") == "Evening journal"
+    
+    # Broken edit: last good plan is kept
+    definitions["journal"]["steps"] = [{"id": "x", "action": "open_app", "params": {}}]
+    executor.workflows_file.write_text(json.dumps(definitions))
+    os.utime(executor.workflows_file, ns=(time.time_ns(), time.time_ns() + 2 * 10**9))
+    assert executor.reload_if_changed() == []
+    assert executor.execute("journal")[0]
+    executor.shutdown()
+    
+    print("✅ Workflow reload tests passed\n")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("Workflow Tests")
+    print("=" * 50 + "\n")
+    
+    test_independent_steps_run_concurrently()
+    test_step_timeout_releases_dependents()
+    test_invalid_graphs_rejected()
+    test_concurrent_runs_share_one_pool()
+    test_user_workflows_hot_reload()
+    
+    print("=" * 50)
+    print("All tests passed! ✅")
+    print("=" * 50)